@@ -48,21 +48,47 @@ Visit <https://github.com/jwodder/anys> for more information.
 
 from __future__ import annotations
 from abc import ABC, abstractmethod
-from collections.abc import Callable, Iterable, Iterator, Mapping, Sequence
-from datetime import date, datetime, time
-from numbers import Number
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+from collections.abc import (
+    Awaitable,
+    Callable,
+    Generator,
+    Hashable,
+    Iterable,
+    Iterator,
+    Mapping,
+    Sequence,
+)
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from datetime import date, datetime, time, timedelta
+from decimal import Decimal
+from fractions import Fraction
+from functools import cached_property
+from itertools import compress, count, islice, pairwise, repeat, starmap
+import math
+from mmap import ACCESS_READ, mmap
+from numbers import Number, Real
 import operator
+import os
+import random
 import re
 from re import Pattern
+from time import perf_counter
 import types
 from typing import (
     TYPE_CHECKING,
     Any,
     AnyStr,
     Generic,
+    Literal,
     TypeAlias,
     TypeVar,
 )
+import zlib
+from ._regex import SafePattern, required_literals
 
 __version__ = "0.4.0.dev1"
 __author__ = "John Thorvald Wodder II"
@@ -72,15 +98,19 @@ __url__ = "https://github.com/jwodder/anys"
 
 __all__ = [
     "ANY_AWARE_DATETIME",
+    "ANY_AWARE_DATETIME_BYTES",
     "ANY_AWARE_DATETIME_STR",
     "ANY_AWARE_TIME",
+    "ANY_AWARE_TIME_BYTES",
     "ANY_AWARE_TIME_STR",
     "ANY_BOOL",
     "ANY_BYTES",
     "ANY_COMPLEX",
     "ANY_DATE",
     "ANY_DATETIME",
+    "ANY_DATETIME_BYTES",
     "ANY_DATETIME_STR",
+    "ANY_DATE_BYTES",
     "ANY_DATE_STR",
     "ANY_DICT",
     "ANY_FALSY",
@@ -91,8 +121,10 @@ __all__ = [
     "ANY_LIST",
     "ANY_MAPPING",
     "ANY_NAIVE_DATETIME",
+    "ANY_NAIVE_DATETIME_BYTES",
     "ANY_NAIVE_DATETIME_STR",
     "ANY_NAIVE_TIME",
+    "ANY_NAIVE_TIME_BYTES",
     "ANY_NAIVE_TIME_STR",
     "ANY_NUMBER",
     "ANY_SEQUENCE",
@@ -100,25 +132,42 @@ __all__ = [
     "ANY_STR",
     "ANY_STRICT_DATE",
     "ANY_TIME",
+    "ANY_TIME_BYTES",
     "ANY_TIME_STR",
     "ANY_TRUTHY",
     "ANY_TUPLE",
+    "AnyAsyncFunc",
+    "AnyAt",
     "AnyContains",
+    "AnyContainsDeep",
+    "AnyContainsSubstring",
+    "AnyEach",
     "AnyFullmatch",
     "AnyFunc",
     "AnyGE",
     "AnyGT",
     "AnyIn",
+    "AnyInRanges",
     "AnyInstance",
+    "AnyKeyedList",
     "AnyLE",
     "AnyLT",
     "AnyMatch",
+    "AnyMonotonic",
     "AnySearch",
+    "AnySorted",
+    "AnySubset",
     "AnySubstr",
+    "AnyUnique",
     "AnyWithAttrs",
     "AnyWithEntries",
+    "KeyedListDiff",
     "Maybe",
+    "Memoized",
     "Not",
+    "Ref",
+    "Sampled",
+    "ValidationResult",
     "any_contains",
     "any_fullmatch",
     "any_func",
@@ -133,12 +182,15 @@ __all__ = [
     "any_substr",
     "any_with_attrs",
     "any_with_entries",
+    "define",
     "maybe",
     "not_",
 ]
 
 T = TypeVar("T")
 
+BytesLike: TypeAlias = bytes | bytearray | memoryview | mmap
+
 ClassInfo: TypeAlias = (
     type | types.UnionType | tuple[type | types.UnionType | tuple[Any, ...], ...]
 )
@@ -153,6 +205,44 @@ class AnyBase(ABC, Base):
     @abstractmethod
     def match(self, value: Any) -> bool: ...
 
+    async def amatch(self, value: Any) -> bool:
+        """
+        Asynchronous version of `match()`.  Matchers that contain other
+        matchers await the inner matchers' ``amatch()`` methods, so
+        `AnyAsyncFunc` matchers can be used anywhere within them.
+        """
+        return self.match(value)
+
+    def match_many(
+        self, values: Iterable[Any], *, mode: ValidationMode = "all"
+    ) -> ValidationResult:
+        """
+        Compare each element of ``values`` against the matcher and return a
+        `ValidationResult` recording which ones matched.  The results are
+        equivalent to ``[self == v for v in values]``, but some matchers
+        compute them more efficiently.
+
+        If ``mode`` is ``"all"`` (the default), every element is compared, and
+        the result records the outcome for each one.  If ``mode`` is
+        ``"first"``, comparison stops at the first element that fails to match
+        (if any), and the result only covers the elements up to & including
+        that one.  Note that matchers with specialized implementations compare
+        elements in batches of up to 65536 (or, for NumPy arrays, all at once),
+        so in ``"first"`` mode they may compare up to one batch past the first
+        failure before stopping.  If ``mode`` is ``"count"``, every element is compared, but
+        the result only records the numbers of passes & failures.
+        """
+        return ValidationResult._build(self, values, self._bulk_match(values), mode)
+
+    def _bulk_match(self, values: Iterable[Any]) -> Iterable[bool]:
+        # Returns an iterable (or 1-D NumPy array) of the results of comparing
+        # each element of `values` against the matcher.  The default
+        # implementation is lazy so that "first" mode can stop early;
+        # overrides must likewise be lazy or else work in `_CHUNK_SIZE`
+        # batches (see `_chunked()`), as `ValidationResult._build()` stops
+        # consuming the results after the first failure.
+        return map(self.__eq__, values)
+
     def __eq__(self, other: Any) -> bool:
         try:
             return self.match(other)
@@ -183,6 +273,18 @@ class AnyBase(ABC, Base):
         else:
             return NotImplemented  # pragma: no cover
 
+    def memoize(
+        self,
+        maxsize: int | None = 128,
+        *,
+        key: Callable[[Any], Hashable] | None = None,
+    ) -> Memoized:
+        """
+        Return a `Memoized` matcher that caches the results of matching
+        hashable values against this matcher
+        """
+        return Memoized(self, maxsize=maxsize, key=key)
+
 
 class AnyArg(AnyBase, Generic[T]):
     def __init__(self, arg: T, *, name: str | None = None) -> None:
@@ -196,6 +298,200 @@ class AnyArg(AnyBase, Generic[T]):
             return f"{type(self).__name__}({self.arg!r})"
 
 
+ValidationMode: TypeAlias = Literal["all", "first", "count"]
+
+
+class ValidationResult:
+    """
+    The results of comparing a collection of values against a matcher with
+    `AnyBase.match_many()`, stored compactly as a bitmap with one bit per
+    value (or, in ``"count"`` mode, as just the numbers of passes & failures).
+
+    In ``"all"`` and ``"first"`` modes, the result can be indexed & iterated
+    over to get the `bool` result for each value, and it compares equal to a
+    `list` or `tuple` of the same `bool` values.  In ``"count"`` mode, only the
+    counts are available.
+    """
+
+    def __init__(
+        self,
+        *,
+        size: int,
+        failed: int,
+        bitmap: bytes | None,
+        mode: ValidationMode,
+        matcher: Any = None,
+        values: Any = None,
+    ) -> None:
+        #: The number of values checked
+        self.size = size
+        #: The number of values that did not match
+        self.count_failed = failed
+        #: The mode in which the values were checked
+        self.mode = mode
+        self._bitmap = bitmap
+        self._matcher = matcher
+        self._values = values
+
+    @classmethod
+    def _build(
+        cls, matcher: Any, values: Iterable[Any], results: Iterable[bool], mode: str
+    ) -> ValidationResult:
+        if mode not in ("all", "first", "count"):
+            raise ValueError(f"Invalid mode: {mode!r}")
+        kept = (
+            values if isinstance(values, Sequence) or _is_numpy_array(values) else None
+        )
+        size = failed = 0
+        bitmap: bytes | None
+        if _is_numpy_array(results):
+            import numpy as np
+
+            results = np.asarray(results, dtype=bool)
+            size = len(results)
+            if mode == "first" and not results.all():
+                size = int(np.argmin(results)) + 1
+                results = results[:size]
+            failed = size - int(np.count_nonzero(results))
+            if mode == "count":
+                bitmap = None
+            else:
+                bitmap = np.packbits(results, bitorder="little").tobytes()
+        elif mode == "first":
+            packed = bytearray()
+            byte = 0
+            for ok in results:
+                if ok:
+                    byte |= 1 << (size % 8)
+                size += 1
+                if size % 8 == 0:
+                    packed.append(byte)
+                    byte = 0
+                if not ok:
+                    failed = 1
+                    break
+            if size % 8:
+                packed.append(byte)
+            bitmap = bytes(packed)
+        else:
+            chunks = []
+            it = map(bool, results)
+            while chunk := bytes(islice(it, _CHUNK_SIZE)):
+                size += len(chunk)
+                failed += chunk.count(0)
+                if mode == "all":
+                    chunks.append(_pack_bits(chunk))
+            bitmap = b"".join(chunks) if mode == "all" else None
+        return cls(
+            size=size,
+            failed=failed,
+            bitmap=bitmap,
+            mode=mode,  # type: ignore[arg-type]
+            matcher=matcher,
+            values=kept,
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"<ValidationResult: {self.size} checked, {self.count_failed} failed"
+            f" ({self.mode} mode)>"
+        )
+
+    @property
+    def count_passed(self) -> int:
+        """The number of values that matched"""
+        return self.size - self.count_failed
+
+    @property
+    def passed(self) -> bool:
+        """Whether all of the checked values matched"""
+        return self.count_failed == 0
+
+    @property
+    def first_failure(self) -> int | None:
+        """The index of the first value that did not match, if any"""
+        return next(self.failures(), None)
+
+    def failures(self) -> Iterator[int]:
+        """Iterate over the indices of the values that did not match"""
+        bitmap = self._require_bitmap()
+        for m in _NOT_ALL_ONES.finditer(bitmap):
+            byte = m.group()[0]
+            base = m.start() * 8
+            for bit in range(8):
+                if not byte & (1 << bit) and base + bit < self.size:
+                    yield base + bit
+
+    def explain(self, i: int) -> list:
+        """
+        Compare the ``i``-th value against the matcher again and return a list
+        of `anys.report.Failure` objects describing where it fails to match
+        (or an empty list if it matches).  This requires that the values
+        passed to `~AnyBase.match_many()` were a sequence (or NumPy array).
+
+        :raises ValueError: if the values were not a sequence
+        """
+        from .report import iter_failures
+
+        if self._values is None:
+            raise ValueError("Values were not a sequence and were not retained")
+        if i < 0:
+            i += self.size
+        if not 0 <= i < self.size:
+            raise IndexError(i)
+        return list(iter_failures(self._matcher, self._values[i]))
+
+    def __len__(self) -> int:
+        return self.size
+
+    def __getitem__(self, i: int) -> bool:
+        bitmap = self._require_bitmap()
+        if i < 0:
+            i += self.size
+        if not 0 <= i < self.size:
+            raise IndexError(i)
+        return bool(bitmap[i // 8] & (1 << (i % 8)))
+
+    def __iter__(self) -> Iterator[bool]:
+        bitmap = self._require_bitmap()
+        for i in range(self.size):
+            yield bool(bitmap[i // 8] & (1 << (i % 8)))
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, ValidationResult):
+            return (self.size, self.count_failed, self._bitmap) == (
+                other.size,
+                other.count_failed,
+                other._bitmap,
+            )
+        elif isinstance(other, (list, tuple)):
+            return self._bitmap is not None and list(self) == list(other)
+        else:
+            return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def _require_bitmap(self) -> bytes:
+        if self._bitmap is None:
+            raise TypeError("Per-value results are not available in count mode")
+        return self._bitmap
+
+
+#: The number of results packed into a bitmap at a time; must be a multiple of 8
+_CHUNK_SIZE = 1 << 16
+
+_BIT_DIGITS = bytes.maketrans(b"\x00\x01", b"01")
+
+_NOT_ALL_ONES = re.compile(rb"[^\xFF]")
+
+
+def _pack_bits(chunk: bytes) -> bytes:
+    # Packs a byte string of zeroes & ones into a little-endian bitmap by
+    # parsing it as a base-2 integer
+    digits = chunk.translate(_BIT_DIGITS)[::-1]
+    return int(digits, 2).to_bytes((len(chunk) + 7) // 8, "little")
+
+
 class AnyFunc(AnyArg[Callable]):
     """
     A matcher that matches any value ``x`` for which ``func(x)`` is true.  If
@@ -208,6 +504,24 @@ class AnyFunc(AnyArg[Callable]):
         return bool(self.arg(value))
 
 
+class AnyAsyncFunc(AnyArg[Callable[[Any], Awaitable[Any]]]):
+    """
+    A matcher that matches any value ``x`` for which ``await func(x)`` is
+    true.  If ``await func(x)`` raises a `TypeError` or `ValueError`, it will
+    be suppressed, and the match will fail.
+
+    This matcher can only be evaluated asynchronously with `amatch()` (either
+    directly or via an enclosing matcher's `amatch()`); comparing it with
+    ``==`` raises a `RuntimeError`.
+    """
+
+    def match(self, value: Any) -> bool:  # noqa: U100
+        raise RuntimeError(f"{self!r} can only be evaluated with amatch()")
+
+    async def amatch(self, value: Any) -> bool:
+        return bool(await self.arg(value))
+
+
 class AnyInstance(AnyArg[ClassInfo]):
     """
     A matcher that matches any value that is an instance of ``classinfo``.
@@ -218,6 +532,12 @@ class AnyInstance(AnyArg[ClassInfo]):
     def match(self, value: Any) -> bool:
         return isinstance(value, self.arg)
 
+    def _bulk_match(self, values: Iterable[Any]) -> Iterable[bool]:
+        classinfo = self.arg
+        return _chunked(
+            self, values, lambda chunk: list(map(isinstance, chunk, repeat(classinfo)))
+        )
+
 
 ANY_BOOL = AnyInstance(bool, name="ANY_BOOL")
 ANY_BYTES = AnyInstance(bytes, name="ANY_BYTES")
@@ -303,6 +623,9 @@ class Maybe(AnyArg[Any]):
     def match(self, value: Any) -> bool:
         return bool(value is None or self.arg == value)
 
+    async def amatch(self, value: Any) -> bool:
+        return value is None or await _aeq(self.arg, value)
+
 
 class Not(AnyArg[Any]):
     """
@@ -313,36 +636,372 @@ class Not(AnyArg[Any]):
     def match(self, value: Any) -> bool:
         return bool(self.arg != value)
 
+    async def amatch(self, value: Any) -> bool:
+        return not await _aeq(self.arg, value)
+
 
-class AnyMatch(AnyArg[AnyStr | Pattern[AnyStr]]):
+#: The exceptions which, when raised while computing or looking up a cache or
+#: sampling key, cause a value to be compared directly instead
+_KEY_ERRORS = (LookupError, TypeError, ValueError)
+
+
+class Memoized(AnyArg[AnyBase]):
+    """
+    A matcher that matches the same values as the matcher ``arg`` but caches
+    the results for hashable values in an LRU cache holding at most
+    ``maxsize`` entries (or an unlimited number if ``maxsize`` is `None`).
+
+    By default, values are cached by both type and value, so ``1``, ``1.0``,
+    and ``True`` get separate cache entries.  If ``key`` is given, it is
+    called on each value to produce the cache key instead.  Values whose keys
+    are not hashable — or for which ``key`` raises a `LookupError`,
+    `TypeError`, or `ValueError` — are matched without consulting the cache.
+
+    The numbers of cache hits & misses are available as the ``hits`` and
+    ``misses`` attributes.
+    """
+
+    def __init__(
+        self,
+        arg: AnyBase,
+        *,
+        maxsize: int | None = 128,
+        key: Callable[[Any], Hashable] | None = None,
+        name: str | None = None,
+    ) -> None:
+        super().__init__(arg, name=name)
+        self.maxsize = maxsize
+        self.key = key
+        self.hits = 0
+        self.misses = 0
+        self._cache: OrderedDict[Hashable, bool] = OrderedDict()
+
+    def match(self, value: Any) -> bool:
+        try:
+            k = _typed_key(value) if self.key is None else self.key(value)
+            r = self._cache.get(k)
+        except _KEY_ERRORS:
+            return bool(self.arg == value)
+        if r is None:
+            r = bool(self.arg == value)
+            self._store(k, r)
+        else:
+            self._hit(k)
+        return r
+
+    async def amatch(self, value: Any) -> bool:
+        try:
+            k = _typed_key(value) if self.key is None else self.key(value)
+            r = self._cache.get(k)
+        except _KEY_ERRORS:
+            return await _aeq(self.arg, value)
+        if r is None:
+            # Another coroutine may store a result for `k` while this one is
+            # suspended, so the miss is only counted once the result is stored
+            r = await _aeq(self.arg, value)
+            self._store(k, r)
+        else:
+            self._hit(k)
+        return r
+
+    def _hit(self, k: Hashable) -> None:
+        self.hits += 1
+        self._cache.move_to_end(k)
+
+    def _store(self, k: Hashable, r: bool) -> None:
+        self.misses += 1
+        self._cache[k] = r
+        self._cache.move_to_end(k)
+        if self.maxsize is not None and len(self._cache) > self.maxsize:
+            self._cache.popitem(last=False)
+
+    @property
+    def currsize(self) -> int:
+        """The number of entries currently in the cache"""
+        return len(self._cache)
+
+    def cache_clear(self) -> None:
+        """Empty the cache and reset the hit & miss counters"""
+        self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+def _typed_key(value: Any) -> Hashable:
+    if isinstance(value, tuple):
+        return (type(value), tuple(map(_typed_key, value)))
+    elif isinstance(value, frozenset):
+        return (type(value), frozenset(map(_typed_key, value)))
+    else:
+        return (type(value), value)
+
+
+class Sampled(AnyArg[Any]):
+    """
+    A matcher that compares only a sample of the values it is compared with
+    against ``arg`` (which can be an `anys` matcher or a plain value, such as
+    a template `dict`) and matches all other values unconditionally, for
+    keeping always-on validation of high-volume data cheap.
+
+    ``rate`` is the fraction of values to check.  If ``key`` is given, it is
+    called on each value to produce a sampling key (such as a request ID),
+    and a value is checked if & only if the CRC-32 of the key (encoded as
+    UTF-8 if it is not `bytes`) falls within the sampled fraction, so the
+    decision for a given key is the same in every process.  Otherwise — or if
+    ``key`` raises a `LookupError`, `TypeError`, or `ValueError` for a value
+    — values are sampled at random using a `random.Random` seeded with
+    ``seed``.
+
+    If ``budget`` is given, the sampling rate is adapted so that checking
+    values takes up at most that fraction of the elapsed time (as measured by
+    ``clock``): at the end of each ``window`` of time, if checking took up
+    more than ``budget``, the rate is lowered in proportion, and otherwise it
+    is raised (at most doubling per window, and never above ``rate``).
+
+    The number of values seen, the number checked, and the number that failed
+    are available as the ``seen``, ``checked``, and ``failed`` attributes.
+    """
+
+    def __init__(
+        self,
+        arg: Any,
+        *,
+        rate: float = 1.0,
+        key: Callable[[Any], Any] | None = None,
+        seed: int | None = None,
+        budget: float | None = None,
+        window: float = 1.0,
+        clock: Callable[[], float] = perf_counter,
+        name: str | None = None,
+    ) -> None:
+        if not 0 <= rate <= 1:
+            raise ValueError("rate must be between 0 and 1")
+        if budget is not None and budget <= 0:
+            raise ValueError("budget must be positive")
+        super().__init__(arg, name=name)
+        self.rate = rate
+        self.key = key
+        self.budget = budget
+        self.window = window
+        self.clock = clock
+        self.seen = 0
+        self.checked = 0
+        self.failed = 0
+        self._random = random.Random(seed).random
+        self._set_rate(rate)
+        self._window_start = clock()
+        self._window_spent = 0.0
+
+    def __repr__(self) -> str:
+        if self.name is not None:
+            return self.name
+        else:
+            return f"Sampled({self.arg!r}, rate={self.rate!r})"
+
+    @property
+    def current_rate(self) -> float:
+        """
+        The sampling rate currently in effect, which is lower than ``rate``
+        if it has been lowered to stay within ``budget``
+        """
+        return self._rate
+
+    @property
+    def coverage(self) -> float:
+        """
+        The fraction of values seen so far that were checked, or 0 if no values
+        have been seen
+        """
+        return self.checked / self.seen if self.seen else 0.0
+
+    def match(self, value: Any) -> bool:
+        self.seen += 1
+        if not self._sampled(value):
+            return True
+        if (budget := self.budget) is None:
+            r = bool(self.arg == value)
+        else:
+            start = self.clock()
+            try:
+                r = bool(self.arg == value)
+            finally:
+                self._spent(start, budget)
+        self._record(r)
+        return r
+
+    async def amatch(self, value: Any) -> bool:
+        self.seen += 1
+        if not self._sampled(value):
+            return True
+        if (budget := self.budget) is None:
+            r = await _aeq(self.arg, value)
+        else:
+            start = self.clock()
+            try:
+                r = await _aeq(self.arg, value)
+            finally:
+                self._spent(start, budget)
+        self._record(r)
+        return r
+
+    def _sampled(self, value: Any) -> bool:
+        if self.key is None:
+            return self._random() < self._rate
+        try:
+            k = self.key(value)
+        except _KEY_ERRORS:
+            return self._random() < self._rate
+        if not isinstance(k, bytes):
+            k = str(k).encode("utf-8")
+        return zlib.crc32(k) < self._threshold
+
+    def _record(self, r: bool) -> None:
+        self.checked += 1
+        if not r:
+            self.failed += 1
+
+    def _set_rate(self, rate: float) -> None:
+        self._rate = rate
+        # CRC-32 values below this are sampled
+        self._threshold = int(rate * 0x100000000)
+
+    def _spent(self, start: float, budget: float) -> None:
+        now = self.clock()
+        self._window_spent += now - start
+        elapsed = now - self._window_start
+        if elapsed >= self.window:
+            usage = self._window_spent / elapsed
+            if usage > budget:
+                rate = self._rate * budget / usage
+            elif usage > 0:
+                rate = min(self._rate * budget / usage, self._rate * 2)
+            else:
+                rate = self._rate * 2
+            # Keep the rate from reaching zero so that it can recover
+            self._set_rate(min(max(rate, 1e-6), self.rate))
+            self._window_start = now
+            self._window_spent = 0.0
+
+
+class _AnyRegex(AnyArg[AnyStr | Pattern[AnyStr]]):
+    def __init__(
+        self,
+        arg: AnyStr | Pattern[AnyStr],
+        *,
+        safe: bool = False,
+        name: str | None = None,
+    ) -> None:
+        self.arg = arg
+        self.name = name
+        self.safe = safe
+        self._safe: SafePattern | None = SafePattern(arg) if safe else None
+        # Substrings that every matching string contains, checked with `in`
+        # before running the regex so that most non-matching strings are
+        # rejected cheaply
+        self._literals: list[Any]
+        self._literal_types: type[str] | tuple[type[bytes], type[bytearray]]
+        try:
+            self._literals = required_literals(arg)
+        except (TypeError, re.error):
+            # Leave invalid patterns to fail when matched, as before
+            self._literals = []
+        if isinstance(getattr(arg, "pattern", arg), str):
+            self._literal_types = str
+        else:
+            self._literal_types = (bytes, bytearray)
+
+    def __repr__(self) -> str:
+        if self.name is None and self.safe:
+            return f"{type(self).__name__}({self.arg!r}, safe=True)"
+        else:
+            return super().__repr__()
+
+    def _may_match(self, value: Any) -> bool:
+        # Returns false if `value` lacks one of the required literals
+        if self._literals and isinstance(value, self._literal_types):
+            for lit in self._literals:
+                if lit not in value:
+                    return False
+        return True
+
+
+class AnyMatch(_AnyRegex):
     """
     A matcher that matches any string ``s`` for which ``re.match(pattern, s)``
-    succeeds
+    succeeds.  If ``pattern`` is a `bytes` pattern, ``s`` may be any
+    bytes-like object (such as a `memoryview` or `mmap`), which will be
+    searched in place without copying.
+
+    If ``safe`` is true, matching is performed in time linear in the length of
+    ``s`` by an automaton-based engine that only supports the regular subset
+    of the regex syntax; patterns using backreferences, lookaround, or other
+    unsupported features are rejected with a `ValueError`.
     """
 
     def match(self, value: Any) -> bool:
+        if not self._may_match(value):
+            return False
+        elif self._safe is not None:
+            return self._safe.match(value)
         return bool(re.match(self.arg, value))
 
+    def _bulk_match(self, values: Iterable[Any]) -> Iterable[bool]:
+        if self._safe is not None:
+            return map(self.__eq__, values)
+        return _regex_many(self, re.compile(self.arg).match, values)
 
-class AnySearch(AnyArg[AnyStr | Pattern[AnyStr]]):
+
+class AnySearch(_AnyRegex):
     """
     A matcher that matches any string ``s`` for which ``re.search(pattern, s)``
-    succeeds
+    succeeds.  If ``pattern`` is a `bytes` pattern, ``s`` may be any
+    bytes-like object (such as a `memoryview` or `mmap`), which will be
+    searched in place without copying.
+
+    If ``safe`` is true, matching is performed in time linear in the length of
+    ``s`` by an automaton-based engine that only supports the regular subset
+    of the regex syntax; patterns using backreferences, lookaround, or other
+    unsupported features are rejected with a `ValueError`.
     """
 
     def match(self, value: Any) -> bool:
+        if not self._may_match(value):
+            return False
+        elif self._safe is not None:
+            return self._safe.search(value)
         return bool(re.search(self.arg, value))
 
+    def _bulk_match(self, values: Iterable[Any]) -> Iterable[bool]:
+        if self._safe is not None:
+            return map(self.__eq__, values)
+        return _regex_many(self, re.compile(self.arg).search, values)
 
-class AnyFullmatch(AnyArg[AnyStr | Pattern[AnyStr]]):
+
+class AnyFullmatch(_AnyRegex):
     """
     A matcher that matches any string ``s`` for which ``re.fullmatch(pattern,
-    s)`` succeeds
+    s)`` succeeds.  If ``pattern`` is a `bytes` pattern, ``s`` may be any
+    bytes-like object (such as a `memoryview` or `mmap`), which will be
+    searched in place without copying.
+
+    If ``safe`` is true, matching is performed in time linear in the length of
+    ``s`` by an automaton-based engine that only supports the regular subset
+    of the regex syntax; patterns using backreferences, lookaround, or other
+    unsupported features are rejected with a `ValueError`.
     """
 
     def match(self, value: Any) -> bool:
+        if not self._may_match(value):
+            return False
+        elif self._safe is not None:
+            return self._safe.fullmatch(value)
         return bool(re.fullmatch(self.arg, value))
 
+    def _bulk_match(self, values: Iterable[Any]) -> Iterable[bool]:
+        if self._safe is not None:
+            return map(self.__eq__, values)
+        return _regex_many(self, re.compile(self.arg).fullmatch, values)
+
 
 class AnyIn(AnyArg[Iterable[T]]):
     """
@@ -350,21 +1009,141 @@ class AnyIn(AnyArg[Iterable[T]]):
     ``iterable`` (which may contain `anys` matchers).  Note that, if
     ``iterable`` is a string, only individual characters in the string will
     match; to match substrings, use `any_substr()` instead.
+
+    `range`, `array.array`, `memoryview`, and NumPy array objects are used in
+    place rather than copied, and membership in a `range` is tested
+    in constant time.  If ``is_sorted`` is true, ``iterable`` must be a
+    sequence sorted in ascending order, and membership is tested by binary
+    search.
     """
 
-    def __init__(self, arg: Iterable[T], *, name: str | None = None) -> None:
-        self.arg: list[T] = list(arg)
+    def __init__(
+        self, arg: Iterable[T], *, is_sorted: bool = False, name: str | None = None
+    ) -> None:
+        self.arg: Sequence[T]
+        if isinstance(arg, (range, array, memoryview)) or _is_numpy_array(arg):
+            self.arg = arg  # type: ignore[assignment]
+        else:
+            self.arg = list(arg)
+        self.is_sorted = is_sorted
         self.name = name
+        # The memory map backing `arg`, if created by `from_sorted_file()`
+        self._mmap: mmap | None = None
+
+    @classmethod
+    def from_sorted_file(
+        cls: type[AnyIn[int]],
+        path: str | os.PathLike[str],
+        typecode: str = "q",
+        *,
+        name: str | None = None,
+    ) -> AnyIn[int]:
+        """
+        Construct an `AnyIn` that matches the integers stored in the file at
+        ``path``, which must consist of fixed-width native-endian integers
+        of the type indicated by the `array` module type code ``typecode``,
+        sorted in ascending order.  The file is memory-mapped read-only
+        rather than read into memory.
+
+        The file itself is closed before returning, but the memory map stays
+        open until the matcher is garbage-collected or `close()` is called
+        (e.g., by using the matcher as a context manager).
+
+        :raises ValueError:
+            if the size of the file is not a multiple of the size of
+            ``typecode``
+        """
+        itemsize = array(typecode).itemsize
+        with open(path, "rb") as fp:
+            size = os.fstat(fp.fileno()).st_size
+            if size % itemsize:
+                raise ValueError(
+                    f"Size of {os.fspath(path)!r} ({size} bytes) is not a multiple"
+                    f" of the item size for typecode {typecode!r} ({itemsize})"
+                )
+            if size == 0:
+                return cls(array(typecode), is_sorted=True, name=name)
+            mm = mmap(fp.fileno(), 0, access=ACCESS_READ)
+        view = memoryview(mm).cast(typecode)  # type: ignore[call-overload]
+        m = cls(view, is_sorted=True, name=name)
+        m._mmap = mm
+        return m
+
+    def close(self) -> None:
+        """
+        Release the memory map created by `from_sorted_file()`, after which
+        the matcher must no longer be used.  This is a no-op for other
+        `AnyIn` instances.
+        """
+        if self._mmap is not None:
+            if isinstance(self.arg, memoryview):
+                self.arg.release()
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self) -> AnyIn[T]:
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
 
     def match(self, value: Any) -> bool:
-        return bool(any(a == value for a in self.arg))
+        arg = self.arg
+        if isinstance(arg, range):
+            return _in_range(value, arg)
+        elif self.is_sorted:
+            if _is_numpy_array(arg):
+                i = arg.searchsorted(value)  # type: ignore[attr-defined]
+            else:
+                i = bisect_left(arg, value)
+            return bool(i < len(arg) and arg[i] == value)
+        elif isinstance(arg, list):
+            return bool(any(a == value for a in arg))
+        else:
+            return bool(value in arg)
+
+    async def amatch(self, value: Any) -> bool:
+        if not isinstance(self.arg, list) or self.is_sorted:
+            return self.match(value)
+        for a in self.arg:
+            if await _aeq(a, value):
+                return True
+        return False
 
 
-class AnySubstr(AnyArg[AnyStr]):
-    """A matcher that matches any substring of ``s``"""
+def _in_range(value: Any, r: range) -> bool:
+    if type(value) in (int, bool):
+        return value in r
+    elif isinstance(value, (Real, Decimal)):
+        try:
+            i = math.trunc(value)
+        except (OverflowError, ValueError):
+            return False
+        return i == value and i in r
+    elif isinstance(value, complex):
+        return value.imag == 0 and _in_range(value.real, r)
+    else:
+        # Avoid falling back to a linear scan of the range
+        return False
+
+
+class AnySubstr(AnyArg[str | BytesLike]):
+    """
+    A matcher that matches any substring of ``s``.  ``s`` may be a `str`,
+    `bytes`, or other bytes-like object (such as a `memoryview` or `mmap`),
+    which will be searched in place without copying.
+    """
 
     def match(self, value: Any) -> bool:
-        return bool(value in self.arg)
+        if isinstance(self.arg, (str, bytes, bytearray)):
+            return bool(value in self.arg)
+        if isinstance(value, int):
+            value = bytes([value])
+        if isinstance(self.arg, mmap):
+            return self.arg.find(value, 0) != -1
+        else:
+            needle = re.escape(memoryview(value).tobytes())
+            return re.search(needle, self.arg) is not None
 
 
 class AnyContains(AnyArg[Any]):
@@ -381,6 +1160,277 @@ class AnyContains(AnyArg[Any]):
         else:
             return bool(self.arg in value)
 
+    async def amatch(self, value: Any) -> bool:
+        if isinstance(self.arg, AnyBase):
+            for v in value:
+                if await _aeq(self.arg, v):
+                    return True
+            return False
+        else:
+            return self.match(value)
+
+
+class AnyContainsDeep(AnyArg[Any]):
+    """
+    A matcher that matches any `dict`, `list`, `tuple`, `set`, or `frozenset`
+    (or other mapping) that contains, at any depth, an element that equals or
+    matches ``arg`` (which can be an `anys` matcher).  The elements of a
+    mapping are its values; its keys are not checked.  If ``max_depth`` is
+    given, elements more than ``max_depth`` levels down are not checked, so
+    ``AnyContainsDeep(arg, max_depth=1)`` only checks the direct elements of
+    the value.
+
+    :raises ValueError: if ``max_depth`` is less than 1
+
+    The value is traversed iteratively, so arbitrarily deep structures can be
+    matched; each container is traversed at most once, even if it is reachable
+    along multiple paths or contains itself.  All of a container's elements
+    are checked before any of them are descended into, and the traversal stops
+    at the first match.  Use the `find_path()` method to find out where the
+    match is.
+    """
+
+    def __init__(
+        self, arg: Any, *, max_depth: int | None = None, name: str | None = None
+    ) -> None:
+        if max_depth is not None and max_depth < 1:
+            raise ValueError("max_depth must be at least 1")
+        super().__init__(arg, name=name)
+        self.max_depth = max_depth
+
+    def match(self, value: Any) -> bool:
+        return any(self.arg == v for _, v in self._walk(value))
+
+    async def amatch(self, value: Any) -> bool:
+        for _, v in self._walk(value):
+            if await _aeq(self.arg, v):
+                return True
+        return False
+
+    def find_path(self, value: Any) -> tuple | None:
+        """
+        Return the path to the first element of ``value`` that equals or
+        matches ``arg`` as a tuple of keys & indices, or `None` if there is no
+        such element.  The path of an element of a `set` or `frozenset` ends
+        with the element itself.
+        """
+        for link, v in self._walk(value):
+            if self.arg == v:
+                path = []
+                while link is not None:
+                    link, key = link
+                    path.append(key)
+                return tuple(reversed(path))
+        return None
+
+    def _walk(self, value: Any) -> Iterator[tuple[Any, Any]]:
+        # Yields each element paired with a linked list of the form
+        # `(parent_link, key)` giving its path
+        if not isinstance(value, _DEEP_CONTAINERS):
+            return
+        seen = {id(value)}
+        stack: list[tuple[Any, Any, int]] = [(value, None, 1)]
+        while stack:
+            container, link, depth = stack.pop()
+            if isinstance(container, Mapping):
+                items: Iterable[tuple[Any, Any]] = container.items()
+            elif isinstance(container, (set, frozenset)):
+                items = ((x, x) for x in container)
+            else:
+                items = enumerate(container)
+            children = []
+            for key, v in items:
+                sublink = (link, key)
+                yield sublink, v
+                if (
+                    isinstance(v, _DEEP_CONTAINERS)
+                    and (self.max_depth is None or depth < self.max_depth)
+                    and id(v) not in seen
+                ):
+                    seen.add(id(v))
+                    children.append((v, sublink, depth + 1))
+            stack.extend(reversed(children))
+
+
+_DEEP_CONTAINERS = (Mapping, list, tuple, set, frozenset)
+
+
+class AnyContainsSubstring(AnyArg[list]):
+    """
+    A matcher that matches any string that contains at least one element of
+    ``literals`` as a substring.  ``literals`` must consist entirely of `str`
+    values or entirely of `bytes` values; in the latter case, any bytes-like
+    object (such as a `memoryview` or `mmap`) can be matched.
+
+    The literals are compiled into an Aho–Corasick automaton at construction
+    time, so each value is scanned in a single pass no matter how many
+    literals there are.  Use the `find()` method to find out which literal
+    matched.
+    """
+
+    def __init__(self, literals: Iterable[AnyStr], *, name: str | None = None) -> None:
+        super().__init__(list(literals), name=name)
+        kinds = {type(lit) for lit in self.arg}
+        if len(kinds) > 1 or not kinds <= {str, bytes}:
+            raise TypeError("Literals must be all str or all bytes")
+        self._bytes = kinds == {bytes}
+        goto: list[dict[str | int, int]] = [{}]
+        out: list[Any] = [None]
+        for lit in self.arg:
+            state = 0
+            for c in lit:
+                nxt = goto[state].get(c)
+                if nxt is None:
+                    goto.append({})
+                    out.append(None)
+                    nxt = goto[state][c] = len(goto) - 1
+                state = nxt
+            if out[state] is None:
+                out[state] = lit
+        fail = [0] * len(goto)
+        queue = list(goto[0].values())
+        for r in queue:
+            for c, u in goto[r].items():
+                queue.append(u)
+                f = fail[r]
+                while f and c not in goto[f]:
+                    f = fail[f]
+                fail[u] = goto[f].get(c, 0)
+                if out[u] is None:
+                    out[u] = out[fail[u]]
+        self._goto = goto
+        self._fail = fail
+        self._out = out
+
+    def match(self, value: Any) -> bool:
+        return self.find(value) is not None
+
+    def find(self, value: Any) -> Any:
+        """
+        Return the element of ``literals`` found in ``value`` that ends
+        earliest in ``value`` (preferring the longest such literal), or `None`
+        if there is no such element.
+
+        :raises TypeError: if ``value`` is not the same type of string as
+            ``literals``
+        """
+        if self._bytes:
+            if isinstance(value, str):
+                raise TypeError("Expected bytes-like value")
+            elif not isinstance(value, (bytes, bytearray)):
+                value = memoryview(value).cast("B")
+        elif not isinstance(value, str):
+            raise TypeError("Expected str value")
+        goto, fail, out = self._goto, self._fail, self._out
+        if out[0] is not None:
+            return out[0]
+        state = 0
+        for c in value:
+            while (nxt := goto[state].get(c)) is None and state:
+                state = fail[state]
+            state = nxt or 0
+            if out[state] is not None:
+                return out[state]
+        return None
+
+
+class AnyEach(AnyArg[Any]):
+    """
+    A matcher that matches any iterable whose elements all equal or match
+    ``arg`` (which can be an `anys` matcher) and that has at least
+    ``min_len`` elements (if given) and at most ``max_len`` elements (if
+    given).
+
+    Iterators are consumed lazily, one element at a time, stopping at the
+    first element that fails to match (or as soon as the iterator is known to
+    be too long).  If ``arg`` is a comparison matcher, a conjunction of
+    comparison matchers, or an `AnyInRanges` with a single range, then `range`
+    objects and `array.array` & `memoryview` objects of integers are matched
+    by just checking their smallest & largest elements.
+    """
+
+    def __init__(
+        self,
+        arg: Any,
+        *,
+        min_len: int | None = None,
+        max_len: int | None = None,
+        name: str | None = None,
+    ) -> None:
+        super().__init__(arg, name=name)
+        self.min_len = min_len
+        self.max_len = max_len
+
+    def __repr__(self) -> str:
+        if self.name is not None:
+            return self.name
+        args = [repr(self.arg)]
+        if self.min_len is not None:
+            args.append(f"min_len={self.min_len!r}")
+        if self.max_len is not None:
+            args.append(f"max_len={self.max_len!r}")
+        return f"AnyEach({', '.join(args)})"
+
+    def match(self, value: Any) -> bool:
+        if hasattr(value, "__len__"):
+            n = len(value)
+            if (self.min_len is not None and n < self.min_len) or (
+                self.max_len is not None and n > self.max_len
+            ):
+                return False
+            if n and self._convex and _is_int_sequence(value):
+                if isinstance(value, range):
+                    lo, hi = sorted([value[0], value[-1]])
+                else:
+                    lo, hi = min(value), max(value)
+                return bool(self.arg == lo and self.arg == hi)
+            return all(map(operator.eq, repeat(self.arg), value))
+        elif self.min_len is None and self.max_len is None:
+            return all(map(operator.eq, repeat(self.arg), value))
+        else:
+            n = 0
+            for x in islice(
+                value, self.max_len + 1 if self.max_len is not None else None
+            ):
+                n += 1
+                if self.arg != x:
+                    return False
+            return (self.max_len is None or n <= self.max_len) and (
+                self.min_len is None or n >= self.min_len
+            )
+
+    async def amatch(self, value: Any) -> bool:
+        n = 0
+        for x in value:
+            n += 1
+            if self.max_len is not None and n > self.max_len:
+                return False
+            if not await _aeq(self.arg, x):
+                return False
+        return self.min_len is None or n >= self.min_len
+
+    @cached_property
+    def _convex(self) -> bool:
+        # Whether the set of values matched by `arg` is an interval, in which
+        # case a sequence matches iff its smallest & largest elements do
+        m = self.arg
+        if type(m) is AnyInRanges:
+            return len(m._intervals) == 1
+        return type(m) in _COMPARISONS or (
+            type(m) is AnyAnd and all(type(a) in _COMPARISONS for a in m.args)
+        )
+
+
+def _is_int_sequence(value: Any) -> bool:
+    if isinstance(value, range):
+        return True
+    elif isinstance(value, array):
+        return value.typecode in "bBhHiIlLqQ"
+    elif isinstance(value, memoryview):
+        return value.ndim == 1 and value.format.lstrip("@=") in tuple("bBhHiIlLqQ")
+    else:
+        return False
+
 
 class AnyWithEntries(AnyArg[Mapping]):
     """
@@ -399,6 +1449,15 @@ class AnyWithEntries(AnyArg[Mapping]):
                 return False
         return True
 
+    async def amatch(self, value: Any) -> bool:
+        for k, v in self.arg.items():
+            try:
+                if not await _aeq(v, value[k]):
+                    return False
+            except LookupError:
+                return False
+        return True
+
 
 class AnyWithAttrs(AnyArg[Mapping]):
     """
@@ -417,6 +1476,733 @@ class AnyWithAttrs(AnyArg[Mapping]):
                 return False
         return True
 
+    async def amatch(self, value: Any) -> bool:
+        for k, v in self.arg.items():
+            try:
+                if not await _aeq(v, getattr(value, k)):
+                    return False
+            except AttributeError:
+                return False
+        return True
+
+
+class AnyAt(AnyBase):
+    """
+    A matcher that matches any value in which the item or items at ``path``
+    equal or match ``matcher`` (which can be an `anys` matcher).
+
+    ``path`` is a string of segments of the following forms, each applied to
+    the result of the previous segment:
+
+    - ``name`` (which must be preceded by a ``.`` unless it is the first
+      segment) — look up the key ``"name"`` with ``obj["name"]``, or, if
+      ``attrs`` is true, the attribute ``name`` with ``getattr(obj, "name")``
+    - ``[n]``, where ``n`` is an integer — look up the index ``n`` with
+      ``obj[n]``
+    - ``["key"]`` or ``['key']`` — look up the key ``"key"`` with
+      ``obj["key"]``, even if ``attrs`` is true
+    - ``[*]`` or ``.*`` — apply the rest of the path to each element of
+      ``obj`` (or each value, if ``obj`` is a mapping)
+
+    If there are any wildcards in ``path``, then, if ``quantifier`` is
+    ``"all"`` (the default), the value matches if the rest of the path matches
+    for every element at each wildcard (including when there are no
+    elements), and, if ``quantifier`` is ``"any"``, the value matches if the
+    rest of the path matches for at least one element.  A value that lacks a
+    key, index, or attribute in the path does not match.
+
+    The path is parsed at construction time into a chain of
+    `operator.itemgetter` and `operator.attrgetter` objects, and the elements
+    at wildcards are iterated over lazily, stopping as soon as the result is
+    known.
+
+    :raises ValueError: if ``path`` or ``quantifier`` is invalid
+    """
+
+    def __init__(
+        self,
+        path: str,
+        matcher: Any,
+        *,
+        quantifier: Literal["all", "any"] = "all",
+        attrs: bool = False,
+        name: str | None = None,
+    ) -> None:
+        if quantifier not in ("all", "any"):
+            raise ValueError(f"Invalid quantifier: {quantifier!r}")
+        self.path = path
+        self.matcher = matcher
+        self.quantifier = quantifier
+        self.attrs = attrs
+        self.name = name
+        self._steps = _compile_path(path, attrs)
+        self._quant = all if quantifier == "all" else any
+
+    def __repr__(self) -> str:
+        if self.name is not None:
+            return self.name
+        args = [repr(self.path), repr(self.matcher)]
+        if self.quantifier != "all":
+            args.append(f"quantifier={self.quantifier!r}")
+        if self.attrs:
+            args.append("attrs=True")
+        return f"AnyAt({', '.join(args)})"
+
+    def match(self, value: Any) -> bool:
+        return self._match_from(0, value)
+
+    async def amatch(self, value: Any) -> bool:
+        return await self._amatch_from(0, value)
+
+    def _match_from(self, i: int, value: Any) -> bool:
+        steps = self._steps
+        while i < len(steps):
+            step = steps[i]
+            i += 1
+            if step is None:
+                try:
+                    elems = _wildcard_elements(value)
+                except TypeError:
+                    return False
+                return bool(self._quant(self._match_from(i, v) for v in elems))
+            try:
+                value = step(value)
+            except (AttributeError, LookupError, TypeError):
+                return False
+        return bool(self.matcher == value)
+
+    async def _amatch_from(self, i: int, value: Any) -> bool:
+        steps = self._steps
+        while i < len(steps):
+            step = steps[i]
+            i += 1
+            if step is None:
+                try:
+                    elems = _wildcard_elements(value)
+                except TypeError:
+                    return False
+                want = self.quantifier == "all"
+                for v in elems:
+                    if await self._amatch_from(i, v) is not want:
+                        return not want
+                return want
+            try:
+                value = step(value)
+            except (AttributeError, LookupError, TypeError):
+                return False
+        return await _aeq(self.matcher, value)
+
+
+_PATH_NAME = re.compile(r"\.?([^.\[\]]+)")
+_PATH_BRACKET = re.compile(r"""\[(?:(\*)|(-?[0-9]+)|'([^']*)'|"([^"]*)")\]""")
+
+
+def _compile_path(path: str, attrs: bool) -> list[Callable[[Any], Any] | None]:
+    # Returns a list of accessors, with `None` representing a wildcard.
+    # Consecutive attribute lookups are combined into a single `attrgetter`.
+    steps: list[Callable[[Any], Any] | None] = []
+    attr_run: list[str] = []
+
+    def flush() -> None:
+        if attr_run:
+            steps.append(operator.attrgetter(".".join(attr_run)))
+            attr_run.clear()
+
+    pos = 0
+    while pos < len(path):
+        if (m := _PATH_BRACKET.match(path, pos)) is not None:
+            flush()
+            star, index, sq, dq = m.groups()
+            if star is not None:
+                steps.append(None)
+            elif index is not None:
+                steps.append(operator.itemgetter(int(index)))
+            else:
+                steps.append(operator.itemgetter(sq if sq is not None else dq))
+        elif (m := _PATH_NAME.match(path, pos)) is not None and (
+            (pos == 0) != (path[pos] == ".")
+        ):
+            key = m[1]
+            if key == "*":
+                flush()
+                steps.append(None)
+            elif attrs:
+                attr_run.append(key)
+            else:
+                steps.append(operator.itemgetter(key))
+        else:
+            raise ValueError(f"Invalid path {path!r}: syntax error at index {pos}")
+        pos = m.end()
+    flush()
+    return steps
+
+
+def _wildcard_elements(value: Any) -> Iterator[Any]:
+    if isinstance(value, Mapping):
+        return iter(value.values())
+    else:
+        return iter(value)
+
+
+class AnySubset(AnyArg[Any]):
+    """
+    A matcher that matches any value that contains the structure described by
+    ``template`` at any depth.  Each `dict` in ``template`` matches any
+    mapping that has at least the dict's keys, with each key's value
+    recursively matching the dict's value for that key.  Each `list` in
+    ``template`` matches any non-string sequence whose elements recursively
+    match the list's elements; if ``ordered`` is true (the default), the
+    sequence must have the same length as the list, and elements are matched
+    by position, while if ``ordered`` is false, each element of the list must
+    match a different element of the sequence, in any order, and the sequence
+    may contain additional elements.  All other values in ``template``
+    (including `anys` matchers) are compared to the corresponding values with
+    ``==``.
+
+    The template is compiled at construction time, and values are matched
+    with a single iterative traversal.
+    """
+
+    def __init__(
+        self, arg: Any, *, ordered: bool = True, name: str | None = None
+    ) -> None:
+        super().__init__(arg, name=name)
+        self.ordered = ordered
+        self._root = _compile_subset(arg)
+
+    def match(self, value: Any) -> bool:
+        walker = self._walk(self._root, value)
+        try:
+            expected, v = next(walker)
+            while True:
+                expected, v = walker.send(expected == v)
+        except StopIteration as e:
+            return bool(e.value)
+
+    async def amatch(self, value: Any) -> bool:
+        walker = self._walk(self._root, value)
+        try:
+            expected, v = next(walker)
+            while True:
+                expected, v = walker.send(await _aeq(expected, v))
+        except StopIteration as e:
+            return bool(e.value)
+
+    def _walk(self, root: list, value: Any) -> Generator[tuple[Any, Any], bool, bool]:
+        # Yields each (expected, actual) pair of leaf values to compare and
+        # receives the results of the comparisons, so that the traversal can be
+        # shared between `match()` and `amatch()`.  Each container node is
+        # visited by a `_visit()` generator that requests the results of its
+        # children; these generators are kept on an explicit stack rather than
+        # nested with ``yield from``, so the Python stack does not grow with
+        # the depth of the template.
+        stack: list[Generator[tuple[list, Any], bool, bool]] = []
+        request: tuple[list, Any] | None = (root, value)
+        result = False
+        while True:
+            if request is not None:
+                (kind, children), v = request
+                if kind is _LEAF:
+                    result = yield (children, v)
+                else:
+                    stack.append(self._visit(kind, children, v))
+                    result = False
+                    request = None
+                    try:
+                        request = next(stack[-1])
+                    except StopIteration as e:
+                        stack.pop()
+                        result = bool(e.value)
+                    else:
+                        continue
+            if not stack:
+                return result
+            try:
+                request = stack[-1].send(result)
+            except StopIteration as e:
+                stack.pop()
+                request = None
+                result = bool(e.value)
+
+    def _visit(
+        self, kind: str, children: list, v: Any
+    ) -> Generator[tuple[list, Any], bool, bool]:
+        # Yields each (child node, value) pair to match and receives the
+        # results
+        if kind is _MAP:
+            if not isinstance(v, Mapping):
+                return False
+            for k, _ in children:
+                if k not in v:
+                    return False
+            for k, child in children:
+                if not (yield (child, v[k])):
+                    return False
+            return True
+        elif isinstance(v, (str, bytes, bytearray)) or not isinstance(v, Sequence):
+            return False
+        elif self.ordered:
+            if len(v) != len(children):
+                return False
+            for child, x in zip(children, v):
+                if not (yield (child, x)):
+                    return False
+            return True
+        else:
+            candidates: list[list[int]] = []
+            for child in children:
+                cands = []
+                for j, x in enumerate(v):
+                    if (yield (child, x)):
+                        cands.append(j)
+                if not cands:
+                    return False
+                candidates.append(cands)
+            return _has_matching(candidates)
+
+
+_LEAF = "leaf"
+_MAP = "map"
+_SEQ = "seq"
+
+
+def _compile_subset(template: Any) -> list:
+    # Each node is a two-element list of a node kind and either a leaf value
+    # or a list of child nodes (paired with keys for `_MAP` nodes)
+    root: list = [_LEAF, None]
+    stack = [(template, root)]
+    while stack:
+        t, node = stack.pop()
+        if isinstance(t, dict):
+            node[:] = [_MAP, [(k, [_LEAF, None]) for k in t]]
+            stack.extend((t[k], child) for k, child in node[1])
+        elif isinstance(t, list):
+            node[:] = [_SEQ, [[_LEAF, None] for _ in t]]
+            stack.extend(zip(t, node[1]))
+        else:
+            node[1] = t
+    return root
+
+
+def _has_matching(candidates: list[list[int]]) -> bool:
+    """
+    Given a list of lists of candidate indices for each template element,
+    determine whether each template element can be assigned a different
+    candidate (i.e., whether a maximum bipartite matching covers all template
+    elements) using Kuhn's algorithm, with the augmenting-path search done
+    iteratively
+    """
+    assigned: dict[int, int] = {}
+    for root in range(len(candidates)):
+        seen: set[int] = set()
+        # `stack` holds the template elements along the current alternating
+        # path together with iterators over their untried candidates, and
+        # `via[k]` is the candidate of `stack[k]` that led to `stack[k + 1]`
+        stack = [(root, iter(candidates[root]))]
+        via: list[int] = []
+        while stack:
+            i, untried = stack[-1]
+            for j in untried:
+                if j not in seen:
+                    break
+            else:
+                stack.pop()
+                if via:
+                    via.pop()
+                continue
+            seen.add(j)
+            if j in assigned:
+                via.append(j)
+                stack.append((assigned[j], iter(candidates[assigned[j]])))
+            else:
+                # Shift each element on the path to the candidate that led
+                # onwards from it, and give `j` to the last one
+                assigned[j] = i
+                for (k, _), jk in zip(stack, via):
+                    assigned[jk] = k
+                break
+        else:
+            return False
+    return True
+
+
+KeyedDuplicates: TypeAlias = Literal["error", "first", "last", "all"]
+
+
+@dataclass
+class KeyedListDiff:
+    """
+    The differences between a list of records and the templates of an
+    `AnyKeyedList`, as returned by `AnyKeyedList.compare()`
+    """
+
+    #: Keys of templates that no record has
+    missing: list[Any] = field(default_factory=list)
+    #: Keys of records that no template has
+    extra: list[Any] = field(default_factory=list)
+    #: Keys whose record (or, with ``duplicates="all"``, at least one of
+    #: whose records) does not match the template
+    mismatched: list[Any] = field(default_factory=list)
+    #: Keys that more than one record has (only reported when ``duplicates``
+    #: is ``"error"``)
+    duplicated: list[Any] = field(default_factory=list)
+    #: Indices of records whose key could not be determined or is not
+    #: hashable
+    unkeyed: list[int] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        """True iff there are no differences"""
+        return not (
+            self.missing
+            or self.extra
+            or self.mismatched
+            or self.duplicated
+            or self.unkeyed
+        )
+
+
+class AnyKeyedList(AnyBase):
+    """
+    A matcher that matches any iterable of records that correspond one-to-one
+    with ``items`` by key, regardless of order, with each record equalling or
+    matching the template in ``items`` with the same key.
+
+    ``key`` is either a callable that extracts the key from a record or else
+    a key for looking up the record's key with ``record[key]``.  The key of
+    each template in ``items`` (which may be `dict`\\s, `AnyWithEntries`
+    matchers, or other values that ``key`` can be applied to) is determined
+    the same way at construction time, so it must be a plain, hashable value.
+
+    The records and templates are joined with a hash table on their keys, so
+    matching takes time linear in the number of records.  ``duplicates``
+    determines what happens when multiple records have the same key:
+
+    - ``"error"`` (the default) — the value does not match
+    - ``"first"`` — only the first record with each key is compared
+    - ``"last"`` — only the last record with each key is compared
+    - ``"all"`` — every record with each key must match the template
+
+    :raises ValueError:
+        if the key of a template cannot be determined, is a matcher, or is
+        shared by another template
+    """
+
+    def __init__(
+        self,
+        items: Iterable[Any],
+        *,
+        key: Any,
+        duplicates: KeyedDuplicates = "error",
+        name: str | None = None,
+    ) -> None:
+        if duplicates not in ("error", "first", "last", "all"):
+            raise ValueError(f"Invalid duplicates policy: {duplicates!r}")
+        self.items = list(items)
+        self.key = key
+        self.duplicates = duplicates
+        self.name = name
+        self._get: Callable[[Any], Any] = (
+            key if callable(key) else operator.itemgetter(key)
+        )
+        self._templates: dict[Any, Any] = {}
+        for t in self.items:
+            try:
+                k = self._get(t.arg if type(t) is AnyWithEntries else t)
+                hash(k)
+            except (LookupError, TypeError):
+                raise ValueError(f"Cannot determine key of template {t!r}")
+            if isinstance(k, AnyBase):
+                raise ValueError(f"Key of template {t!r} is a matcher")
+            if k in self._templates:
+                raise ValueError(f"Duplicate key in templates: {k!r}")
+            self._templates[k] = t
+
+    def __repr__(self) -> str:
+        if self.name is not None:
+            return self.name
+        s = f"AnyKeyedList({self.items!r}, key={self.key!r}"
+        if self.duplicates != "error":
+            s += f", duplicates={self.duplicates!r}"
+        return s + ")"
+
+    def match(self, value: Any) -> bool:
+        return self._compare(value, stop=True).ok
+
+    async def amatch(self, value: Any) -> bool:
+        diff = KeyedListDiff()
+        joiner = self._join(value, diff, stop=True)
+        try:
+            template, record = next(joiner)
+            while True:
+                template, record = joiner.send(await _aeq(template, record))
+        except StopIteration:
+            pass
+        return diff.ok
+
+    def compare(self, value: Iterable[Any]) -> KeyedListDiff:
+        """
+        Join the records in ``value`` with the templates and return a
+        `KeyedListDiff` listing the missing keys, extra keys, mismatched
+        records, duplicated keys, and records without usable keys
+        """
+        return self._compare(value, stop=False)
+
+    def _compare(self, value: Iterable[Any], stop: bool) -> KeyedListDiff:
+        diff = KeyedListDiff()
+        joiner = self._join(value, diff, stop)
+        try:
+            template, record = next(joiner)
+            while True:
+                template, record = joiner.send(template == record)
+        except StopIteration:
+            pass
+        return diff
+
+    def _join(
+        self, value: Iterable[Any], diff: KeyedListDiff, stop: bool
+    ) -> Generator[tuple[Any, Any], bool, None]:
+        # Fills in `diff`, yielding each (template, record) pair to compare and
+        # receiving the results of the comparisons, so that the join can be
+        # shared between `compare()` and `amatch()`
+        get = self._get
+        keep_all = self.duplicates in ("error", "all")
+        first_only = self.duplicates == "first"
+        index: dict[Any, list[Any]] = {}
+        for i, record in enumerate(value):
+            try:
+                k = get(record)
+                records = index.get(k)
+            except (LookupError, TypeError):
+                diff.unkeyed.append(i)
+                if stop:
+                    return
+                continue
+            if records is None:
+                index[k] = [record]
+            elif keep_all:
+                records.append(record)
+            elif not first_only:
+                records[0] = record
+        for k, template in self._templates.items():
+            records = index.pop(k, None)
+            if records is None:
+                diff.missing.append(k)
+            elif len(records) > 1 and self.duplicates == "error":
+                diff.duplicated.append(k)
+            else:
+                for r in records:
+                    if not (yield (template, r)):
+                        diff.mismatched.append(k)
+                        break
+                else:
+                    continue
+            if stop:
+                return
+        for k, records in index.items():
+            diff.extra.append(k)
+            if len(records) > 1 and self.duplicates == "error":
+                diff.duplicated.append(k)
+
+
+class AnySorted(AnyBase):
+    """
+    A matcher that matches any iterable whose elements (or the results of
+    applying ``key`` to them) are in ascending order — or descending order if
+    ``reverse`` is true — with consecutive elements allowed to be equal unless
+    ``strict`` is true.
+
+    Consecutive pairs are compared using C-level iteration, stopping at the
+    first pair out of order.  One-dimensional numeric NumPy arrays are
+    compared with vectorized operations when ``key`` is not given.
+    """
+
+    def __init__(
+        self,
+        *,
+        key: Callable[[Any], Any] | None = None,
+        strict: bool = False,
+        reverse: bool = False,
+        name: str | None = None,
+    ) -> None:
+        self.key = key
+        self.strict = strict
+        self.reverse = reverse
+        self.name = name
+
+    def __repr__(self) -> str:
+        return _order_repr(
+            self,
+            key=(self.key, None),
+            strict=(self.strict, False),
+            reverse=(self.reverse, False),
+        )
+
+    def match(self, value: Any) -> bool:
+        return self.first_violation(value) is None
+
+    def first_violation(self, value: Iterable[Any]) -> int | None:
+        """
+        Return the index of the first element of ``value`` that is out of
+        order relative to the element before it, or `None` if there is no
+        such element
+        """
+        if self.reverse:
+            op = operator.gt if self.strict else operator.ge
+        else:
+            op = operator.lt if self.strict else operator.le
+        return _first_unordered(value, op, self.key)
+
+
+class AnyMonotonic(AnyBase):
+    """
+    A matcher that matches any iterable whose elements (or the results of
+    applying ``key`` to them) are in either ascending or descending order,
+    with consecutive elements allowed to be equal unless ``strict`` is true.
+    See `AnySorted` for details on how the elements are compared.
+    """
+
+    def __init__(
+        self,
+        *,
+        key: Callable[[Any], Any] | None = None,
+        strict: bool = False,
+        name: str | None = None,
+    ) -> None:
+        self.key = key
+        self.strict = strict
+        self.name = name
+
+    def __repr__(self) -> str:
+        return _order_repr(self, key=(self.key, None), strict=(self.strict, False))
+
+    def match(self, value: Any) -> bool:
+        return self.first_violation(value) is None
+
+    def first_violation(self, value: Iterable[Any]) -> int | None:
+        """
+        Return the index of the first element of ``value`` at which the
+        elements before it & including it are in neither ascending nor
+        descending order, or `None` if there is no such element
+        """
+        if not isinstance(value, Sequence) and not _is_numpy_array(value):
+            value = list(value)
+        up = operator.lt if self.strict else operator.le
+        if (i := _first_unordered(value, up, self.key)) is None:
+            return None
+        down = operator.gt if self.strict else operator.ge
+        if (j := _first_unordered(value, down, self.key)) is None:
+            return None
+        return max(i, j)
+
+
+def _first_unordered(
+    values: Any,
+    op: Callable[[Any, Any], Any],
+    key: Callable[[Any], Any] | None,
+) -> int | None:
+    # Returns the index of the first element `x` for which `op(prev, x)` is
+    # false, where `prev` is the element before it
+    if key is None and _is_numeric_array(values):
+        bad = ~op(values[:-1], values[1:])
+        return int(bad.argmax()) + 1 if bad.any() else None
+    if key is not None:
+        values = map(key, values)
+    unordered = map(operator.not_, starmap(op, pairwise(values)))
+    return next(compress(count(1), unordered), None)
+
+
+class AnyUnique(AnyBase):
+    """
+    A matcher that matches any iterable whose elements (or the results of
+    applying ``key`` to them) are all distinct, i.e., no two compare equal.
+
+    Elements are tracked in a hash set.  Unhashable `list`, `dict`, and `set`
+    elements (including ones nested inside tuples & each other) are converted
+    to hashable equivalents that compare equal if & only if the originals do;
+    any other unhashable elements are compared with ``==`` against each
+    other.
+    """
+
+    def __init__(
+        self, *, key: Callable[[Any], Any] | None = None, name: str | None = None
+    ) -> None:
+        self.key = key
+        self.name = name
+
+    def __repr__(self) -> str:
+        return _order_repr(self, key=(self.key, None))
+
+    def match(self, value: Any) -> bool:
+        if self.key is None and _is_numpy_array(value):
+            value = value.tolist()
+        if self.key is None and isinstance(value, Sequence):
+            try:
+                # Fast path for sequences of hashable values
+                return len(set(value)) == len(value)
+            except TypeError:
+                pass
+        return self.first_violation(value) is None
+
+    def first_violation(self, value: Iterable[Any]) -> int | None:
+        """
+        Return the index of the first element of ``value`` that equals an
+        earlier element, or `None` if there is no such element
+        """
+        values: Any = value
+        if self.key is not None:
+            values = map(self.key, values)
+        elif _is_numpy_array(values):
+            values = values.tolist()
+        seen: set[Any] = set()
+        others: list[Any] = []
+        for i, x in enumerate(values):
+            try:
+                k = x if type(x) in _SCALARS else _canonical(x)
+                if k in seen:
+                    return i
+                seen.add(k)
+            except TypeError:
+                if any(x == y for y in others):
+                    return i
+                others.append(x)
+        return None
+
+
+#: Types whose instances are hashable and need no canonicalization
+_SCALARS = frozenset([int, float, str, bytes, bool, type(None)])
+
+# Tags marking canonical forms of unhashable values so that they are distinct
+# from all other values
+_LIST_TAG = object()
+_DICT_TAG = object()
+
+
+def _canonical(x: Any) -> Any:
+    # Returns a hashable value that equals `_canonical(y)` iff `x == y` for
+    # lists, dicts, sets, and tuples thereof
+    if isinstance(x, list):
+        return (_LIST_TAG, tuple(map(_canonical, x)))
+    elif isinstance(x, tuple):
+        return tuple(map(_canonical, x))
+    elif isinstance(x, Mapping):
+        return (_DICT_TAG, frozenset((k, _canonical(v)) for k, v in x.items()))
+    elif isinstance(x, (set, frozenset)):
+        return frozenset(map(_canonical, x))
+    else:
+        hash(x)
+        return x
+
+
+def _order_repr(m: AnyBase, **options: tuple[Any, Any]) -> str:
+    # Renders `options`, a mapping from argument names to (value, default)
+    # pairs, omitting arguments with their default values
+    name = getattr(m, "name", None)
+    if name is not None:
+        return str(name)
+    args = ", ".join(f"{k}={v!r}" for k, (v, d) in options.items() if v != d)
+    return f"{type(m).__name__}({args})"
+
 
 class AnyLT(AnyArg[Any]):
     """A matcher that matches any value less than ``bound``"""
@@ -424,6 +2210,9 @@ class AnyLT(AnyArg[Any]):
     def match(self, value: Any) -> bool:
         return bool(value < self.arg)
 
+    def _bulk_match(self, values: Iterable[Any]) -> Iterable[bool]:
+        return _compare_many(self, operator.lt, values)
+
 
 class AnyLE(AnyArg[Any]):
     """A matcher that matches any value less than or equal to ``bound``"""
@@ -431,6 +2220,9 @@ class AnyLE(AnyArg[Any]):
     def match(self, value: Any) -> bool:
         return bool(value <= self.arg)
 
+    def _bulk_match(self, values: Iterable[Any]) -> Iterable[bool]:
+        return _compare_many(self, operator.le, values)
+
 
 class AnyGT(AnyArg[Any]):
     """A matcher that matches any value greater than ``bound``"""
@@ -438,6 +2230,9 @@ class AnyGT(AnyArg[Any]):
     def match(self, value: Any) -> bool:
         return bool(value > self.arg)
 
+    def _bulk_match(self, values: Iterable[Any]) -> Iterable[bool]:
+        return _compare_many(self, operator.gt, values)
+
 
 class AnyGE(AnyArg[Any]):
     """A matcher that matches any value greater than or equal to ``bound``"""
@@ -445,6 +2240,202 @@ class AnyGE(AnyArg[Any]):
     def match(self, value: Any) -> bool:
         return bool(value >= self.arg)
 
+    def _bulk_match(self, values: Iterable[Any]) -> Iterable[bool]:
+        return _compare_many(self, operator.ge, values)
+
+
+Closed: TypeAlias = bool | Literal["left", "right"]
+
+
+class AnyInRanges(AnyArg[list]):
+    """
+    A matcher that matches any value that lies within at least one of the
+    given ranges.  Each range is a tuple ``(lo, hi)`` or ``(lo, hi, closed)``,
+    where ``closed`` is `True` (the default) if both bounds are inclusive,
+    `False` if both are exclusive, ``"left"`` if only ``lo`` is inclusive, or
+    ``"right"`` if only ``hi`` is inclusive.  Either bound may be `None` to
+    leave that side of the range unbounded.  All bounds must be comparable
+    with each other.
+
+    Overlapping & adjacent ranges are merged at construction time, after
+    which each match takes logarithmic time.
+    """
+
+    def __init__(
+        self,
+        ranges: Iterable[tuple[Any, Any] | tuple[Any, Any, Closed]],
+        *,
+        name: str | None = None,
+    ) -> None:
+        super().__init__(list(ranges), name=name)
+        bounded: list[tuple[Any, bool, Any, bool]] = []
+        unbounded: list[tuple[Any, bool, Any, bool]] = []
+        for r in self.arg:
+            lo, hi, *rest = r
+            if len(rest) > 1:
+                raise ValueError(f"Invalid range: {r!r}")
+            closed = rest[0] if rest else True
+            if not (isinstance(closed, bool) or closed in ("left", "right")):
+                raise ValueError(f"Invalid 'closed' value: {closed!r}")
+            lo_incl = closed is True or closed == "left"
+            hi_incl = closed is True or closed == "right"
+            if lo is not None and hi is not None:
+                if hi < lo or (lo == hi and not (lo_incl and hi_incl)):
+                    continue
+            (unbounded if lo is None else bounded).append((lo, lo_incl, hi, hi_incl))
+        bounded.sort(key=lambda iv: (iv[0], not iv[1]))
+        merged: list[tuple[Any, bool, Any, bool]] = []
+        for iv in unbounded + bounded:
+            if merged:
+                plo, plo_incl, phi, phi_incl = merged[-1]
+                lo, lo_incl, hi, hi_incl = iv
+                if (
+                    phi is None
+                    or lo is None
+                    or lo < phi
+                    or (lo == phi and (phi_incl or lo_incl))
+                ):
+                    if phi is None or hi is None:
+                        merged[-1] = (plo, plo_incl, None, False)
+                    elif phi < hi:
+                        merged[-1] = (plo, plo_incl, hi, hi_incl)
+                    elif phi == hi:
+                        merged[-1] = (plo, plo_incl, phi, phi_incl or hi_incl)
+                    continue
+            merged.append(iv)
+        self._intervals = merged
+        self._offset = 1 if merged and merged[0][0] is None else 0
+        self._lows = [iv[0] for iv in merged[self._offset :]]
+
+    def match(self, value: Any) -> bool:
+        i = bisect_right(self._lows, value) - 1 + self._offset
+        if i < 0:
+            return False
+        lo, lo_incl, hi, hi_incl = self._intervals[i]
+        if lo is not None and not (lo <= value if lo_incl else lo < value):
+            return False
+        if hi is None:
+            return True
+        return bool(value <= hi if hi_incl else value < hi)
+
+    @classmethod
+    def _from_matchers(cls, matchers: Iterable[AnyBase]) -> AnyInRanges | None:
+        """
+        If ``matchers`` consists entirely of comparison matchers and
+        conjunctions of a lower-bound and an upper-bound comparison, all with
+        totally-ordered bounds of the same kind, return an `AnyInRanges` that
+        matches the same values as their disjunction; otherwise, return `None`.
+        """
+        ranges: list[tuple[Any, Any, Closed]] = []
+        kinds: set[type] = set()
+        for m in matchers:
+            lower: AnyArg | None = None
+            upper: AnyArg | None = None
+            for c in m.args if type(m) is AnyAnd else [m]:
+                if type(c) in (AnyGE, AnyGT) and lower is None:
+                    lower = c
+                elif type(c) in (AnyLE, AnyLT) and upper is None:
+                    upper = c
+                else:
+                    return None
+            for bound in (lower, upper):
+                if bound is not None:
+                    if (k := _ordered_kind(bound.arg)) is None:
+                        return None
+                    kinds.add(k)
+            lo_incl = lower is None or type(lower) is AnyGE
+            hi_incl = upper is None or type(upper) is AnyLE
+            closed: Closed
+            if lo_incl and hi_incl:
+                closed = True
+            elif lo_incl:
+                closed = "left"
+            elif hi_incl:
+                closed = "right"
+            else:
+                closed = False
+            ranges.append(
+                (
+                    None if lower is None else lower.arg,
+                    None if upper is None else upper.arg,
+                    closed,
+                )
+            )
+        if len(kinds) > 1:
+            return None
+        try:
+            return cls(ranges)
+        except TypeError:
+            return None
+
+
+_COMPARISONS = (AnyLT, AnyLE, AnyGT, AnyGE)
+
+
+def _compare_many(
+    m: AnyArg, op: Callable[[Any, Any], Any], values: Iterable[Any]
+) -> Iterable[bool]:
+    bound = m.arg
+    if _is_numeric_array(values) and type(bound) in (bool, int, float):
+        try:
+            return op(values, bound)  # type: ignore[no-any-return]
+        except (OverflowError, TypeError):
+            pass
+    return _chunked(
+        m, values, lambda chunk: list(map(bool, map(op, chunk, repeat(bound))))
+    )
+
+
+def _regex_many(
+    m: _AnyRegex, func: Callable[[Any], Any], values: Iterable[Any]
+) -> Iterable[bool]:
+    if m._literals:
+        may_match = m._may_match
+        return _chunked(
+            m,
+            values,
+            lambda chunk: [may_match(v) and func(v) is not None for v in chunk],
+        )
+    return _chunked(m, values, lambda chunk: [func(v) is not None for v in chunk])
+
+
+def _chunked(
+    m: AnyBase, values: Iterable[Any], fast: Callable[[list], list[bool]]
+) -> Iterator[bool]:
+    # Lazily yields the results of applying `fast` to successive slices of
+    # `values`, falling back to comparing each element of a slice with
+    # `m.__eq__` if `fast` raises on it, so that only one slice's worth of
+    # results is held at a time and "first" mode can stop after the slice
+    # containing the first failure
+    it = iter(values)
+    while chunk := list(islice(it, _CHUNK_SIZE)):
+        try:
+            results = fast(chunk)
+        except (TypeError, ValueError):
+            results = list(map(m.__eq__, chunk))
+        yield from results
+
+
+def _is_numpy_array(values: Any) -> bool:
+    # Detect one-dimensional NumPy arrays without importing NumPy
+    return type(values).__module__ == "numpy" and getattr(values, "ndim", None) == 1
+
+
+def _is_numeric_array(values: Any) -> bool:
+    return _is_numpy_array(values) and values.dtype.kind in "biuf"
+
+
+def _ordered_kind(bound: Any) -> type | None:
+    if type(bound) in (bool, int, float, Decimal, Fraction):
+        if bound != bound:
+            # NaN
+            return None
+        return Real
+    elif type(bound) in (str, bytes, date, datetime, time, timedelta):
+        return type(bound)
+    else:
+        return None
+
 
 ANY_TRUTHY = AnyFunc(bool, name="ANY_TRUTHY")
 ANY_FALSY = AnyFunc(operator.not_, name="ANY_FALSY")
@@ -472,10 +2463,36 @@ ANY_AWARE_TIME_STR = AnyFullmatch(
 )
 ANY_NAIVE_TIME_STR = AnyFullmatch(re.compile(TIME_RGX), name="ANY_NAIVE_TIME_STR")
 
+DATE_BRGX = DATE_RGX.encode("us-ascii")
+TIME_BRGX = TIME_RGX.encode("us-ascii")
+TZ_BRGX = TZ_RGX.encode("us-ascii")
+
+ANY_DATETIME_BYTES = AnyFullmatch(
+    re.compile(DATE_BRGX + b"[T ]" + TIME_BRGX + b"(?:" + TZ_BRGX + b")?"),
+    name="ANY_DATETIME_BYTES",
+)
+ANY_AWARE_DATETIME_BYTES = AnyFullmatch(
+    re.compile(DATE_BRGX + b"[T ]" + TIME_BRGX + TZ_BRGX),
+    name="ANY_AWARE_DATETIME_BYTES",
+)
+ANY_NAIVE_DATETIME_BYTES = AnyFullmatch(
+    re.compile(DATE_BRGX + b"[T ]" + TIME_BRGX), name="ANY_NAIVE_DATETIME_BYTES"
+)
+
+ANY_DATE_BYTES = AnyFullmatch(re.compile(DATE_BRGX), name="ANY_DATE_BYTES")
+
+ANY_TIME_BYTES = AnyFullmatch(
+    re.compile(TIME_BRGX + b"(?:" + TZ_BRGX + b")?"), name="ANY_TIME_BYTES"
+)
+ANY_AWARE_TIME_BYTES = AnyFullmatch(
+    re.compile(TIME_BRGX + TZ_BRGX), name="ANY_AWARE_TIME_BYTES"
+)
+ANY_NAIVE_TIME_BYTES = AnyFullmatch(re.compile(TIME_BRGX), name="ANY_NAIVE_TIME_BYTES")
+
 
 class AnyArgs(AnyBase):
     def __init__(self, *args: AnyBase, name: str | None = None) -> None:
-        self.args: list[AnyBase] = list(args)
+        self.args: tuple[AnyBase, ...] = args
         self.name = name
 
     def __repr__(self) -> str:
@@ -486,7 +2503,161 @@ class AnyAnd(AnyArgs):
     def match(self, value: Any) -> bool:
         return bool(all(a == value for a in self.args))
 
+    async def amatch(self, value: Any) -> bool:
+        for a in self.args:
+            if not await _aeq(a, value):
+                return False
+        return True
+
 
 class AnyOr(AnyArgs):
+    def __init__(self, *args: AnyBase, name: str | None = None) -> None:
+        super().__init__(*args, name=name)
+        # Disjunctions of interval comparisons are evaluated by binary search
+        self._ranges = AnyInRanges._from_matchers(self.args)
+
     def match(self, value: Any) -> bool:
+        if self._ranges is not None:
+            return bool(self._ranges == value)
         return bool(any(a == value for a in self.args))
+
+    async def amatch(self, value: Any) -> bool:
+        if self._ranges is not None:
+            return self.match(value)
+        for a in self.args:
+            if await _aeq(a, value):
+                return True
+        return False
+
+
+class Ref(AnyBase):
+    """
+    A reference to a matcher that is supplied later via the `define()`
+    method, for use in building recursive matchers.  A `Ref` matches the same
+    values as the matcher it refers to.
+
+    During a single top-level match, each combination of a `Ref` and a value
+    (compared by identity) is only evaluated once, so nodes of trees & DAGs
+    that are referenced multiple times are only validated once, and matching
+    cyclic structures terminates.  A value that is encountered again while it
+    is still being matched against the same `Ref` is provisionally assumed to
+    match.
+    """
+
+    def __init__(self, *, name: str | None = None) -> None:
+        self.matcher: Any = None
+        self.name = name
+
+    def __repr__(self) -> str:
+        return self.name if self.name is not None else "Ref()"
+
+    def define(self, matcher: Any) -> Ref:
+        """Set the matcher (or plain value) that this `Ref` refers to"""
+        self.matcher = matcher
+        return self
+
+    def match(self, value: Any) -> bool:
+        memo = _ref_memo.get()
+        token = None
+        if memo is None:
+            memo = {}
+            token = _ref_memo.set(memo)
+        try:
+            key = (id(value), id(self))
+            if (cached := _ref_lookup(memo, key, value)) is not None:
+                return cached
+            r = bool(self._target() == value)
+            _ref_store(memo, key, r)
+            return r
+        finally:
+            if token is not None:
+                _ref_memo.reset(token)
+
+    async def amatch(self, value: Any) -> bool:
+        memo = _ref_memo.get()
+        token = None
+        if memo is None:
+            memo = {}
+            token = _ref_memo.set(memo)
+        try:
+            key = (id(value), id(self))
+            if (cached := _ref_lookup(memo, key, value)) is not None:
+                return cached
+            r = await _aeq(self._target(), value)
+            _ref_store(memo, key, r)
+            return r
+        finally:
+            if token is not None:
+                _ref_memo.reset(token)
+
+    def _target(self) -> Any:
+        if self.matcher is None:
+            raise RuntimeError(f"{self!r} was used before being defined")
+        return self.matcher
+
+
+def define(func: Callable[[Ref], Any], *, name: str | None = None) -> Ref:
+    """
+    Create a recursive matcher by calling ``func`` on a new `Ref` and
+    defining the `Ref` as the result.  For example, the following matches
+    trees of ``{"value": int, "children": [...]}`` dicts:
+
+    .. code:: python
+
+        tree = define(
+            lambda self: AnyWithEntries({"value": ANY_INT, "children": AnyEach(self)})
+        )
+    """
+    ref = Ref(name=name)
+    return ref.define(func(ref))
+
+
+# Memo of `Ref` results for the current top-level match.  Keys are (id(value),
+# id(ref)) pairs; values are [value, result, cycle_hit] lists, where `value`
+# keeps the value alive (and thus its ID unique) for the duration of the
+# match, `result` is `None` while the match is in progress, and `cycle_hit`
+# records whether the in-progress match was provisionally assumed to succeed.
+# Dicts preserve insertion order, which `_ref_store()` relies on.
+_ref_memo: ContextVar[dict[tuple[int, int], list] | None] = ContextVar(
+    "_ref_memo", default=None
+)
+
+
+def _ref_lookup(
+    memo: dict[tuple[int, int], list], key: tuple[int, int], value: Any
+) -> bool | None:
+    if (entry := memo.get(key)) is None:
+        memo[key] = [value, None, False]
+        return None
+    elif entry[1] is None:
+        entry[2] = True
+        return True
+    else:
+        return bool(entry[1])
+
+
+def _ref_store(
+    memo: dict[tuple[int, int], list], key: tuple[int, int], r: bool
+) -> None:
+    entry = memo[key]
+    if not r and entry[2]:
+        # Results computed since this match started may have relied on the
+        # provisional assumption that it would succeed, so discard them.
+        keys = list(memo)
+        for k in keys[keys.index(key) + 1 :]:
+            del memo[k]
+    entry[1] = r
+
+
+async def _aeq(expected: Any, value: Any) -> bool:
+    """
+    Asynchronously evaluate ``expected == value``, awaiting ``expected``'s
+    `~AnyBase.amatch()` method if it is an `anys` matcher
+    """
+    if isinstance(expected, AnyBase):
+        try:
+            return await expected.amatch(value)
+        except (TypeError, ValueError):
+            return False
+    else:
+        return bool(expected == value)
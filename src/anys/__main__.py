@@ -0,0 +1,576 @@
+"""
+Command-line interface for ``anys``
+
+Currently, the only command is ``validate``, which checks each line of a JSON
+Lines file against an ``anys`` template:
+
+.. code:: shell
+
+    python -m anys validate --spec mymodule:TEMPLATE [--workers N] data.jsonl[.gz]
+
+The input is read in large blocks, which are split into chunks ending at line
+boundaries and distributed to a pool of worker processes; each worker parses
+& checks the lines of its chunks and sends back only the line numbers & paths
+of the failures and an `anys.report.FailureReport` aggregating them.  The
+failing line numbers are written to standard output, followed by a summary of
+the throughput and the failures per path on standard error.  The exit status
+is 1 if any line failed and 0 otherwise.
+
+With ``--follow``, the file is instead monitored for appended lines, which are
+checked as they arrive; see `Follower`.
+"""
+
+from __future__ import annotations
+import argparse
+from collections import deque
+from collections.abc import Iterable, Iterator
+from concurrent.futures import Future, ProcessPoolExecutor
+from contextlib import AbstractContextManager, nullcontext
+from dataclasses import dataclass, field
+import gzip
+import importlib
+import json
+import os
+import sys
+from time import perf_counter, sleep
+from typing import IO, Any
+from .report import FailureReport
+
+__all__ = [
+    "CheckpointError",
+    "ChunkResult",
+    "Follower",
+    "check_chunk",
+    "follow",
+    "iter_chunks",
+    "load_spec",
+    "main",
+    "validate",
+]
+
+#: The default number of bytes to read from the input at a time
+BLOCK_SIZE = 4 << 20
+
+#: The default maximum length of a line in follow mode
+MAX_LINE_LENGTH = 64 << 20
+
+
+@dataclass
+class ChunkResult:
+    """The results of checking one chunk of lines"""
+
+    #: The number of (non-blank) lines checked
+    records: int
+    #: The size of the chunk in bytes
+    size: int
+    #: A list of ``(lineno, [(path, reason), ...])`` pairs for each failing
+    #: line, where ``path`` is formatted with `anys.report.format_path()` and
+    #: ``reason`` is a `anys.report.Failure` reason or ``"invalid JSON"``
+    failures: list[tuple[int, list[tuple[str, str]]]] = field(default_factory=list)
+    #: The failures aggregated by path
+    report: FailureReport | None = None
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(
+        prog="anys", description="Check data against anys templates"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    vparser = subparsers.add_parser(
+        "validate",
+        help="Check each line of a JSON Lines file against a template",
+        description=(
+            "Check each line of a JSON Lines file (optionally gzipped) against"
+            " an anys template.  Failing line numbers are written to standard"
+            " output, and a summary is written to standard error."
+        ),
+    )
+    vparser.add_argument(
+        "--spec",
+        required=True,
+        metavar="MODULE:NAME",
+        help="The template to check against, as a module name & attribute path",
+    )
+    vparser.add_argument(
+        "-w",
+        "--workers",
+        type=int,
+        default=1,
+        metavar="N",
+        help="Check lines in N worker processes [default: 1]",
+    )
+    vparser.add_argument(
+        "--block-size",
+        type=int,
+        default=BLOCK_SIZE,
+        metavar="BYTES",
+        help=f"Read the input BYTES bytes at a time [default: {BLOCK_SIZE}]",
+    )
+    vparser.add_argument(
+        "--summary-json",
+        metavar="FILE",
+        help="Write the failures aggregated by path to FILE as JSON",
+    )
+    vparser.add_argument(
+        "-f",
+        "--follow",
+        action="store_true",
+        help=(
+            "Keep checking lines as they are appended to the file, writing"
+            " failures to standard output as JSON"
+        ),
+    )
+    vparser.add_argument(
+        "--checkpoint",
+        metavar="FILE",
+        help="In follow mode, save the offset of the last checked line in FILE",
+    )
+    vparser.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        metavar="SECONDS",
+        help="In follow mode, poll for new data every SECONDS seconds [default: 1]",
+    )
+    vparser.add_argument("infile", help="The file to check; '-' means standard input")
+    args = parser.parse_args(argv)
+    if args.workers < 1:
+        parser.error("--workers must be at least 1")
+    if args.block_size < 1:
+        parser.error("--block-size must be at least 1")
+    if args.follow:
+        if args.workers != 1:
+            parser.error("--follow cannot be combined with --workers")
+        if args.infile == "-" or args.infile.endswith(".gz"):
+            parser.error("--follow requires an uncompressed file")
+    elif args.checkpoint is not None:
+        parser.error("--checkpoint requires --follow")
+    if args.follow and args.summary_json is not None:
+        parser.error("--summary-json cannot be combined with --follow")
+    try:
+        template = load_spec(args.spec)
+    except (ImportError, AttributeError, ValueError) as e:
+        parser.error(f"could not load spec {args.spec!r}: {e}")
+    if args.follow:
+        follower = Follower(
+            args.infile,
+            template,
+            checkpoint=args.checkpoint,
+            block_size=args.block_size,
+        )
+        try:
+            return follow(follower, interval=args.interval)
+        except CheckpointError as e:
+            parser.error(str(e))
+    with _open(args.infile) as fp:
+        return validate(
+            fp,
+            template,
+            spec=args.spec,
+            workers=args.workers,
+            block_size=args.block_size,
+            summary_json=args.summary_json,
+        )
+
+
+def load_spec(spec: str) -> Any:
+    """
+    Load the object named by ``spec``, a string of the form
+    ``"module:attr"`` or ``"module:attr.subattr"``.  The current directory is
+    searched for the module in addition to `sys.path`.
+    """
+    modname, sep, attrs = spec.partition(":")
+    if not sep or not modname or not attrs:
+        raise ValueError("spec must be of the form MODULE:NAME")
+    cwd = os.getcwd()
+    if "" not in sys.path and cwd not in sys.path:
+        sys.path.insert(0, cwd)
+    obj: Any = importlib.import_module(modname)
+    for attr in attrs.split("."):
+        obj = getattr(obj, attr)
+    return obj
+
+
+def validate(
+    fp: IO[bytes],
+    template: Any,
+    *,
+    spec: str,
+    workers: int = 1,
+    block_size: int = BLOCK_SIZE,
+    summary_json: str | None = None,
+    out: IO[str] | None = None,
+    err: IO[str] | None = None,
+) -> int:
+    """
+    Check each line of ``fp`` against ``template``, writing the failing line
+    numbers to ``out`` (default: standard output) and a summary to ``err``
+    (default: standard error), and return the exit status.  If ``workers``
+    is greater than 1, the lines are checked in a pool of that many
+    processes, each of which loads the template from ``spec``.  If
+    ``summary_json`` is given, the failures aggregated by path (see
+    `anys.report.FailureReport`) are also written to that file as JSON.
+    """
+    out = sys.stdout if out is None else out
+    err = sys.stderr if err is None else err
+    records = size = 0
+    report = FailureReport(template)
+    start = perf_counter()
+    for result in _check_chunks(iter_chunks(fp, block_size), template, spec, workers):
+        records += result.records
+        size += result.size
+        if result.report is not None:
+            report.merge(result.report)
+        for lineno, paths in result.failures:
+            print(f"{lineno}: {_format_paths(paths)}", file=out)
+    elapsed = perf_counter() - start
+    rate = records / elapsed if elapsed > 0 else 0.0
+    mib = size / (1 << 20)
+    mib_rate = mib / elapsed if elapsed > 0 else 0.0
+    print(
+        f"Checked {records} records ({mib:.1f} MiB) in {elapsed:.2f}s:"
+        f" {rate:.1f} records/s, {mib_rate:.1f} MiB/s",
+        file=err,
+    )
+    print(f"{report.failed} records failed", file=err)
+    if report.failed:
+        print("Failures by path:", file=err)
+        print(report.format_table(), file=err)
+    if summary_json is not None:
+        with open(summary_json, "w", encoding="utf-8") as sfp:
+            print(report.to_json(indent=4), file=sfp)
+    return 1 if report.failed else 0
+
+
+def iter_chunks(
+    fp: IO[bytes], block_size: int = BLOCK_SIZE
+) -> Iterator[tuple[int, bytes]]:
+    """
+    Read ``fp`` in blocks of ``block_size`` bytes and yield ``(lineno,
+    chunk)`` pairs, where each chunk consists of one or more complete lines
+    and ``lineno`` is the (one-based) line number of the chunk's first line
+    """
+    lineno = 1
+    partial: list[bytes] = []
+    while block := fp.read(block_size):
+        end = block.rfind(b"\n")
+        if end == -1:
+            partial.append(block)
+            continue
+        partial.append(block[: end + 1])
+        chunk = b"".join(partial)
+        partial = [block[end + 1 :]]
+        yield lineno, chunk
+        lineno += chunk.count(b"\n")
+    if rest := b"".join(partial):
+        yield lineno, rest
+
+
+def check_chunk(template: Any, lineno: int, chunk: bytes) -> ChunkResult:
+    """
+    Parse each non-blank line of ``chunk`` as JSON and check it against
+    ``template``.  ``lineno`` is the line number of the chunk's first line.
+    """
+    report = FailureReport(template)
+    result = ChunkResult(records=0, size=len(chunk), report=report)
+    for i, line in enumerate(chunk.split(b"\n"), start=lineno):
+        if not line.strip():
+            continue
+        result.records += 1
+        try:
+            value = json.loads(line)
+        except ValueError:
+            report.checked += 1
+            report.failed += 1
+            report.add("$", "valid JSON", "invalid JSON", example=_snippet(line))
+            result.failures.append((i, [("$", "invalid JSON")]))
+            continue
+        if failures := report.check(value):
+            result.failures.append((i, [(f.path_str, f.reason) for f in failures]))
+    return result
+
+
+def _check_chunks(
+    chunks: Iterable[tuple[int, bytes]], template: Any, spec: str, workers: int
+) -> Iterator[ChunkResult]:
+    # Yields the results for the chunks in order.  At most `2 * workers`
+    # chunks are in flight at once so that memory use stays bounded.
+    if workers == 1:
+        for lineno, chunk in chunks:
+            yield check_chunk(template, lineno, chunk)
+        return
+    with ProcessPoolExecutor(
+        workers, initializer=_init_worker, initargs=(spec,)
+    ) as pool:
+        pending: deque[Future[ChunkResult]] = deque()
+        for lineno, chunk in chunks:
+            pending.append(pool.submit(_worker_check_chunk, lineno, chunk))
+            if len(pending) >= 2 * workers:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+#: The template loaded in a worker process
+_worker_template: Any = None
+
+
+def _init_worker(spec: str) -> None:
+    global _worker_template
+    _worker_template = load_spec(spec)
+
+
+def _worker_check_chunk(lineno: int, chunk: bytes) -> ChunkResult:
+    return check_chunk(_worker_template, lineno, chunk)
+
+
+class CheckpointError(ValueError):
+    """Raised by `Follower` when its checkpoint file cannot be read"""
+
+    def __init__(self, path: str, reason: str) -> None:
+        super().__init__(path, reason)
+        #: The path to the checkpoint file
+        self.path = path
+        #: A description of the problem with the file
+        self.reason = reason
+
+    def __str__(self) -> str:
+        return (
+            f"could not read checkpoint file {self.path!r}: {self.reason};"
+            " remove it to restart checking from the beginning of the file"
+        )
+
+
+class Follower:
+    """
+    Checks the lines of the append-only JSON Lines file at ``path`` against
+    ``template`` incrementally: each call to `poll()` checks the complete lines
+    that have been appended since the previous call.
+
+    At most ``block_size`` bytes are read at a time, and only an incomplete
+    final line is kept between calls; a line longer than ``max_line_length``
+    bytes is reported as a failure with the reason ``"line too long"`` and
+    skipped.
+
+    If the file is rotated (i.e., the path now refers to a different file) or
+    truncated, the rest of the old file is checked (in the case of rotation),
+    and then checking restarts at the beginning of the new file.
+
+    If ``checkpoint`` is given, the byte offset & line number of the end of
+    the last checked line are saved to that file after every block, and, on
+    construction, checking resumes from the saved offset if the checkpoint
+    refers to the same file (as identified by its device & inode numbers).
+    The checkpoint is replaced atomically, so it is never left partially
+    written; if it nevertheless cannot be parsed, `poll()` raises
+    `CheckpointError`.
+    """
+
+    def __init__(
+        self,
+        path: str | os.PathLike[str],
+        template: Any,
+        *,
+        checkpoint: str | os.PathLike[str] | None = None,
+        block_size: int = BLOCK_SIZE,
+        max_line_length: int = MAX_LINE_LENGTH,
+    ) -> None:
+        self.path = os.fspath(path)
+        self.template = template
+        self.checkpoint = None if checkpoint is None else os.fspath(checkpoint)
+        self.block_size = block_size
+        self.max_line_length = max_line_length
+        #: The byte offset of the end of the last checked line
+        self.offset = 0
+        #: The line number of the next line to check
+        self.lineno = 1
+        self._fp: IO[bytes] | None = None
+        self._ident: tuple[int, int] | None = None
+        self._partial = bytearray()
+        # The number of bytes of an overlong line skipped so far, or `None` if
+        # not currently skipping
+        self._skipped: int | None = None
+
+    def poll(self) -> list[tuple[int, list[tuple[str, str]]]]:
+        """
+        Check all complete lines that have been appended to the file since the
+        last call, and return a list of ``(lineno, [(path, reason), ...])``
+        pairs for the failing lines, as in `ChunkResult.failures`
+        """
+        failures: list[tuple[int, list[tuple[str, str]]]] = []
+        fp = self._fp if self._fp is not None else self._open()
+        while fp is not None:
+            block = fp.read(self.block_size)
+            if block:
+                failures.extend(self._feed(block))
+                self._save()
+                continue
+            try:
+                st = os.stat(self.path)
+            except FileNotFoundError:
+                break
+            if (st.st_dev, st.st_ino) != self._ident:
+                # Rotated; the rest of the old file has been read, so check
+                # its unterminated final line, if any
+                if self._partial and self._skipped is None:
+                    failures.extend(self._feed(b"\n"))
+                fp.close()
+                self._fp = None
+                self._reset()
+                fp = self._open()
+            elif st.st_size < fp.tell():
+                # Truncated
+                fp.seek(0)
+                self._reset()
+            else:
+                break
+        return failures
+
+    def close(self) -> None:
+        """Close the file"""
+        if self._fp is not None:
+            self._fp.close()
+            self._fp = None
+
+    def __enter__(self) -> Follower:
+        return self
+
+    def __exit__(self, *_exc: Any) -> None:
+        self.close()
+
+    def _open(self) -> IO[bytes] | None:
+        try:
+            fp = self._fp = open(self.path, "rb")
+        except FileNotFoundError:
+            return None
+        st = os.fstat(fp.fileno())
+        self._ident = (st.st_dev, st.st_ino)
+        try:
+            data = self._load()
+        except CheckpointError:
+            self.close()
+            raise
+        if (
+            data is not None
+            and (data["device"], data["inode"]) == self._ident
+            and data["offset"] <= st.st_size
+        ):
+            self.offset = data["offset"]
+            self.lineno = data["lineno"]
+            fp.seek(self.offset)
+        self._save()
+        return fp
+
+    def _load(self) -> dict[str, Any] | None:
+        if self.checkpoint is None:
+            return None
+        try:
+            with open(self.checkpoint, encoding="utf-8") as cfp:
+                data = json.load(cfp)
+        except FileNotFoundError:
+            return None
+        except ValueError as e:
+            # This includes JSONDecodeError and UnicodeDecodeError
+            raise CheckpointError(self.checkpoint, str(e))
+        if not isinstance(data, dict) or not all(
+            type(data.get(k)) is int for k in ("device", "inode", "offset", "lineno")
+        ):
+            raise CheckpointError(self.checkpoint, "missing or invalid fields")
+        return data
+
+    def _reset(self) -> None:
+        self.offset = 0
+        self.lineno = 1
+        self._partial.clear()
+        self._skipped = None
+
+    def _feed(self, block: bytes) -> list[tuple[int, list[tuple[str, str]]]]:
+        failures: list[tuple[int, list[tuple[str, str]]]] = []
+        if self._skipped is not None:
+            nl = block.find(b"\n")
+            if nl == -1:
+                self._skipped += len(block)
+                return failures
+            self.offset += self._skipped + nl + 1
+            self.lineno += 1
+            self._skipped = None
+            block = block[nl + 1 :]
+        end = block.rfind(b"\n")
+        if end == -1:
+            self._partial += block
+        else:
+            chunk = bytes(self._partial + block[: end + 1])
+            self._partial[:] = block[end + 1 :]
+            failures.extend(check_chunk(self.template, self.lineno, chunk).failures)
+            self.lineno += chunk.count(b"\n")
+            self.offset += len(chunk)
+        if len(self._partial) > self.max_line_length:
+            failures.append((self.lineno, [("$", "line too long")]))
+            self._skipped = len(self._partial)
+            self._partial.clear()
+        return failures
+
+    def _save(self) -> None:
+        if self.checkpoint is None or self._ident is None:
+            return
+        data = {
+            "path": os.path.abspath(self.path),
+            "device": self._ident[0],
+            "inode": self._ident[1],
+            "offset": self.offset,
+            "lineno": self.lineno,
+        }
+        tmp = self.checkpoint + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as fp:
+            json.dump(data, fp)
+            fp.flush()
+            os.fsync(fp.fileno())
+        os.replace(tmp, self.checkpoint)
+
+
+def follow(
+    follower: Follower, *, interval: float = 1.0, out: IO[str] | None = None
+) -> int:
+    """
+    Repeatedly poll ``follower`` for new lines every ``interval`` seconds
+    until interrupted, writing each failing line to ``out`` (default: standard
+    output) as soon as it is found as a JSON object of the form ``{"file":
+    path, "line": lineno, "failures": [{"path": path, "reason": reason},
+    ...]}`` on a line of its own.  Returns 0 when interrupted by
+    `KeyboardInterrupt`.
+    """
+    out = sys.stdout if out is None else out
+    with follower:
+        try:
+            while True:
+                for lineno, paths in follower.poll():
+                    record = {
+                        "file": follower.path,
+                        "line": lineno,
+                        "failures": [{"path": p, "reason": r} for p, r in paths],
+                    }
+                    print(json.dumps(record), file=out, flush=True)
+                sleep(interval)
+        except KeyboardInterrupt:
+            return 0
+
+
+def _snippet(line: bytes, limit: int = 100) -> str:
+    s = line[:limit].decode("utf-8", "replace")
+    return s + "..." if len(line) > limit else s
+
+
+def _format_paths(paths: list[tuple[str, str]]) -> str:
+    return ", ".join(p if r == "mismatch" else f"{p} ({r})" for p, r in paths)
+
+
+def _open(path: str) -> AbstractContextManager[IO[bytes]]:
+    if path == "-":
+        return nullcontext(sys.stdin.buffer)
+    elif path.endswith(".gz"):
+        return gzip.open(path, "rb")  # type: ignore[return-value]
+    else:
+        return open(path, "rb")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,598 @@
+"""
+A linear-time regular expression engine for the ``safe`` mode of the regex
+matchers
+
+Patterns are parsed with the standard library's regex parser and compiled into
+a program for a Thompson NFA, which is simulated one input character at a time
+by a lazily-constructed DFA: each DFA state is the set of NFA instructions
+that are live at a position, and transitions between them are computed on
+first use and cached.  Matching therefore takes time linear in the length of
+the input no matter the pattern, in exchange for supporting only the regular
+subset of Python's regex syntax: literals, character classes, ``.``,
+alternation, groups, greedy & lazy repetition, inline flags, and the
+zero-width assertions ``^``, ``$``, ``\\A``, ``\\Z``, ``\\b``, and ``\\B``.
+Backreferences, lookaround assertions, conditionals, atomic groups, and
+possessive quantifiers are rejected.
+
+Only whether the pattern matches is computed; match positions & groups are
+not.
+
+This module also provides `required_literals()`, which finds substrings that
+every match of a pattern must contain, for rejecting most non-matching inputs
+with cheap ``in`` tests before running any regex engine, and
+`literal_prefix()`, which finds a string that every match of a pattern at the
+start of the input must begin with, for indexing regexes by prefix.
+"""
+
+from __future__ import annotations
+from collections.abc import Callable
+import re
+import sys
+from typing import Any
+
+if sys.version_info >= (3, 11):
+    from re import _constants as sre  # type: ignore[attr-defined]
+    from re import _parser as sre_parse  # type: ignore[attr-defined]
+else:
+    import sre_constants as sre
+    import sre_parse
+
+__all__ = ["SafePattern", "required_literals"]
+
+#: The maximum number of instructions in a compiled program.  Counted
+#: repetitions are expanded into copies of the repeated subpattern, so this
+#: limits patterns like ``(a{1000}){1000}``.
+MAX_PROGRAM_SIZE = 10_000
+
+#: The maximum number of DFA states to cache before the cache is discarded
+MAX_DFA_STATES = 4_096
+
+# Opcodes of the compiled program
+_CHAR = 0
+_SPLIT = 1
+_JMP = 2
+_ASSERT = 3
+_MATCH = 4
+
+# Bits describing the context of a position in the input, for evaluating
+# zero-width assertions
+_AT_START = 1
+_AT_END = 2
+_PREV_NL = 4
+_NEXT_NL = 8
+_FINAL_NL = 16
+_PREV_WORD = 32
+_NEXT_WORD = 64
+_PREV_AWORD = 128
+_NEXT_AWORD = 256
+
+# Each assertion maps to a function of the context bits and the set of bits
+# that function depends on
+_Assertion = tuple[Callable[[int], bool], int]
+
+_BEGINNING: _Assertion = (lambda ctx: bool(ctx & _AT_START), _AT_START)
+_BEGINNING_LINE: _Assertion = (
+    lambda ctx: bool(ctx & (_AT_START | _PREV_NL)),
+    _AT_START | _PREV_NL,
+)
+_END: _Assertion = (lambda ctx: bool(ctx & _AT_END), _AT_END)
+_END_LINE: _Assertion = (
+    lambda ctx: bool(ctx & (_AT_END | _NEXT_NL)),
+    _AT_END | _NEXT_NL,
+)
+_END_OR_FINAL_NL: _Assertion = (
+    lambda ctx: bool(ctx & (_AT_END | _FINAL_NL)),
+    _AT_END | _FINAL_NL,
+)
+_BOUNDARY: _Assertion = (
+    lambda ctx: bool(ctx & _PREV_WORD) != bool(ctx & _NEXT_WORD),
+    _PREV_WORD | _NEXT_WORD,
+)
+_NON_BOUNDARY: _Assertion = (
+    lambda ctx: bool(ctx & _PREV_WORD) == bool(ctx & _NEXT_WORD),
+    _PREV_WORD | _NEXT_WORD,
+)
+_ABOUNDARY: _Assertion = (
+    lambda ctx: bool(ctx & _PREV_AWORD) != bool(ctx & _NEXT_AWORD),
+    _PREV_AWORD | _NEXT_AWORD,
+)
+_NON_ABOUNDARY: _Assertion = (
+    lambda ctx: bool(ctx & _PREV_AWORD) == bool(ctx & _NEXT_AWORD),
+    _PREV_AWORD | _NEXT_AWORD,
+)
+
+_NEWLINE = 10
+
+
+class SafePattern:
+    """
+    A regex pattern compiled for linear-time matching.  ``pattern`` may be a
+    `str` or `bytes` pattern or a compiled `re.Pattern`.
+
+    :raises ValueError:
+        if the pattern uses syntax outside the supported subset or compiles to
+        too large a program
+    :raises re.error: if the pattern is not a valid regex
+    """
+
+    def __init__(self, pattern: str | bytes | re.Pattern, flags: int = 0) -> None:
+        if isinstance(pattern, re.Pattern):
+            flags |= pattern.flags
+            pattern = pattern.pattern
+        self.pattern = pattern
+        self.is_str = isinstance(pattern, str)
+        parsed = sre_parse.parse(pattern, flags)
+        self.flags = parsed.state.flags
+        if self.flags & re.LOCALE:
+            raise ValueError("LOCALE flag is not supported in safe mode")
+        if not self.is_str:
+            self.flags |= re.ASCII
+        self._prog: list[tuple] = []
+        self._ctx_mask = 0
+        self._emit_seq(parsed, self.flags)
+        self._prog.append((_MATCH,))
+        # DFA state caches for anchored & unanchored runs
+        self._dfas: dict[bool, dict[tuple[tuple[int, ...], bool], _DState]] = {
+            True: {},
+            False: {},
+        }
+
+    def match(self, value: Any) -> bool:
+        """Test whether the pattern matches at the start of ``value``"""
+        return self._run(self._codes(value), anchored=True, full=False)
+
+    def search(self, value: Any) -> bool:
+        """Test whether the pattern matches anywhere in ``value``"""
+        return self._run(self._codes(value), anchored=False, full=False)
+
+    def fullmatch(self, value: Any) -> bool:
+        """Test whether the pattern matches the whole of ``value``"""
+        return self._run(self._codes(value), anchored=True, full=True)
+
+    def _codes(self, value: Any) -> Any:
+        # Returns a sequence of the characters or byte values in `value`
+        if self.is_str:
+            if not isinstance(value, str):
+                raise TypeError("cannot use a string pattern on a bytes-like object")
+            return value
+        elif isinstance(value, str):
+            raise TypeError("cannot use a bytes pattern on a string-like object")
+        else:
+            return memoryview(value).cast("B")
+
+    # Compilation
+
+    def _emit(self, instr: tuple) -> int:
+        if len(self._prog) >= MAX_PROGRAM_SIZE:
+            raise ValueError("Pattern is too large for safe mode")
+        self._prog.append(instr)
+        return len(self._prog) - 1
+
+    def _patch(self, pc: int, instr: tuple) -> None:
+        self._prog[pc] = instr
+
+    def _emit_seq(self, items: Any, flags: int) -> None:
+        for op, av in items:
+            self._emit_item(op, av, flags)
+
+    def _emit_item(self, op: Any, av: Any, flags: int) -> None:
+        if op is sre.LITERAL:
+            self._emit((_CHAR, self._literal_test(av, flags)))
+        elif op is sre.NOT_LITERAL:
+            test = self._literal_test(av, flags)
+            self._emit((_CHAR, lambda c: not test(c)))
+        elif op is sre.ANY:
+            if flags & re.DOTALL:
+                self._emit((_CHAR, lambda _: True))
+            else:
+                self._emit((_CHAR, lambda c: c != _NEWLINE))
+        elif op is sre.IN:
+            self._emit((_CHAR, self._set_test(av, flags)))
+        elif op is sre.SUBPATTERN:
+            _, add_flags, del_flags, sub = av
+            self._emit_seq(sub, (flags | add_flags) & ~del_flags)
+        elif op is sre.BRANCH:
+            self._emit_branch(av[1], flags)
+        elif op is sre.MAX_REPEAT or op is sre.MIN_REPEAT:
+            lo, hi, sub = av
+            self._emit_repeat(lo, hi, sub, flags)
+        elif op is sre.AT:
+            self._emit_assertion(av, flags)
+        else:
+            raise ValueError(f"Regex feature {op} is not supported in safe mode")
+
+    def _emit_branch(self, alternatives: list, flags: int) -> None:
+        jumps = []
+        for i, alt in enumerate(alternatives):
+            if i < len(alternatives) - 1:
+                split = self._emit((_SPLIT, 0, 0))
+                self._emit_seq(alt, flags)
+                jumps.append(self._emit((_JMP, 0)))
+                self._patch(split, (_SPLIT, split + 1, len(self._prog)))
+            else:
+                self._emit_seq(alt, flags)
+        for j in jumps:
+            self._patch(j, (_JMP, len(self._prog)))
+
+    def _emit_repeat(self, lo: int, hi: Any, sub: Any, flags: int) -> None:
+        for _ in range(lo):
+            start = len(self._prog)
+            self._emit_seq(sub, flags)
+            if len(self._prog) == start:
+                # The body only matches the empty string, so repeating it any
+                # number of times is the same as not repeating it at all.
+                # (Without this, the program size limit would never be
+                # reached, and a huge count would make compiling take forever.)
+                return
+        if hi is sre.MAXREPEAT:
+            split = self._emit((_SPLIT, 0, 0))
+            self._emit_seq(sub, flags)
+            self._emit((_JMP, split))
+            self._patch(split, (_SPLIT, split + 1, len(self._prog)))
+        else:
+            splits = []
+            for _ in range(hi - lo):
+                splits.append(self._emit((_SPLIT, 0, 0)))
+                self._emit_seq(sub, flags)
+            for s in splits:
+                self._patch(s, (_SPLIT, s + 1, len(self._prog)))
+
+    def _emit_assertion(self, at: Any, flags: int) -> None:
+        assertion: _Assertion
+        if at is sre.AT_BEGINNING:
+            assertion = _BEGINNING_LINE if flags & re.MULTILINE else _BEGINNING
+        elif at is sre.AT_BEGINNING_STRING:
+            assertion = _BEGINNING
+        elif at is sre.AT_END:
+            assertion = _END_LINE if flags & re.MULTILINE else _END_OR_FINAL_NL
+        elif at is sre.AT_END_STRING:
+            assertion = _END
+        elif at is sre.AT_BOUNDARY:
+            assertion = _ABOUNDARY if flags & re.ASCII else _BOUNDARY
+        elif at is sre.AT_NON_BOUNDARY:
+            assertion = _NON_ABOUNDARY if flags & re.ASCII else _NON_BOUNDARY
+        else:  # pragma: no cover
+            raise ValueError(f"Regex assertion {at} is not supported in safe mode")
+        self._ctx_mask |= assertion[1]
+        self._emit((_ASSERT, assertion[0]))
+
+    def _literal_test(self, code: int, flags: int) -> Callable[[int], bool]:
+        if flags & re.IGNORECASE:
+            folded = self._fold(code, flags)
+            fold = self._fold
+            return lambda c: c == code or fold(c, flags) == folded
+        else:
+            return lambda c: c == code
+
+    def _set_test(self, items: list, flags: int) -> Callable[[int], bool]:
+        negate = False
+        codes: set[int] = set()
+        ranges: list[tuple[int, int]] = []
+        categories: list[Callable[[int], bool]] = []
+        for op, av in items:
+            if op is sre.NEGATE:
+                negate = True
+            elif op is sre.LITERAL:
+                codes.add(av)
+            elif op is sre.RANGE:
+                ranges.append(av)
+            elif op is sre.CATEGORY:
+                categories.append(self._category_test(av, flags))
+            else:
+                raise ValueError(
+                    f"Character class item {op} is not supported in safe mode"
+                )
+        ignorecase = bool(flags & re.IGNORECASE)
+        variants = self._variants
+
+        def test(c: int) -> bool:
+            cs = variants(c, flags) if ignorecase else (c,)
+            found = (
+                any(x in codes for x in cs)
+                or any(lo <= x <= hi for x in cs for lo, hi in ranges)
+                or any(t(c) for t in categories)
+            )
+            return found != negate
+
+        return test
+
+    def _category_test(self, cat: Any, flags: int) -> Callable[[int], bool]:
+        ascii_only = bool(flags & re.ASCII)
+        test: Callable[[int], bool]
+        if cat in (sre.CATEGORY_DIGIT, sre.CATEGORY_NOT_DIGIT):
+            if ascii_only:
+                test = _is_ascii_digit
+            else:
+                test = _is_digit
+        elif cat in (sre.CATEGORY_SPACE, sre.CATEGORY_NOT_SPACE):
+            if ascii_only:
+                test = _is_ascii_space
+            else:
+                test = _is_space
+        elif cat in (sre.CATEGORY_WORD, sre.CATEGORY_NOT_WORD):
+            if ascii_only:
+                test = _is_ascii_word
+            else:
+                test = _is_word
+        else:  # pragma: no cover
+            raise ValueError(f"Regex category {cat} is not supported in safe mode")
+        if cat in (
+            sre.CATEGORY_NOT_DIGIT,
+            sre.CATEGORY_NOT_SPACE,
+            sre.CATEGORY_NOT_WORD,
+        ):
+            return lambda c: not test(c)
+        else:
+            return test
+
+    def _fold(self, code: int, flags: int) -> Any:
+        if flags & re.ASCII or not self.is_str:
+            return code + 32 if 65 <= code <= 90 else code
+        else:
+            return chr(code).lower()
+
+    def _variants(self, code: int, flags: int) -> tuple[int, ...]:
+        if flags & re.ASCII or not self.is_str:
+            if 65 <= code <= 90:
+                return (code, code + 32)
+            elif 97 <= code <= 122:
+                return (code, code - 32)
+            else:
+                return (code,)
+        else:
+            ch = chr(code)
+            return (code,) + tuple(
+                ord(v) for v in (ch.lower(), ch.upper()) if len(v) == 1
+            )
+
+    # Matching
+
+    def _run(self, codes: Any, anchored: bool, full: bool) -> bool:
+        is_str = self.is_str
+        mask = self._ctx_mask
+        dfa = self._dfas[anchored]
+        state = self._state(dfa, self._closure([0], self._context(codes, 0)))
+        for i, c in enumerate(codes):
+            if state.accept and not full:
+                return True
+            if anchored and not state.pcs:
+                return False
+            if is_str:
+                c = ord(c)
+            ctx = self._context(codes, i + 1) if mask else 0
+            nxt = state.trans.get((c, ctx))
+            if nxt is None:
+                nxt = self._step(dfa, state, c, ctx, anchored)
+            state = nxt
+        return state.accept
+
+    def _step(
+        self,
+        dfa: dict[tuple[tuple[int, ...], bool], _DState],
+        state: _DState,
+        c: int,
+        ctx: int,
+        anchored: bool,
+    ) -> _DState:
+        prog = self._prog
+        targets = [pc + 1 for pc in state.pcs if prog[pc][1](c)]
+        if not anchored:
+            targets.append(0)
+        if len(dfa) >= MAX_DFA_STATES:
+            # Discard the cache; the old states become unreachable once the
+            # current state forgets its transitions
+            dfa.clear()
+            state.trans.clear()
+        nxt = self._state(dfa, self._closure(targets, ctx))
+        state.trans[c, ctx] = nxt
+        return nxt
+
+    def _state(
+        self,
+        dfa: dict[tuple[tuple[int, ...], bool], _DState],
+        key: tuple[tuple[int, ...], bool],
+    ) -> _DState:
+        try:
+            return dfa[key]
+        except KeyError:
+            st = dfa[key] = _DState(*key)
+            return st
+
+    def _closure(self, pcs: list[int], ctx: int) -> tuple[tuple[int, ...], bool]:
+        # Returns the instructions reachable from `pcs` without consuming
+        # input that consume input, plus whether a match is reachable
+        prog = self._prog
+        seen: set[int] = set()
+        chars: list[int] = []
+        accept = False
+        stack = list(reversed(pcs))
+        while stack:
+            pc = stack.pop()
+            if pc in seen:
+                continue
+            seen.add(pc)
+            instr = prog[pc]
+            op = instr[0]
+            if op == _CHAR:
+                chars.append(pc)
+            elif op == _SPLIT:
+                stack.append(instr[2])
+                stack.append(instr[1])
+            elif op == _JMP:
+                stack.append(instr[1])
+            elif op == _ASSERT:
+                if instr[1](ctx):
+                    stack.append(pc + 1)
+            else:
+                accept = True
+        return (tuple(sorted(chars)), accept)
+
+    def _context(self, codes: Any, i: int) -> int:
+        mask = self._ctx_mask
+        if not mask:
+            return 0
+        n = len(codes)
+        prev = codes[i - 1] if i > 0 else None
+        nxt = codes[i] if i < n else None
+        if self.is_str:
+            prev = ord(prev) if prev is not None else None
+            nxt = ord(nxt) if nxt is not None else None
+        ctx = 0
+        if i == 0:
+            ctx |= _AT_START
+        if i == n:
+            ctx |= _AT_END
+        if prev == _NEWLINE:
+            ctx |= _PREV_NL
+        if nxt == _NEWLINE:
+            ctx |= _NEXT_NL
+            if i == n - 1:
+                ctx |= _FINAL_NL
+        if mask & (_PREV_WORD | _NEXT_WORD):
+            if prev is not None and _is_word(prev):
+                ctx |= _PREV_WORD
+            if nxt is not None and _is_word(nxt):
+                ctx |= _NEXT_WORD
+        if mask & (_PREV_AWORD | _NEXT_AWORD):
+            if prev is not None and _is_ascii_word(prev):
+                ctx |= _PREV_AWORD
+            if nxt is not None and _is_ascii_word(nxt):
+                ctx |= _NEXT_AWORD
+        return ctx & mask
+
+
+class _DState:
+    __slots__ = ("pcs", "accept", "trans")
+
+    def __init__(self, pcs: tuple[int, ...], accept: bool) -> None:
+        self.pcs = pcs
+        self.accept = accept
+        self.trans: dict[tuple[int, int], _DState] = {}
+
+
+def _is_ascii_digit(c: int) -> bool:
+    return 48 <= c <= 57
+
+
+def _is_digit(c: int) -> bool:
+    return chr(c).isdecimal()
+
+
+def _is_ascii_space(c: int) -> bool:
+    return c in (9, 10, 11, 12, 13, 32)
+
+
+def _is_space(c: int) -> bool:
+    return chr(c).isspace()
+
+
+def _is_ascii_word(c: int) -> bool:
+    return 48 <= c <= 57 or 65 <= c <= 90 or 97 <= c <= 122 or c == 95
+
+
+def _is_word(c: int) -> bool:
+    return c == 95 or chr(c).isalnum()
+
+
+_REPEATS = tuple(
+    getattr(sre, op)
+    for op in ("MAX_REPEAT", "MIN_REPEAT", "POSSESSIVE_REPEAT")
+    if hasattr(sre, op)
+)
+
+
+def required_literals(pattern: str | bytes | re.Pattern) -> list[Any]:
+    """
+    Return a list of literal substrings (of the same type as the pattern)
+    that every string matched by ``pattern`` must contain, longest first.
+    Literals are taken from runs of case-sensitive literal characters that
+    are not inside an alternation or an optional part of the pattern, so the
+    list is empty for patterns like ``a|b`` or ``(?i)error``.
+
+    :raises re.error: if the pattern is not a valid regex
+    """
+    if isinstance(pattern, re.Pattern):
+        flags = pattern.flags
+        pattern = pattern.pattern
+    else:
+        flags = 0
+    parsed = sre_parse.parse(pattern, flags)
+    runs: list[list[int]] = []
+    run: list[int] = []
+    _collect_literals(parsed, parsed.state.flags, run, runs)
+    _end_run(run, runs)
+    if isinstance(pattern, str):
+        literals: set[Any] = {"".join(map(chr, r)) for r in runs}
+    else:
+        literals = {bytes(r) for r in runs}
+    return sorted(literals, key=lambda lit: (-len(lit), lit))
+
+
+def _collect_literals(
+    items: Any, flags: int, run: list[int], runs: list[list[int]]
+) -> None:
+    for op, av in items:
+        if op is sre.LITERAL and not flags & re.IGNORECASE:
+            run.append(av)
+        elif op is sre.AT:
+            # Zero-width assertions do not separate the characters around them
+            pass
+        elif op is sre.SUBPATTERN:
+            _, add_flags, del_flags, sub = av
+            _collect_literals(sub, (flags | add_flags) & ~del_flags, run, runs)
+        elif op in _REPEATS and av[0] >= 1:
+            _end_run(run, runs)
+            _collect_literals(av[2], flags, run, runs)
+            _end_run(run, runs)
+        else:
+            _end_run(run, runs)
+
+
+def _end_run(run: list[int], runs: list[list[int]]) -> None:
+    if run:
+        runs.append(run[:])
+        run.clear()
+
+
+def literal_prefix(pattern: str | bytes | re.Pattern) -> Any:
+    """
+    Return the longest string (of the same type as the pattern) made up of
+    case-sensitive literal characters that every string matched by
+    ``pattern`` with `re.match()` must start with.  The result is empty for
+    patterns like ``a|b``, ``[ab]c``, or ``(?i)abc``.
+
+    :raises re.error: if the pattern is not a valid regex
+    """
+    if isinstance(pattern, re.Pattern):
+        flags = pattern.flags
+        pattern = pattern.pattern
+    else:
+        flags = 0
+    parsed = sre_parse.parse(pattern, flags)
+    prefix: list[int] = []
+    _collect_prefix(parsed, parsed.state.flags, prefix)
+    if isinstance(pattern, str):
+        return "".join(map(chr, prefix))
+    else:
+        return bytes(prefix)
+
+
+def _collect_prefix(items: Any, flags: int, prefix: list[int]) -> bool:
+    # Appends the literal characters that begin every match of `items` to
+    # `prefix` and returns whether they make up all of `items`
+    for op, av in items:
+        if op is sre.LITERAL and not flags & re.IGNORECASE:
+            prefix.append(av)
+        elif op is sre.AT:
+            pass
+        elif op is sre.SUBPATTERN:
+            _, add_flags, del_flags, sub = av
+            if not _collect_prefix(sub, (flags | add_flags) & ~del_flags, prefix):
+                return False
+        elif op in _REPEATS and av[0] >= 1:
+            # Only the first repetition is certain to begin the rest
+            _collect_prefix(av[2], flags, prefix)
+            return False
+        else:
+            return False
+    return True
@@ -0,0 +1,83 @@
+"""Asynchronous validation of streams of values against ``anys`` matchers"""
+
+from __future__ import annotations
+import asyncio
+from collections.abc import AsyncIterable
+from typing import Any
+from . import _aeq
+
+__all__ = ["validate_stream"]
+
+
+async def validate_stream(
+    stream: AsyncIterable[Any], matcher: Any, *, concurrency: int = 1
+) -> int | None:
+    """
+    Compare each value yielded by the asynchronous iterable ``stream`` against
+    ``matcher`` (which can be an `anys` matcher or a plain value), evaluating
+    inner matchers with `~anys.AnyBase.amatch()` so that `~anys.AnyAsyncFunc`
+    matchers can be used.  Up to ``concurrency`` values are evaluated at once.
+
+    As soon as a value fails to match, no further values are read from
+    ``stream``, evaluations of later values are cancelled, and evaluations of
+    earlier values are allowed to finish.  The return value is then the
+    (zero-based) index of the earliest failing value, or `None` if all values
+    matched.
+    """
+    if concurrency < 1:
+        raise ValueError("concurrency must be at least 1")
+    it = aiter(stream)
+    pending: dict[asyncio.Future[bool], int] = {}
+    # The in-progress read of the next value from `stream`, if any.  This is
+    # awaited together with `pending` so that a failure is noticed without
+    # waiting for a slow stream to produce its next value.
+    fetch: asyncio.Future[Any] | None = None
+    failed: int | None = None
+    exhausted = False
+    index = 0
+    try:
+        while pending or (failed is None and not exhausted):
+            if (
+                fetch is None
+                and failed is None
+                and not exhausted
+                and len(pending) < concurrency
+            ):
+                fetch = asyncio.ensure_future(anext(it))
+            waiting: set[asyncio.Future[Any]] = set(pending)
+            if fetch is not None:
+                waiting.add(fetch)
+            done, _ = await asyncio.wait(waiting, return_when=asyncio.FIRST_COMPLETED)
+            if fetch is not None and fetch in done:
+                f, fetch = fetch, None
+                try:
+                    value = f.result()
+                except StopAsyncIteration:
+                    exhausted = True
+                else:
+                    pending[asyncio.ensure_future(_aeq(matcher, value))] = index
+                    index += 1
+            for fut in done:
+                if (i := pending.pop(fut, None)) is not None:
+                    if not fut.result() and (failed is None or i < failed):
+                        failed = i
+            if failed is not None:
+                later = [fut for fut, i in pending.items() if i > failed]
+                for fut in later:
+                    fut.cancel()
+                    del pending[fut]
+                if fetch is not None:
+                    later.append(fetch)
+                    fetch.cancel()
+                    fetch = None
+                await asyncio.gather(*later, return_exceptions=True)
+        return failed
+    finally:
+        if fetch is not None:
+            fetch.cancel()
+            await asyncio.gather(fetch, return_exceptions=True)
+        for fut in pending:
+            fut.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
+        if not exhausted and hasattr(it, "aclose"):
+            await it.aclose()
@@ -0,0 +1,120 @@
+"""
+Column-at-a-time validation of tabular data against ``anys`` templates
+
+The functions in this module check a collection of records against a template
+mapping field names to expected values (which can be ``anys`` matchers) by
+first transposing the records into per-field columns and then checking each
+column in bulk with the expected value's `~anys.AnyBase.match_many()` method.
+"""
+
+from __future__ import annotations
+from collections.abc import Iterable, Mapping, Sequence
+from itertools import repeat
+import operator
+from typing import Any
+from . import AnyBase, AnyWithEntries
+
+__all__ = ["validate_columns", "validate_records"]
+
+_MISSING = object()
+
+
+def validate_columns(
+    columns: Mapping[Any, Sequence[Any]], template: Mapping | AnyWithEntries
+) -> dict[Any, list[int]]:
+    """
+    Check columnar data against ``template``, a mapping from field names to
+    expected values (or an `~anys.AnyWithEntries` matcher wrapping such a
+    mapping).  ``columns`` must map each field name in ``template`` to a
+    sequence of that field's values, one per record; all columns must have the
+    same length.  A column may be a NumPy array, in which case comparison
+    matchers are evaluated with vectorized operations.
+
+    The return value is a `dict` mapping each field name in ``template`` to a
+    list of the (zero-based) indices of the records whose value for that field
+    does not equal or match the expected value.  A field whose column is
+    absent from ``columns`` is reported as failing for every record.
+
+    :raises ValueError: if the columns are not all the same length
+    """
+    fields = _template_fields(template)
+    lengths = {len(columns[k]) for k in fields if k in columns}
+    if len(lengths) > 1:
+        raise ValueError("Columns must all be the same length")
+    nrows = lengths.pop() if lengths else 0
+    failures: dict[Any, list[int]] = {}
+    for k, expected in fields.items():
+        if k in columns:
+            failures[k] = _failures(expected, columns[k])
+        else:
+            failures[k] = list(range(nrows))
+    return failures
+
+
+def validate_records(
+    rows: Iterable[Any], template: Mapping | AnyWithEntries
+) -> list[int]:
+    """
+    Check each record in ``rows`` against ``template``, a mapping from field
+    names to expected values (or an `~anys.AnyWithEntries` matcher wrapping
+    such a mapping), and return a sorted list of the (zero-based) indices of
+    the records that do not match.  A record matches if ``record[k] == v``
+    for every ``k, v`` in the template's items, exactly as for
+    ``AnyWithEntries(template)``; records that lack a field of the template
+    do not match.
+
+    The records are transposed into one column per field of the template, and
+    each column is then checked in bulk.
+    """
+    if not isinstance(rows, Sequence):
+        rows = list(rows)
+    fields = _template_fields(template)
+    failed: set[int] = set()
+    indices: Sequence[int]
+    for k, expected in fields.items():
+        column = _column(rows, k)
+        missing = [i for i, v in enumerate(column) if v is _MISSING]
+        if missing:
+            failed.update(missing)
+            indices = [i for i, v in enumerate(column) if v is not _MISSING]
+            values = [column[i] for i in indices]
+        else:
+            indices = range(len(column))
+            values = column
+        failed.update(indices[i] for i in _failures(expected, values))
+    return sorted(failed)
+
+
+def _template_fields(template: Mapping | AnyWithEntries) -> Mapping:
+    if isinstance(template, AnyWithEntries):
+        return template.arg
+    elif isinstance(template, Mapping):
+        return template
+    else:
+        raise TypeError(
+            f"Template must be a mapping or AnyWithEntries, not {template!r}"
+        )
+
+
+def _column(rows: Sequence[Any], key: Any) -> list[Any]:
+    try:
+        return list(map(operator.itemgetter(key), rows))
+    except (LookupError, TypeError):
+        column: list[Any] = []
+        for r in rows:
+            try:
+                column.append(r[key])
+            except (LookupError, TypeError):
+                column.append(_MISSING)
+        return column
+
+
+def _failures(expected: Any, values: Sequence[Any]) -> list[int]:
+    if isinstance(expected, AnyBase):
+        return list(expected.match_many(values).failures())
+    else:
+        return [
+            i
+            for i, ok in enumerate(map(operator.eq, repeat(expected), values))
+            if not ok
+        ]
@@ -0,0 +1,438 @@
+"""
+Incremental re-validation of mutable documents against ``anys`` templates
+
+An `IncrementalValidator` compares a document — typically a tree of `dict`\\s
+and `list`\\s — against a template once, recording the result for every
+subtree that the template describes structurally, and then keeps that record
+up to date as the document changes.  Changes are reported either explicitly
+with `IncrementalValidator.changed()` or automatically by mutating the
+document through the tracking proxy returned by `IncrementalValidator.doc`.
+Only the changed subtrees are re-checked, and the results of their ancestors
+are updated by counting failing children, so the overall verdict is always
+available in constant time.
+"""
+
+from __future__ import annotations
+from collections.abc import (
+    Iterable,
+    Iterator,
+    MutableMapping,
+    MutableSequence,
+)
+from typing import Any, overload
+from . import AnyEach, AnyWithEntries
+
+__all__ = ["IncrementalValidator"]
+
+_LEAF = "leaf"
+_DICT = "dict"
+_LIST = "list"
+_ENTRIES = "entries"
+_EACH = "each"
+
+
+class IncrementalValidator:
+    """
+    Validates ``doc`` against ``template`` and keeps the result up to date as
+    ``doc`` changes.  The result is always equal to ``template == doc``.
+
+    The template is decomposed into a tree of checks mirroring its structure:
+    `dict`\\s in the template are matched against `dict`\\s in the document key
+    by key (plus a check that the keys are the same), `list`\\s against
+    `list`\\s element by element (plus a length check), `~anys.AnyWithEntries`
+    matchers key by key, and `~anys.AnyEach` matchers against `list`\\s
+    element by element (plus any length checks).  All other values & matchers
+    are leaves, which are compared against the corresponding subtree of the
+    document as a whole.
+
+    After mutating the document in place, call `changed()` with the path to
+    the mutated value, or else make the mutations through the proxy returned
+    by `doc`, which calls `changed()` itself.
+    """
+
+    def __init__(self, template: Any, doc: Any) -> None:
+        self.template = template
+        self._doc = doc
+        self._root = _build(template, doc, None, None)
+
+    @property
+    def valid(self) -> bool:
+        """Whether the document currently matches the template"""
+        return self._root.ok
+
+    @property
+    def doc(self) -> Any:
+        """
+        The document, wrapped in a tracking proxy if it is a `dict` or `list`.
+        Setting or deleting items of the proxy — or of the proxies it returns
+        for nested `dict`\\s & `list`\\s — mutates the underlying document and
+        reports the change.  A proxy for a nested value keeps reporting changes
+        at the value's current position after elements are inserted into,
+        deleted from, or reordered in an enclosing `list`; once the value is no
+        longer part of the document, mutating it through the proxy reports
+        nothing.
+        """
+        return _track(self, None, None, self._doc)
+
+    @doc.setter
+    def doc(self, value: Any) -> None:
+        self._doc = _untrack(value)
+        self.changed(())
+
+    def changed(self, path: Iterable[Any]) -> None:
+        """
+        Report that the value at ``path`` (a sequence of keys & indices leading
+        from the root of the document) has been replaced, added, deleted, or
+        otherwise mutated, and re-check it.  Changes at paths that are not
+        described structurally by the template cause the innermost enclosing
+        leaf to be re-checked as a whole.
+        """
+        node = self._root
+        value = self._doc
+        for key in path:
+            if node.kind is _LEAF:
+                break
+            child = node.children.get(key)
+            if child is None:
+                # A key or index that the template does not (yet) have a
+                # child check for
+                _refresh(node, value)
+                return
+            try:
+                value = value[key]
+            except (LookupError, TypeError):
+                _refresh(node, value)
+                return
+            node = child
+        self._rebuild(node, value)
+
+    def failing_paths(self) -> Iterator[tuple]:
+        """
+        Yield the paths of the innermost checks that currently fail.  Only
+        failing branches of the document are visited.
+        """
+        return _failing(self._root, ())
+
+    def _rebuild(self, node: _Node, value: Any) -> None:
+        parent = node.parent
+        new = _build(node.template, value, parent, node.key)
+        if parent is None:
+            self._root = new
+        else:
+            _set_child(parent, node.key, new)
+
+
+class _Node:
+    __slots__ = ("template", "kind", "parent", "key", "self_ok", "bad", "children")
+
+    def __init__(
+        self, template: Any, kind: str, parent: _Node | None, key: Any
+    ) -> None:
+        self.template = template
+        self.kind = kind
+        self.parent = parent
+        self.key = key
+        #: Whether the node's own (non-child) checks pass
+        self.self_ok = True
+        #: The number of children that fail
+        self.bad = 0
+        self.children: dict[Any, _Node] = {}
+
+    @property
+    def ok(self) -> bool:
+        return self.self_ok and not self.bad
+
+
+def _build(template: Any, value: Any, parent: _Node | None, key: Any) -> _Node:
+    if type(template) is dict and isinstance(value, dict):
+        kind = _DICT
+    elif type(template) is list and isinstance(value, list):
+        kind = _LIST
+    elif type(template) is AnyWithEntries:
+        kind = _ENTRIES
+    elif type(template) is AnyEach and isinstance(value, list):
+        kind = _EACH
+    else:
+        node = _Node(template, _LEAF, parent, key)
+        node.self_ok = bool(template == value)
+        return node
+    node = _Node(template, kind, parent, key)
+    node.self_ok = _self_ok(node, value)
+    for k, t, v in _child_items(node, value):
+        child = node.children[k] = _build(t, v, node, k)
+        if not child.ok:
+            node.bad += 1
+    return node
+
+
+def _self_ok(node: _Node, value: Any) -> bool:
+    t = node.template
+    if node.kind is _DICT:
+        return bool(value.keys() == t.keys())
+    elif node.kind is _LIST:
+        return len(value) == len(t)
+    elif node.kind is _ENTRIES:
+        return all(_has_key(value, k) for k in t.arg)
+    elif node.kind is _EACH:
+        n = len(value)
+        return (t.min_len is None or n >= t.min_len) and (
+            t.max_len is None or n <= t.max_len
+        )
+    else:
+        raise RuntimeError(f"Node kind has no checks of its own: {node.kind!r}")
+
+
+def _child_items(node: _Node, value: Any) -> Iterator[tuple[Any, Any, Any]]:
+    # Yields a `(key, template, value)` triple for each child check that
+    # applies to `value`
+    t = node.template
+    if node.kind is _DICT:
+        for k, sub in t.items():
+            if k in value:
+                yield (k, sub, value[k])
+    elif node.kind is _LIST:
+        for i, (sub, v) in enumerate(zip(t, value)):
+            yield (i, sub, v)
+    elif node.kind is _ENTRIES:
+        for k, sub in t.arg.items():
+            try:
+                v = value[k]
+            except (LookupError, TypeError):
+                continue
+            yield (k, sub, v)
+    else:
+        for i, v in enumerate(value):
+            yield (i, t.arg, v)
+
+
+def _has_key(value: Any, key: Any) -> bool:
+    try:
+        value[key]
+    except (LookupError, TypeError):
+        return False
+    else:
+        return True
+
+
+def _refresh(node: _Node, value: Any) -> None:
+    # Re-checks `node`'s own checks and adds & removes child checks for keys
+    # & indices that have appeared or disappeared, without re-checking
+    # existing children
+    was_ok = node.ok
+    node.self_ok = _self_ok(node, value)
+    if node.kind in (_LIST, _EACH):
+        n = len(value)
+        if node.kind is _LIST:
+            n = min(n, len(node.template))
+        for i in [i for i in node.children if i >= n]:
+            if not node.children.pop(i).ok:
+                node.bad -= 1
+        for i in range(len(node.children), n):
+            sub = node.template[i] if node.kind is _LIST else node.template.arg
+            child = node.children[i] = _build(sub, value[i], node, i)
+            if not child.ok:
+                node.bad += 1
+    else:
+        for k, sub, v in _child_items(node, value):
+            if k not in node.children:
+                child = node.children[k] = _build(sub, v, node, k)
+                if not child.ok:
+                    node.bad += 1
+        for k in [k for k in node.children if not _has_key(value, k)]:
+            if not node.children.pop(k).ok:
+                node.bad -= 1
+    _propagate(node, was_ok)
+
+
+def _set_child(parent: _Node, key: Any, new: _Node) -> None:
+    was_ok = parent.ok
+    old = parent.children[key]
+    parent.children[key] = new
+    parent.bad += (not new.ok) - (not old.ok)
+    _propagate(parent, was_ok)
+
+
+def _propagate(node: _Node, was_ok: bool) -> None:
+    # Updates the failing-child counts of `node`'s ancestors after `node`'s
+    # result may have changed from `was_ok`
+    while node.ok != was_ok and (parent := node.parent) is not None:
+        was_ok = parent.ok
+        parent.bad += -1 if node.ok else 1
+        node = parent
+
+
+def _failing(node: _Node, path: tuple) -> Iterator[tuple]:
+    if not node.self_ok:
+        yield path
+    if node.bad:
+        for k, child in node.children.items():
+            if not child.ok:
+                yield from _failing(child, path + (k,))
+
+
+def _track(
+    validator: IncrementalValidator, parent: _Tracked | None, key: Any, value: Any
+) -> Any:
+    if isinstance(value, dict):
+        return _TrackedDict(validator, parent, key, value)
+    elif isinstance(value, list):
+        return _TrackedList(validator, parent, key, value)
+    else:
+        return value
+
+
+def _untrack(value: Any) -> Any:
+    if isinstance(value, _Tracked):
+        return value._target
+    else:
+        return value
+
+
+class _Tracked:
+    # Proxies record their parent proxy & their key in it rather than an
+    # absolute path so that a proxy that is held onto while elements are
+    # inserted into, deleted from, or reordered in an ancestor list still
+    # reports changes at its current position
+
+    def __init__(
+        self,
+        validator: IncrementalValidator,
+        parent: _Tracked | None,
+        key: Any,
+        target: Any,
+    ) -> None:
+        self._validator = validator
+        self._parent = parent
+        self._key = key
+        self._target = target
+
+    def __repr__(self) -> str:
+        return repr(self._target)
+
+    def _resolve(self) -> tuple | None:
+        # Returns the current path from the root of the document to the
+        # target, or `None` if the target is no longer part of the document.
+        # Positions in lists are re-found by identity if they have moved.
+        chain: list[_Tracked] = []
+        node: _Tracked | None = self
+        while node is not None:
+            chain.append(node)
+            node = node._parent
+        root = chain.pop()
+        if root._target is not self._validator._doc:
+            return None
+        path = []
+        container = root._target
+        for node in reversed(chain):
+            try:
+                here = container[node._key] is node._target
+            except (LookupError, TypeError):
+                here = False
+            if not here:
+                if not isinstance(container, list):
+                    return None
+                for i, v in enumerate(container):
+                    if v is node._target:
+                        node._key = i
+                        break
+                else:
+                    return None
+            path.append(node._key)
+            container = node._target
+        return tuple(path)
+
+    def _notify(self, *keys: Any) -> None:
+        # Reports a change at `keys` below the target, unless the target has
+        # been detached from the document, in which case the change cannot
+        # affect the result
+        if (path := self._resolve()) is not None:
+            self._validator.changed(path + keys)
+
+
+class _TrackedDict(_Tracked, MutableMapping):
+    _target: dict
+
+    def __getitem__(self, key: Any) -> Any:
+        return _track(self._validator, self, key, self._target[key])
+
+    def __setitem__(self, key: Any, value: Any) -> None:
+        self._target[key] = _untrack(value)
+        self._notify(key)
+
+    def __delitem__(self, key: Any) -> None:
+        del self._target[key]
+        self._notify(key)
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._target)
+
+    def __len__(self) -> int:
+        return len(self._target)
+
+
+class _TrackedList(_Tracked, MutableSequence):
+    _target: list
+
+    @overload
+    def __getitem__(self, index: int) -> Any: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list: ...
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return self._target[index]
+        i = self._normalize(index)
+        return _track(self._validator, self, i, self._target[i])
+
+    @overload
+    def __setitem__(self, index: int, value: Any) -> None: ...
+
+    @overload
+    def __setitem__(self, index: slice, value: Iterable[Any]) -> None: ...
+
+    def __setitem__(self, index: int | slice, value: Any) -> None:
+        if isinstance(index, slice):
+            self._target[index] = [_untrack(v) for v in value]
+            self._notify()
+        else:
+            i = self._normalize(index)
+            self._target[i] = _untrack(value)
+            self._notify(i)
+
+    def __delitem__(self, index: int | slice) -> None:
+        n = len(self._target)
+        if isinstance(index, slice):
+            del self._target[index]
+            self._notify()
+        else:
+            i = self._normalize(index)
+            del self._target[i]
+            if i == n - 1:
+                # Removing the last element doesn't shift any others
+                self._notify(i)
+            else:
+                self._notify()
+
+    def __len__(self) -> int:
+        return len(self._target)
+
+    def insert(self, index: int, value: Any) -> None:
+        n = len(self._target)
+        self._target.insert(index, _untrack(value))
+        if index >= n:
+            # Appending doesn't shift any elements
+            self._notify(n)
+        else:
+            self._notify()
+
+    def sort(self, **kwargs: Any) -> None:
+        self._target.sort(**kwargs)
+        self._notify()
+
+    def _normalize(self, index: int) -> int:
+        n = len(self._target)
+        i = index + n if index < 0 else index
+        if not 0 <= i < n:
+            raise IndexError("list index out of range")
+        return i
@@ -0,0 +1,179 @@
+"""
+pytest plugin for timing comparisons against ``anys`` matchers
+
+The plugin is not registered via an entry point, as that would import
+``anys`` before coverage measurement starts in every pytest run; enable it with
+``-p anys.pytest_plugin``.  When pytest is run with the ``--anys-durations=N`` option, every ``==``
+comparison that reaches `anys.AnyBase.__eq__` is timed and attributed to the
+ID of the test during which it happened (including the test's setup &
+teardown) and to the type of the matcher.  Comparisons nested inside another
+matcher's comparison are counted as part of the outermost comparison only.  At
+the end of the session, the ``N`` (test, matcher type) pairs with the greatest
+cumulative comparison time are printed (or all of them if ``N`` is 0), and, if
+``--anys-durations-json=PATH`` is given (with or without
+``--anys-durations``), the full data is written to ``PATH`` as JSON.
+"""
+
+from __future__ import annotations
+from collections.abc import Callable, Generator
+from dataclasses import dataclass
+import json
+import threading
+from time import perf_counter
+from typing import Any
+import pytest
+from . import AnyBase
+
+__all__ = ["MatcherTiming", "MatcherTimer"]
+
+PLUGIN_NAME = "anys-durations"
+
+
+@dataclass
+class MatcherTiming:
+    """Timing statistics for one matcher type within one test"""
+
+    #: The node ID of the test
+    nodeid: str
+    #: The name of the matcher's class
+    matcher: str
+    #: The number of top-level comparisons performed
+    calls: int = 0
+    #: The total time spent in the comparisons, in seconds
+    total: float = 0.0
+    #: The time spent in the slowest single comparison, in seconds
+    max: float = 0.0
+
+    def for_json(self) -> dict[str, Any]:
+        return {
+            "nodeid": self.nodeid,
+            "matcher": self.matcher,
+            "calls": self.calls,
+            "total": self.total,
+            "max": self.max,
+        }
+
+
+class MatcherTimer:
+    """
+    The plugin object that times matcher comparisons.  While installed, it
+    replaces `anys.AnyBase.__eq__` with a timing wrapper.
+    """
+
+    def __init__(self) -> None:
+        self.timings: dict[tuple[str, str], MatcherTiming] = {}
+        self.nodeid = ""
+        self._local = threading.local()
+        self._orig_eq: Callable[[AnyBase, Any], bool] | None = None
+
+    def install(self) -> None:
+        orig_eq = AnyBase.__eq__
+        local = self._local
+        record = self.record
+
+        def __eq__(matcher: AnyBase, other: Any) -> bool:
+            if getattr(local, "active", False):
+                return orig_eq(matcher, other)
+            local.active = True
+            start = perf_counter()
+            try:
+                return orig_eq(matcher, other)
+            finally:
+                elapsed = perf_counter() - start
+                local.active = False
+                record(type(matcher).__name__, elapsed)
+
+        self._orig_eq = orig_eq
+        AnyBase.__eq__ = __eq__  # type: ignore[method-assign,assignment]
+
+    def uninstall(self) -> None:
+        if self._orig_eq is not None:
+            AnyBase.__eq__ = self._orig_eq  # type: ignore[method-assign]
+            self._orig_eq = None
+
+    def record(self, matcher: str, elapsed: float) -> None:
+        key = (self.nodeid, matcher)
+        try:
+            t = self.timings[key]
+        except KeyError:
+            t = self.timings[key] = MatcherTiming(self.nodeid, matcher)
+        t.calls += 1
+        t.total += elapsed
+        t.max = max(t.max, elapsed)
+
+    def sorted_timings(self) -> list[MatcherTiming]:
+        """Return the timings in descending order of total time"""
+        return sorted(self.timings.values(), key=lambda t: t.total, reverse=True)
+
+    @pytest.hookimpl(hookwrapper=True)
+    def pytest_runtest_protocol(self, item: pytest.Item) -> Generator[None]:
+        self.nodeid = item.nodeid
+        try:
+            yield
+        finally:
+            self.nodeid = ""
+
+    def pytest_sessionfinish(self, session: pytest.Session) -> None:
+        self.uninstall()
+        path = session.config.getoption("anys_durations_json")
+        if path is not None:
+            with open(path, "w", encoding="utf-8") as fp:
+                json.dump([t.for_json() for t in self.sorted_timings()], fp, indent=4)
+
+    def pytest_terminal_summary(
+        self, terminalreporter: pytest.TerminalReporter
+    ) -> None:
+        n = terminalreporter.config.getoption("anys_durations")
+        if n is None:
+            return
+        timings = self.sorted_timings()
+        if n > 0:
+            title = f"slowest {n} anys matcher comparisons"
+            timings = timings[:n]
+        else:
+            title = "slowest anys matcher comparisons"
+        terminalreporter.write_sep("=", title)
+        if not timings:
+            terminalreporter.write_line("No anys matcher comparisons were made.")
+        for t in timings:
+            terminalreporter.write_line(
+                f"{t.total:.4f}s {t.calls:>8} calls  {t.matcher}  {t.nodeid}"
+            )
+
+
+def pytest_addoption(parser: pytest.Parser) -> None:
+    group = parser.getgroup("anys")
+    group.addoption(
+        "--anys-durations",
+        type=int,
+        metavar="N",
+        default=None,
+        help=(
+            "Time comparisons against anys matchers and show the N tests &"
+            " matcher types with the most cumulative comparison time"
+            " (N=0 for all)"
+        ),
+    )
+    group.addoption(
+        "--anys-durations-json",
+        metavar="PATH",
+        default=None,
+        help="Write the full anys matcher timing data to PATH as JSON",
+    )
+
+
+def pytest_configure(config: pytest.Config) -> None:
+    if (
+        config.getoption("anys_durations") is not None
+        or config.getoption("anys_durations_json") is not None
+    ):
+        timer = MatcherTimer()
+        timer.install()
+        config.pluginmanager.register(timer, PLUGIN_NAME)
+
+
+def pytest_unconfigure(config: pytest.Config) -> None:
+    timer = config.pluginmanager.get_plugin(PLUGIN_NAME)
+    if timer is not None:
+        timer.uninstall()
+        config.pluginmanager.unregister(timer, PLUGIN_NAME)
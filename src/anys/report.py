@@ -0,0 +1,365 @@
+"""
+Explaining why a value does not match an ``anys`` template
+
+The `iter_failures()` function compares a value against a template — a plain
+value or `anys` matcher, possibly inside nested dicts, lists, and
+`~anys.AnyWithEntries` & `~anys.AnyAnd` matchers — and reports each place in
+the value that fails to match, identified by its path from the root.
+
+The `FailureReport` class aggregates the failures of many values into counts
+per path & leaf matcher, keeping a bounded random sample of the failing values
+for each.
+"""
+
+from __future__ import annotations
+from collections.abc import Iterable, Iterator, Mapping
+from dataclasses import dataclass, field
+import json
+import random
+import re
+from typing import Any, Literal
+from . import AnyAnd, AnyWithEntries, Memoized
+
+__all__ = [
+    "Failure",
+    "FailureReport",
+    "MISSING",
+    "PathStats",
+    "format_path",
+    "iter_failures",
+]
+
+
+class _Missing:
+    def __repr__(self) -> str:
+        return "MISSING"
+
+
+#: Sentinel used as the `Failure.actual` value of a missing key
+MISSING: Any = _Missing()
+
+Reason = Literal["mismatch", "missing", "unexpected", "length"]
+
+
+@dataclass(frozen=True)
+class Failure:
+    """A place in a value that does not match the corresponding template"""
+
+    #: The sequence of keys & indices leading from the root of the value to
+    #: the failing place
+    path: tuple
+    #: The expected value or matcher at the path
+    expected: Any
+    #: The actual value at the path, or `MISSING` if the path is not present
+    actual: Any
+    #: The kind of failure:
+    #:
+    #: - ``"mismatch"`` — ``actual`` does not equal or match ``expected``
+    #: - ``"missing"`` — a key required by the template is absent
+    #: - ``"unexpected"`` — a `dict` has a key not present in the template
+    #:   `dict` (in which case ``expected`` is `MISSING`)
+    #: - ``"length"`` — a `list` has a different length from the template
+    #:   `list` (in which case ``expected`` and ``actual`` are the lengths)
+    reason: Reason
+
+    @property
+    def path_str(self) -> str:
+        """The path formatted with `format_path()`"""
+        return format_path(self.path)
+
+
+def iter_failures(expected: Any, value: Any) -> Iterator[Failure]:
+    """
+    Compare ``value`` against ``expected`` and yield a `Failure` for each
+    place in ``value`` that does not match.  If ``value == expected``, nothing
+    is yielded.
+
+    Dicts and lists in ``expected`` are descended into, as are the
+    mappings of `~anys.AnyWithEntries` matchers, the arguments of
+    `~anys.AnyAnd` matchers, and the matchers of `~anys.Memoized` wrappers, so
+    that each failure is attributed to the innermost value or matcher
+    responsible; all other values & matchers are compared as a whole.
+    """
+    return _walk(expected, value, ())
+
+
+def _walk(expected: Any, value: Any, path: tuple) -> Iterator[Failure]:
+    if expected == value:
+        return
+    found = False
+    if type(expected) is dict and type(value) is dict:
+        for k, e in expected.items():
+            if k in value:
+                for f in _walk(e, value[k], path + (k,)):
+                    found = True
+                    yield f
+            else:
+                found = True
+                yield Failure(path + (k,), e, MISSING, "missing")
+        for k in value.keys() - expected.keys():
+            found = True
+            yield Failure(path + (k,), MISSING, value[k], "unexpected")
+    elif type(expected) is list and type(value) is list:
+        if len(expected) != len(value):
+            found = True
+            yield Failure(path, len(expected), len(value), "length")
+        for i, (e, v) in enumerate(zip(expected, value)):
+            for f in _walk(e, v, path + (i,)):
+                found = True
+                yield f
+    elif type(expected) is AnyWithEntries and _subscriptable(value):
+        for k, e in expected.arg.items():
+            try:
+                v = value[k]
+            except (LookupError, TypeError):
+                found = True
+                yield Failure(path + (k,), e, MISSING, "missing")
+            else:
+                for f in _walk(e, v, path + (k,)):
+                    found = True
+                    yield f
+    elif type(expected) is AnyAnd:
+        for e in expected.args:
+            for f in _walk(e, value, path):
+                found = True
+                yield f
+    elif type(expected) is Memoized:
+        for f in _walk(expected.arg, value, path):
+            found = True
+            yield f
+    if not found:
+        yield Failure(path, expected, value, "mismatch")
+
+
+def _subscriptable(value: Any) -> bool:
+    return isinstance(value, Mapping) or hasattr(type(value), "__getitem__")
+
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*")
+
+
+def format_path(path: tuple) -> str:
+    """
+    Format a path as a JSONPath-style string, e.g., ``$.items[0]["a-b"]``.
+    Integer elements are formatted as indices, string elements that
+    are identifiers are formatted as dotted names, and all other elements are
+    formatted as bracketed, quoted keys.
+    """
+    s = "$"
+    for p in path:
+        if p is _WILDCARD:
+            s += "[*]"
+        elif isinstance(p, int) and not isinstance(p, bool):
+            s += f"[{p}]"
+        elif isinstance(p, str) and _IDENTIFIER.fullmatch(p):
+            s += f".{p}"
+        elif isinstance(p, str):
+            s += f"[{json.dumps(p)}]"
+        else:
+            s += f"[{p!r}]"
+    return s
+
+
+#: Stands in for list indices in the paths used to aggregate failures
+_WILDCARD = object()
+
+
+@dataclass
+class PathStats:
+    """Aggregated failures at one path for one expected value or matcher"""
+
+    #: The path, formatted with `format_path()`, with list indices replaced
+    #: by ``[*]``
+    path: str
+    #: The `repr()` of the expected value or matcher at the path
+    expected: str
+    #: The `Failure.reason` of the failures
+    reason: str
+    #: The number of failing values that had this failure
+    count: int = 0
+    #: A random sample of the actual values at the path (empty for missing
+    #: keys)
+    examples: list[Any] = field(default_factory=list)
+
+    def for_json(self) -> dict[str, Any]:
+        return {
+            "path": self.path,
+            "expected": self.expected,
+            "reason": self.reason,
+            "count": self.count,
+            "examples": self.examples,
+        }
+
+
+class FailureReport:
+    """
+    Aggregates the failures of many values against ``template``.  Each
+    failure (as found by `iter_failures()`) is attributed to its path — with
+    list indices replaced by ``[*]``, so that failures in different elements
+    of a list are counted together — and to the leaf value or matcher
+    responsible.  For each such pair, the number of failing values is
+    counted, and a random sample of at most ``sample_size`` of the actual
+    values at the path is kept using reservoir sampling, so memory use does
+    not grow with the number of failures.
+
+    Reports built from different portions of the data (e.g., in different
+    processes) can be combined with `merge()`.
+    """
+
+    def __init__(
+        self, template: Any, *, sample_size: int = 5, seed: int | None = None
+    ) -> None:
+        self.template = template
+        self.sample_size = sample_size
+        #: The number of values checked
+        self.checked = 0
+        #: The number of values that failed
+        self.failed = 0
+        self._stats: dict[tuple[str, str, str], PathStats] = {}
+        self._rng = random.Random(seed)
+
+    def __getstate__(self) -> dict[str, Any]:
+        # The template may not be picklable (e.g., if it contains lambdas)
+        state = self.__dict__.copy()
+        state["template"] = None
+        return state
+
+    def check(self, value: Any) -> list[Failure]:
+        """
+        Check ``value`` against the template, add any failures to the report,
+        and return them
+        """
+        self.checked += 1
+        if self.template == value:
+            return []
+        failures = list(iter_failures(self.template, value))
+        self.add_failures(failures)
+        return failures
+
+    def check_many(self, values: Iterable[Any]) -> None:
+        """Check each element of ``values`` against the template"""
+        for v in values:
+            self.check(v)
+
+    def add_failures(self, failures: Iterable[Failure]) -> None:
+        """
+        Record the failures of a single value that has already been counted in
+        `checked`
+        """
+        self.failed += 1
+        seen = set()
+        for f in failures:
+            path = format_path(
+                tuple(
+                    _WILDCARD if isinstance(p, int) and not isinstance(p, bool) else p
+                    for p in f.path
+                )
+            )
+            key = (path, repr(f.expected), f.reason)
+            if key not in seen:
+                seen.add(key)
+                self.add(*key, example=f.actual)
+
+    def add(
+        self, path: str, expected: str, reason: str, example: Any = MISSING
+    ) -> None:
+        """
+        Record a single failure with the given formatted path, expected value
+        `repr()`, reason, and actual value (if any).  This does not change
+        `failed`.
+        """
+        key = (path, expected, reason)
+        try:
+            stats = self._stats[key]
+        except KeyError:
+            stats = self._stats[key] = PathStats(path, expected, reason)
+        stats.count += 1
+        if example is MISSING:
+            return
+        if len(stats.examples) < self.sample_size:
+            stats.examples.append(example)
+        else:
+            j = self._rng.randrange(stats.count)
+            if j < self.sample_size:
+                stats.examples[j] = example
+
+    def merge(self, other: FailureReport) -> None:
+        """Add the counts & samples from ``other`` to this report"""
+        self.checked += other.checked
+        self.failed += other.failed
+        for key, theirs in other._stats.items():
+            ours = self._stats.get(key)
+            if ours is None:
+                self._stats[key] = PathStats(
+                    theirs.path,
+                    theirs.expected,
+                    theirs.reason,
+                    theirs.count,
+                    theirs.examples[: self.sample_size],
+                )
+            else:
+                ours.examples = self._merge_samples(ours, theirs)
+                ours.count += theirs.count
+
+    def _merge_samples(self, a: PathStats, b: PathStats) -> list[Any]:
+        # Draws a combined sample, taking each element from `a` or `b` with
+        # probability proportional to the number of values each represents
+        sa, sb = list(a.examples), list(b.examples)
+        na, nb = a.count, b.count
+        merged: list[Any] = []
+        while len(merged) < self.sample_size and (sa or sb):
+            if sa and (not sb or self._rng.random() * (na + nb) < na):
+                merged.append(sa.pop(self._rng.randrange(len(sa))))
+                na -= 1
+            else:
+                merged.append(sb.pop(self._rng.randrange(len(sb))))
+                nb -= 1
+        return merged
+
+    def stats(self) -> list[PathStats]:
+        """
+        Return the aggregated failures in descending order of count, with ties
+        broken by path
+        """
+        return sorted(self._stats.values(), key=lambda s: (-s.count, s.path))
+
+    def for_json(self) -> dict[str, Any]:
+        """Return the report as a JSON-serializable `dict`"""
+        return {
+            "checked": self.checked,
+            "failed": self.failed,
+            "paths": [s.for_json() for s in self.stats()],
+        }
+
+    def to_json(self, **kwargs: Any) -> str:
+        """
+        Serialize the report to JSON.  Example values that are not
+        JSON-serializable are replaced by their `repr()`.  Keyword arguments
+        are passed to `json.dumps()`.
+        """
+        kwargs.setdefault("default", repr)
+        return json.dumps(self.for_json(), **kwargs)
+
+    def format_table(self) -> str:
+        """
+        Format the aggregated failures as a plain-text table with a row for
+        each path & expected value, in descending order of count
+        """
+        header = ("COUNT", "PATH", "REASON", "EXPECTED", "EXAMPLE")
+        rows = [
+            (
+                str(s.count),
+                s.path,
+                s.reason,
+                s.expected,
+                repr(s.examples[0]) if s.examples else "",
+            )
+            for s in self.stats()
+        ]
+        widths = [max(len(r[i]) for r in [header, *rows]) for i in range(len(header))]
+        lines = []
+        for r in [header, *rows]:
+            cells = [r[0].rjust(widths[0])]
+            cells.extend(c.ljust(w) for c, w in zip(r[1:], widths[1:]))
+            lines.append("  ".join(cells).rstrip())
+        return "\n".join(lines)
@@ -0,0 +1,257 @@
+"""
+Finding which of many ``anys`` matchers accept a value
+
+A `Router` holds a collection of labelled matchers and answers the question
+"which of these matchers does this value match?" without comparing the value
+against every matcher.  When the router is first used after matchers are
+added, it analyzes the matchers for cheap necessary conditions — a literal
+value for a key of an `~anys.AnyWithEntries`, an `~anys.AnyInstance` type, or
+a literal prefix of an `~anys.AnyMatch` or `~anys.AnyFullmatch` regex — and
+indexes each matcher by one such condition in a hash table.  Looking up a
+value then only compares it against the matchers whose conditions it
+satisfies, plus the matchers for which no condition could be found.
+"""
+
+from __future__ import annotations
+from collections import defaultdict
+from collections.abc import Iterable, Mapping
+import re
+import types
+from typing import Any, Generic, TypeVar
+from . import (
+    AnyAnd,
+    AnyBase,
+    AnyFullmatch,
+    AnyInstance,
+    AnyMatch,
+    AnyWithEntries,
+    Memoized,
+)
+from ._regex import literal_prefix
+
+__all__ = ["Router"]
+
+L = TypeVar("L")
+
+#: Marker for conditions on the value itself rather than on one of its entries
+_ROOT = object()
+
+_LITERAL = "literal"
+_TYPE = "type"
+_PREFIX = "prefix"
+
+#: Types whose instances compare equal only if their hashes are equal, so that
+#: they can be looked up in a `dict` in place of comparing with ``==``
+_HASHABLE_LITERALS = (str, bytes, int, bool, float, type(None))
+
+
+class Router(Generic[L]):
+    """
+    A collection of matchers, each associated with a label, that can be
+    queried for the labels of the matchers that a given value matches.
+    ``routes`` can be a mapping from labels to matchers or an iterable of
+    ``(label, matcher)`` pairs.  The matchers can be `anys` matchers or plain
+    values to compare with ``==``.
+
+    Matchers are indexed by the following conditions, found in the matchers
+    themselves, in `~anys.AnyAnd` matchers, and in the values of
+    `~anys.AnyWithEntries` matchers:
+
+    - an equality test against a `str`, `bytes`, `int`, `bool`, `float`, or
+      `None` literal
+    - an `~anys.AnyInstance` check
+    - an `~anys.AnyMatch` or `~anys.AnyFullmatch` regex that starts with a
+      literal prefix
+
+    Instance checks are evaluated using the type of the value (or of the value
+    of the relevant key), and the results are cached per type.
+    """
+
+    def __init__(self, routes: Mapping[L, Any] | Iterable[tuple[L, Any]] = ()) -> None:
+        self._labels: list[L] = []
+        self._matchers: list[Any] = []
+        self._index: _Index | None = None
+        items = routes.items() if isinstance(routes, Mapping) else routes
+        for label, matcher in items:
+            self.add(label, matcher)
+
+    def __len__(self) -> int:
+        return len(self._matchers)
+
+    def add(self, label: L, matcher: Any) -> None:
+        """
+        Add ``matcher`` to the router with the given label.  Matchers are
+        tried in the order in which they were added.
+        """
+        self._labels.append(label)
+        self._matchers.append(matcher)
+        self._index = None
+
+    def first_match(self, value: Any, default: L | None = None) -> L | None:
+        """
+        Return the label of the first-added matcher that ``value`` matches, or
+        ``default`` if there is no such matcher
+        """
+        for i in self._candidates(value):
+            if self._matchers[i] == value:
+                return self._labels[i]
+        return default
+
+    def all_matches(self, value: Any) -> list[L]:
+        """
+        Return the labels of all matchers that ``value`` matches, in the order
+        in which the matchers were added
+        """
+        return [
+            self._labels[i]
+            for i in self._candidates(value)
+            if self._matchers[i] == value
+        ]
+
+    def _candidates(self, value: Any) -> list[int]:
+        if self._index is None:
+            self._index = _Index(self._matchers)
+        return self._index.candidates(value)
+
+
+class _Index:
+    def __init__(self, matchers: list[Any]) -> None:
+        # Each matcher is indexed by a single condition, preferring equality
+        # conditions on the key (or the value itself) that the most matchers
+        # have equality conditions on
+        conds = [_conditions(m) for m in matchers]
+        popularity: dict[Any, int] = defaultdict(int)
+        for cs in conds:
+            for key in {k for k, kind, _ in cs if kind is _LITERAL}:
+                popularity[key] += 1
+        rank = {_LITERAL: 0, _PREFIX: 1, _TYPE: 2}
+        self.literals: dict[Any, dict[Any, list[int]]] = {}
+        self.types: dict[Any, dict[type, list[int]]] = {}
+        self.prefixes: dict[Any, dict[int, dict[Any, list[int]]]] = {}
+        self.fallback: list[int] = []
+        self._type_cache: dict[tuple[Any, type], list[int]] = {}
+        for i, cs in enumerate(conds):
+            if not cs:
+                self.fallback.append(i)
+                continue
+            key, kind, data = min(
+                cs, key=lambda c: (rank[c[1]], -popularity.get(c[0], 0))
+            )
+            if kind is _LITERAL:
+                self.literals.setdefault(key, {}).setdefault(data, []).append(i)
+            elif kind is _PREFIX:
+                self.prefixes.setdefault(key, {}).setdefault(len(data), {}).setdefault(
+                    data, []
+                ).append(i)
+            else:
+                for t in data:
+                    self.types.setdefault(key, {}).setdefault(t, []).append(i)
+        self.keys = list({*self.literals, *self.types, *self.prefixes})
+
+    def candidates(self, value: Any) -> list[int]:
+        found = list(self.fallback)
+        for key in self.keys:
+            if key is _ROOT:
+                v = value
+            else:
+                try:
+                    v = value[key]
+                except (LookupError, TypeError):
+                    # Every matcher with a condition on this key requires the
+                    # key to be present
+                    continue
+            if (lits := self.literals.get(key)) is not None:
+                if type(v) in _HASHABLE_LITERALS:
+                    found.extend(lits.get(v, ()))
+                else:
+                    for ids in lits.values():
+                        found.extend(ids)
+            if (prefixes := self.prefixes.get(key)) is not None:
+                for length, table in prefixes.items():
+                    if isinstance(v, (str, bytes)):
+                        found.extend(table.get(v[:length], ()))
+                    else:
+                        # Regexes can also match other bytes-like objects
+                        for p, ids in table.items():
+                            if isinstance(p, bytes):
+                                found.extend(ids)
+            if key in self.types:
+                if type(v) is v.__class__:
+                    found.extend(self._types_of(key, type(v)))
+                else:
+                    # `isinstance()` also consults `__class__`, which proxies &
+                    # mocks can override, so such values can't be looked up by
+                    # their type alone
+                    found.extend(
+                        i
+                        for cls, idlist in self.types[key].items()
+                        if isinstance(v, cls)
+                        for i in idlist
+                    )
+        return sorted(set(found))
+
+    def _types_of(self, key: Any, t: type) -> list[int]:
+        try:
+            return self._type_cache[key, t]
+        except KeyError:
+            ids = [
+                i
+                for cls, idlist in self.types[key].items()
+                if issubclass(t, cls)
+                for i in idlist
+            ]
+            self._type_cache[key, t] = ids
+            return ids
+
+
+def _conditions(matcher: Any, key: Any = _ROOT) -> list[tuple[Any, str, Any]]:
+    # Returns a list of `(key, kind, data)` triples describing conditions that
+    # every value matched by `matcher` must satisfy
+    if not isinstance(matcher, AnyBase):
+        if type(matcher) in _HASHABLE_LITERALS:
+            return [(key, _LITERAL, matcher)]
+        return []
+    elif type(matcher) is Memoized:
+        return _conditions(matcher.arg, key)
+    elif type(matcher) is AnyAnd:
+        return [c for m in matcher.args for c in _conditions(m, key)]
+    elif type(matcher) is AnyWithEntries and key is _ROOT:
+        conds = []
+        for k, v in matcher.arg.items():
+            try:
+                hash(k)
+            except TypeError:
+                continue
+            conds.extend(_conditions(v, k))
+        return conds
+    elif type(matcher) is AnyInstance:
+        classes = _flatten_classinfo(matcher.arg)
+        if classes is not None:
+            return [(key, _TYPE, classes)]
+        return []
+    elif type(matcher) in (AnyMatch, AnyFullmatch):
+        try:
+            prefix = literal_prefix(matcher.arg)
+        except (TypeError, re.error):
+            return []
+        if prefix:
+            return [(key, _PREFIX, prefix)]
+        return []
+    else:
+        return []
+
+
+def _flatten_classinfo(classinfo: Any) -> list[type] | None:
+    if isinstance(classinfo, type):
+        return [classinfo]
+    elif isinstance(classinfo, types.UnionType):
+        return _flatten_classinfo(classinfo.__args__)
+    elif isinstance(classinfo, tuple):
+        classes: list[type] = []
+        for c in classinfo:
+            if (sub := _flatten_classinfo(c)) is None:
+                return None
+            classes.extend(sub)
+        return classes
+    else:
+        return None
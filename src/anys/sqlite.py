@@ -0,0 +1,352 @@
+"""
+Evaluating ``anys`` templates inside SQLite queries
+
+The `to_sql()` function translates a template mapping column names to
+expected values (which can be ``anys`` matchers) into an SQL boolean
+expression that is true for exactly the rows of a table that match the
+template, so that finding or counting the rows that fail to match can be done
+by SQLite itself — using indexes where they apply — instead of by pulling
+every row into Python.
+
+Comparison, membership, instance, and substring matchers and plain values
+become SQL comparisons guarded by ``typeof()`` checks that reproduce Python's
+rules for comparing values of different types; `~anys.AnyAnd`,
+`~anys.AnyOr`, `~anys.Not`, `~anys.Maybe`, and `~anys.Memoized` become the
+corresponding SQL connectives; regex matchers become calls to a registered
+``REGEXP`` function; and anything else is evaluated by a Python user-defined
+function that compares the matcher with the column value.
+"""
+
+from __future__ import annotations
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from dataclasses import dataclass, field
+from functools import lru_cache
+from itertools import count
+import math
+import re
+import sqlite3
+from typing import Any
+from . import (
+    AnyAnd,
+    AnyBase,
+    AnyFullmatch,
+    AnyGE,
+    AnyGT,
+    AnyIn,
+    AnyInstance,
+    AnyLE,
+    AnyLT,
+    AnyMatch,
+    AnyOr,
+    AnySearch,
+    AnySubstr,
+    AnyWithEntries,
+    Maybe,
+    Memoized,
+    Not,
+)
+
+__all__ = ["Predicate", "count_violations", "iter_violations", "to_sql"]
+
+#: The SQLite storage classes, as reported by ``typeof()``, and an example of
+#: the Python type that `sqlite3` returns for each
+_STORAGE_CLASSES = {
+    "integer": 0,
+    "real": 0.0,
+    "text": "",
+    "blob": b"",
+    "null": None,
+}
+
+_NUMERIC = "typeof({c}) IN ('integer', 'real')"
+_TEXT = "typeof({c}) = 'text'"
+_BLOB = "typeof({c}) = 'blob'"
+
+_COMPARISONS = {AnyLT: "<", AnyLE: "<=", AnyGT: ">", AnyGE: ">="}
+
+# Fallback functions get unique names so that predicates registered on the
+# same connection do not replace each other's functions
+_udf_ids = count()
+
+_INT64_MIN = -(2**63)
+_INT64_MAX = 2**63 - 1
+
+
+@dataclass
+class Predicate:
+    """
+    An SQL boolean expression produced by `to_sql()`, together with the
+    parameters & functions that it needs
+    """
+
+    #: The expression, with ``?`` placeholders for the parameters.  It
+    #: evaluates to 1 for rows that match the template and 0 (never NULL) for
+    #: all other rows.
+    sql: str
+    #: The values of the placeholders in ``sql``, in order
+    params: list[Any] = field(default_factory=list)
+    #: A mapping from names of functions used in ``sql`` to pairs of their
+    #: arities & implementations, which must be registered with a connection
+    #: via `register()` before the expression is used
+    functions: dict[str, tuple[int, Callable[..., Any]]] = field(default_factory=dict)
+    #: The `repr()`\s of the matchers & values that could not be translated
+    #: to SQL and are instead evaluated by calling back into Python
+    fallbacks: list[str] = field(default_factory=list)
+
+    def register(self, conn: sqlite3.Connection) -> None:
+        """Register the functions used by the expression with ``conn``"""
+        for name, (nargs, func) in self.functions.items():
+            conn.create_function(name, nargs, func)
+
+
+def to_sql(template: Mapping | AnyWithEntries) -> Predicate:
+    """
+    Translate ``template`` — a mapping from column names to expected values
+    (or an `~anys.AnyWithEntries` matcher wrapping such a mapping) — into an
+    SQL expression that is true for the rows whose column values equal or
+    match the expected values, as returned by `sqlite3` without type
+    converters.  Columns that are not in the template are ignored.
+    """
+    if isinstance(template, AnyWithEntries):
+        fields = template.arg
+    elif isinstance(template, Mapping):
+        fields = template
+    else:
+        raise TypeError(
+            f"Template must be a mapping or AnyWithEntries, not {template!r}"
+        )
+    tr = _Translator()
+    clauses = [tr.translate(expected, _quote(col)) for col, expected in fields.items()]
+    sql = " AND ".join(f"({c})" for c in clauses) if clauses else "1"
+    return Predicate(sql, tr.params, tr.functions, tr.fallbacks)
+
+
+def count_violations(
+    conn: sqlite3.Connection, table: str, template: Mapping | AnyWithEntries
+) -> int:
+    """
+    Return the number of rows of ``table`` that do not match ``template`` (as
+    for `to_sql()`)
+    """
+    pred = to_sql(template)
+    pred.register(conn)
+    (n,) = conn.execute(
+        f"SELECT count(*) FROM {_quote(table)} WHERE NOT ({pred.sql})", pred.params
+    ).fetchone()
+    return int(n)
+
+
+def iter_violations(
+    conn: sqlite3.Connection, table: str, template: Mapping | AnyWithEntries
+) -> Iterator[dict[str, Any]]:
+    """
+    Yield each row of ``table`` that does not match ``template`` (as for
+    `to_sql()`) as a `dict` mapping column names to values
+    """
+    pred = to_sql(template)
+    pred.register(conn)
+    cursor = conn.execute(
+        f"SELECT * FROM {_quote(table)} WHERE NOT ({pred.sql})", pred.params
+    )
+    names = [d[0] for d in cursor.description]
+    for row in cursor:
+        yield dict(zip(names, row))
+
+
+class _Translator:
+    def __init__(self) -> None:
+        self.params: list[Any] = []
+        self.functions: dict[str, tuple[int, Callable[..., Any]]] = {}
+        self.fallbacks: list[str] = []
+
+    def param(self, value: Any) -> str:
+        self.params.append(value)
+        return "?"
+
+    def translate(self, expected: Any, c: str) -> str:
+        # Returns an SQL expression that evaluates to 1 or 0 (never NULL)
+        # according to whether `expected == value` for the value of the
+        # column expression `c`
+        if not isinstance(expected, AnyBase):
+            if (sql := self.literal(expected, c)) is not None:
+                return sql
+        elif type(expected) is AnyAnd:
+            return self.connective("AND", "1", expected.args, c)
+        elif type(expected) is AnyOr:
+            return self.connective("OR", "0", expected.args, c)
+        elif type(expected) is Not:
+            return f"NOT ({self.translate(expected.arg, c)})"
+        elif type(expected) is Maybe:
+            return f"{c} IS NULL OR ({self.translate(expected.arg, c)})"
+        elif type(expected) is Memoized:
+            return self.translate(expected.arg, c)
+        elif type(expected) in _COMPARISONS:
+            if (sql := self.comparison(expected, c)) is not None:
+                return sql
+        elif type(expected) is AnyInstance:
+            return self.instance(expected, c)
+        elif type(expected) is AnyIn:
+            if (sql := self.membership(expected, c)) is not None:
+                return sql
+        elif type(expected) is AnySubstr:
+            if isinstance(expected.arg, str):
+                haystack = self.param(expected.arg)
+                return f"{_TEXT.format(c=c)} AND instr({haystack}, {c}) > 0"
+        elif type(expected) in (AnyMatch, AnySearch, AnyFullmatch):
+            if (sql := self.regex(expected, c)) is not None:
+                return sql
+        return self.fallback(expected, c)
+
+    def connective(self, op: str, empty: str, args: Sequence[Any], c: str) -> str:
+        # `empty` is the value of the connective with no operands
+        if not args:
+            return empty
+        return f" {op} ".join(f"({self.translate(a, c)})" for a in args)
+
+    def literal(self, value: Any, c: str) -> str | None:
+        if value is None:
+            return f"{c} IS NULL"
+        elif isinstance(value, (bool, int, float)):
+            if (v := _sql_number(value)) is None:
+                return "0" if isinstance(value, float) else None
+            return f"{_NUMERIC.format(c=c)} AND {c} = {self.param(v)}"
+        elif type(value) is str:
+            return f"{_TEXT.format(c=c)} AND {c} = {self.param(value)} COLLATE BINARY"
+        elif type(value) is bytes:
+            return f"{_BLOB.format(c=c)} AND {c} = {self.param(value)}"
+        else:
+            return None
+
+    def comparison(self, m: AnyBase, c: str) -> str | None:
+        op = _COMPARISONS[type(m)]
+        bound = m.arg  # type: ignore[attr-defined]
+        if isinstance(bound, (bool, int, float)):
+            if (v := _sql_number(bound)) is None:
+                return "0" if isinstance(bound, float) else None
+            return f"{_NUMERIC.format(c=c)} AND {c} {op} {self.param(v)}"
+        elif type(bound) is str:
+            return (
+                f"{_TEXT.format(c=c)} AND {c} {op} {self.param(bound)}"
+                " COLLATE BINARY"
+            )
+        elif type(bound) is bytes:
+            return f"{_BLOB.format(c=c)} AND {c} {op} {self.param(bound)}"
+        else:
+            return None
+
+    def instance(self, m: AnyInstance, c: str) -> str:
+        try:
+            kinds = [
+                k for k, sample in _STORAGE_CLASSES.items() if isinstance(sample, m.arg)
+            ]
+        except TypeError:
+            return self.fallback(m, c)
+        if not kinds:
+            return "0"
+        elif len(kinds) == len(_STORAGE_CLASSES):
+            return "1"
+        return f"typeof({c}) IN ({', '.join(repr(k) for k in kinds)})"
+
+    def membership(self, m: AnyIn, c: str) -> str | None:
+        if not isinstance(m.arg, list):
+            return None
+        # Group literal elements by type so that each group becomes a single
+        # IN test; other elements are translated separately
+        numbers: list[Any] = []
+        strs: list[str] = []
+        blobs: list[bytes] = []
+        clauses: list[str] = []
+        for e in m.arg:
+            if isinstance(e, (bool, int, float)) and (v := _sql_number(e)) is not None:
+                numbers.append(v)
+            elif type(e) is str:
+                strs.append(e)
+            elif type(e) is bytes:
+                blobs.append(e)
+            elif not (isinstance(e, float) and math.isnan(e)):
+                clauses.append(self.translate(e, c))
+        for guard, values, collate in [
+            (_NUMERIC, numbers, ""),
+            (_TEXT, strs, " COLLATE BINARY"),
+            (_BLOB, blobs, ""),
+        ]:
+            if values:
+                placeholders = ", ".join(self.param(v) for v in values)
+                clauses.append(
+                    f"{guard.format(c=c)} AND {c}{collate} IN ({placeholders})"
+                )
+        if not clauses:
+            return "0"
+        return " OR ".join(f"({cl})" for cl in clauses)
+
+    def regex(self, m: AnyMatch, c: str) -> str | None:
+        if m.safe:
+            # Keep the linear-time guarantee by matching in Python
+            return None
+        if isinstance(m.arg, re.Pattern):
+            pattern, flags = m.arg.pattern, m.arg.flags
+        else:
+            pattern, flags = m.arg, 0
+        guard = _TEXT if isinstance(pattern, str) else _BLOB
+        clauses = [guard.format(c=c)]
+        for lit in m._literals:
+            clauses.append(f"instr({c}, {self.param(lit)}) > 0")
+        if type(m) is AnySearch and flags & ~re.UNICODE == 0:
+            self.functions["regexp"] = (2, _regexp)
+            clauses.append(f"{c} REGEXP {self.param(pattern)}")
+        else:
+            self.functions["anys_regex"] = (4, _anys_regex)
+            mode = {AnyMatch: "match", AnySearch: "search", AnyFullmatch: "fullmatch"}[
+                type(m)
+            ]
+            clauses.append(
+                f"anys_regex({self.param(mode)}, {self.param(pattern)},"
+                f" {self.param(flags)}, {c})"
+            )
+        return " AND ".join(clauses)
+
+    def fallback(self, expected: Any, c: str) -> str:
+        name = f"anys_udf_{next(_udf_ids)}"
+
+        def udf(value: Any) -> int:
+            return int(bool(expected == value))
+
+        self.functions[name] = (1, udf)
+        self.fallbacks.append(repr(expected))
+        return f"{name}({c})"
+
+
+def _sql_number(value: bool | int | float) -> int | float | None:
+    # Returns the value to bind for comparing against a number, or `None` if
+    # it cannot be represented (NaN is stored as NULL, and integers must fit
+    # in 64 bits)
+    if isinstance(value, float):
+        return None if math.isnan(value) else value
+    elif _INT64_MIN <= value <= _INT64_MAX:
+        return int(value)
+    else:
+        return None
+
+
+@lru_cache(maxsize=256)
+def _compile(pattern: str | bytes, flags: int) -> re.Pattern:
+    return re.compile(pattern, flags)
+
+
+def _regexp(pattern: str | bytes, value: Any) -> int:
+    # Implements `value REGEXP pattern` with `re.search()` semantics
+    try:
+        return int(_compile(pattern, 0).search(value) is not None)
+    except TypeError:
+        return 0
+
+
+def _anys_regex(mode: str, pattern: str | bytes, flags: int, value: Any) -> int:
+    try:
+        return int(getattr(_compile(pattern, flags), mode)(value) is not None)
+    except TypeError:
+        return 0
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
@@ -0,0 +1,96 @@
+from __future__ import annotations
+import asyncio
+from collections.abc import AsyncIterator
+import time
+from typing import Any
+import pytest
+from anys import ANY_INT, AnyAsyncFunc
+from anys.aio import validate_stream
+
+
+async def agen(values: list[Any], consumed: list[Any]) -> AsyncIterator[Any]:
+    for v in values:
+        consumed.append(v)
+        yield v
+
+
+def make_matcher(running: list[int], peak: list[int]) -> AnyAsyncFunc:
+    async def check(x: Any) -> bool:
+        running[0] += 1
+        peak[0] = max(peak[0], running[0])
+        try:
+            await asyncio.sleep(0.001 * (x % 3))
+            return bool(x >= 0)
+        finally:
+            running[0] -= 1
+
+    return AnyAsyncFunc(check)
+
+
+@pytest.mark.parametrize("concurrency", [1, 2, 8])
+def test_validate_stream_pass(concurrency: int) -> None:
+    running, peak = [0], [0]
+    consumed: list[Any] = []
+    r = asyncio.run(
+        validate_stream(
+            agen(list(range(20)), consumed),
+            make_matcher(running, peak),
+            concurrency=concurrency,
+        )
+    )
+    assert r is None
+    assert consumed == list(range(20))
+    assert peak[0] <= concurrency
+    assert running[0] == 0
+
+
+@pytest.mark.parametrize("concurrency", [1, 2, 4])
+def test_validate_stream_fail(concurrency: int) -> None:
+    running, peak = [0], [0]
+    consumed: list[Any] = []
+    values = [0, 1, 2, 3, -4, 5, -6, 7, 8, 9, 10, 11, 12]
+    r = asyncio.run(
+        validate_stream(
+            agen(values, consumed),
+            make_matcher(running, peak),
+            concurrency=concurrency,
+        )
+    )
+    assert r == 4
+    assert len(consumed) <= 5 + concurrency
+    assert running[0] == 0
+
+
+def test_validate_stream_slow_producer() -> None:
+    consumed: list[Any] = []
+
+    async def slow_agen() -> AsyncIterator[int]:
+        consumed.append(-1)
+        yield -1
+        await asyncio.sleep(30)
+        consumed.append(1)  # pragma: no cover
+        yield 1  # pragma: no cover
+
+    async def check(x: Any) -> bool:
+        await asyncio.sleep(0.01)
+        return bool(x >= 0)
+
+    start = time.monotonic()
+    r = asyncio.run(validate_stream(slow_agen(), AnyAsyncFunc(check), concurrency=2))
+    assert time.monotonic() - start < 5
+    assert r == 0
+    assert consumed == [-1]
+
+
+def test_validate_stream_plain_matcher() -> None:
+    consumed: list[Any] = []
+    r = asyncio.run(validate_stream(agen([1, 2, "3", 4], consumed), ANY_INT))
+    assert r == 2
+    assert consumed == [1, 2, "3"]
+    r = asyncio.run(validate_stream(agen([], consumed), ANY_INT))
+    assert r is None
+
+
+def test_validate_stream_bad_concurrency() -> None:
+    with pytest.raises(ValueError):
+        asyncio.run(validate_stream(agen([], []), ANY_INT, concurrency=0))
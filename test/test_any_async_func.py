@@ -0,0 +1,102 @@
+from __future__ import annotations
+import asyncio
+from typing import Any
+import pytest
+from anys import (
+    ANY_INT,
+    ANY_STR,
+    AnyAsyncFunc,
+    AnyContains,
+    AnyEach,
+    AnyIn,
+    AnyWithAttrs,
+    AnyWithEntries,
+    Maybe,
+    Not,
+)
+
+
+async def is_even(x: Any) -> bool:
+    await asyncio.sleep(0)
+    return bool(x % 2 == 0)
+
+
+EVEN = AnyAsyncFunc(is_even)
+
+
+@pytest.mark.parametrize(
+    "m,value",
+    [
+        (EVEN, 42),
+        (EVEN & ANY_INT, 42),
+        (ANY_STR | EVEN, "foo"),
+        (ANY_STR | EVEN, 42),
+        (Maybe(EVEN), None),
+        (Maybe(EVEN), 2),
+        (Not(EVEN), 3),
+        (Not(EVEN), "foo"),
+        (AnyIn([1, EVEN]), 1),
+        (AnyIn([1, EVEN]), 4),
+        (AnyContains(EVEN), [1, 3, 4]),
+        (AnyContains(2), [1, 2]),
+        (AnyEach(EVEN), [2, 4]),
+        (AnyEach(EVEN, min_len=1, max_len=2), iter([2, 4])),
+        (AnyWithEntries({"n": EVEN, "s": "x"}), {"n": 2, "s": "x"}),
+        (AnyWithAttrs({"real": EVEN}), 4),
+        (ANY_INT.memoize(), 1),
+        (EVEN.memoize(), 2),
+    ],
+)
+def test_amatch_true(m: Any, value: Any) -> None:
+    assert asyncio.run(m.amatch(value)) is True
+
+
+@pytest.mark.parametrize(
+    "m,value",
+    [
+        (EVEN, 3),
+        (EVEN & ANY_INT, 42.0),
+        (ANY_STR | EVEN, 3),
+        (Maybe(EVEN), 3),
+        (Not(EVEN), 4),
+        (AnyIn([1, EVEN]), 3),
+        (AnyContains(EVEN), [1, 3, "foo"]),
+        (AnyEach(EVEN), [2, 3]),
+        (AnyEach(EVEN, max_len=1), [2, 4]),
+        (AnyEach(EVEN, min_len=3), [2, 4]),
+        (AnyWithEntries({"n": EVEN, "s": "x"}), {"n": 3, "s": "x"}),
+        (AnyWithEntries({"n": EVEN, "s": "x"}), {"s": "x"}),
+        (AnyWithAttrs({"real": EVEN}), 3),
+        (AnyWithAttrs({"nope": EVEN}), 4),
+        (EVEN.memoize(), 3),
+    ],
+)
+def test_amatch_false(m: Any, value: Any) -> None:
+    assert asyncio.run(m.amatch(value)) is False
+
+
+def test_amatch_type_error() -> None:
+    with pytest.raises(TypeError):
+        asyncio.run(EVEN.amatch("foo"))
+
+
+def test_any_async_func_sync_eq() -> None:
+    with pytest.raises(RuntimeError):
+        assert EVEN == 42
+
+
+def test_any_async_func_repr() -> None:
+    assert repr(EVEN) == f"AnyAsyncFunc({is_even!r})"
+
+
+def test_memoized_amatch_counts() -> None:
+    m = EVEN.memoize()
+
+    async def run() -> None:
+        assert await m.amatch(2)
+        assert await m.amatch(2)
+        assert not await m.amatch(3)
+
+    asyncio.run(run())
+    assert m.hits == 1
+    assert m.misses == 2
@@ -0,0 +1,126 @@
+from __future__ import annotations
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+import pytest
+from anys import ANY_INT, AnyAsyncFunc, AnyAt, AnyFunc, AnyGT
+from test_lib import assert_equal, assert_not_equal
+
+PAYLOAD = {
+    "data": {
+        "items": [
+            {"name": "foo", "price": 5},
+            {"name": "bar", "price": 10},
+            {"name": "baz", "price": 0},
+        ],
+        "meta.info": {"count": 3},
+    }
+}
+
+
+@pytest.mark.parametrize(
+    "m,value",
+    [
+        (AnyAt("data.items[*].name", AnyFunc(str.islower)), PAYLOAD),
+        (AnyAt("data.items[*].price", AnyGT(0), quantifier="any"), PAYLOAD),
+        (AnyAt("data.items[0].price", 5), PAYLOAD),
+        (AnyAt("data.items[-1].name", "baz"), PAYLOAD),
+        (AnyAt("data['meta.info'].count", 3), PAYLOAD),
+        (AnyAt('data["meta.info"]["count"]', 3), PAYLOAD),
+        (AnyAt("data.*.count", 3, quantifier="any"), PAYLOAD),
+        (AnyAt("[*][*]", ANY_INT), [[1, 2], [], [3]]),
+        (AnyAt("[*][*]", 3, quantifier="any"), [[1, 2], [], [3]]),
+        (AnyAt("items[*].price", AnyGT(0)), {"items": []}),
+        (AnyAt("", 42), 42),
+    ],
+)
+def test_any_at_eq(m: AnyAt, value: Any) -> None:
+    assert_equal(m, value)
+
+
+@pytest.mark.parametrize(
+    "m,value",
+    [
+        (AnyAt("data.items[*].price", AnyGT(0)), PAYLOAD),
+        (AnyAt("data.items[*].price", AnyGT(10), quantifier="any"), PAYLOAD),
+        (AnyAt("data.items[3].price", 5), PAYLOAD),
+        (AnyAt("data.missing", 5), PAYLOAD),
+        (AnyAt("data.items.price", 5), PAYLOAD),
+        (AnyAt("data.items[*].price", 5), {"data": {"items": 5}}),
+        (AnyAt("[*][*]", 3, quantifier="any"), [[1, 2], 7, "3"]),
+        (AnyAt("[*][*]", ANY_INT), [[1, 2], [], ["3"]]),
+        (AnyAt("items[*].price", AnyGT(0), quantifier="any"), {"items": []}),
+        (AnyAt("a", 1), None),
+    ],
+)
+def test_any_at_neq(m: AnyAt, value: Any) -> None:
+    assert_not_equal(m, value)
+
+
+def test_any_at_attrs() -> None:
+    obj = SimpleNamespace(
+        data=SimpleNamespace(items=[SimpleNamespace(price=5), {"price": 10}])
+    )
+    assert AnyAt("data.items[0].price", 5, attrs=True) == obj
+    assert AnyAt("data.items[1]['price']", 10, attrs=True) == obj
+    assert AnyAt("data.items[*].price", 5, attrs=True) != obj
+    assert AnyAt("data.items", ANY_INT, attrs=True) != obj
+    assert AnyAt("data.items", ANY_INT) != obj
+
+
+def test_any_at_stops_early() -> None:
+    seen: list[Any] = []
+
+    def check(x: Any) -> bool:
+        seen.append(x)
+        return bool(x > 0)
+
+    def items() -> Any:
+        yield 1
+        yield 0
+        raise AssertionError("Iterated too far")  # pragma: no cover
+
+    assert AnyAt("xs[*]", AnyFunc(check)) != {"xs": items()}
+    assert seen == [1, 0]
+    assert AnyAt("xs[*]", AnyFunc(check), quantifier="any") == {"xs": items()}
+
+
+@pytest.mark.parametrize(
+    "m,r",
+    [
+        (AnyAt("a.b", 1), "AnyAt('a.b', 1)"),
+        (
+            AnyAt("a[*]", ANY_INT, quantifier="any", attrs=True),
+            "AnyAt('a[*]', ANY_INT, quantifier='any', attrs=True)",
+        ),
+        (AnyAt("a", 1, name="A"), "A"),
+    ],
+)
+def test_any_at_repr(m: AnyAt, r: str) -> None:
+    assert repr(m) == r
+
+
+@pytest.mark.parametrize(
+    "path", ["a..b", "a.", ".a", "[x]", "a[", "a[*]b", "a[1.5]", "a['b]"]
+)
+def test_any_at_bad_path(path: str) -> None:
+    with pytest.raises(ValueError):
+        AnyAt(path, 1)
+
+
+def test_any_at_bad_quantifier() -> None:
+    with pytest.raises(ValueError):
+        AnyAt("a", 1, quantifier="some")  # type: ignore[arg-type]
+
+
+def test_any_at_amatch() -> None:
+    async def positive(x: Any) -> bool:
+        return bool(x > 0)
+
+    m = AnyAt("data.items[*].price", AnyAsyncFunc(positive))
+    assert asyncio.run(m.amatch(PAYLOAD)) is False
+    assert asyncio.run(m.amatch({"data": {"items": [{"price": 1}]}})) is True
+    m = AnyAt("data.items[*].price", AnyAsyncFunc(positive), quantifier="any")
+    assert asyncio.run(m.amatch(PAYLOAD)) is True
+    assert asyncio.run(m.amatch({"data": {"items": 42}})) is False
+    assert asyncio.run(m.amatch({"data": {}})) is False
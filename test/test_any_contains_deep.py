@@ -0,0 +1,118 @@
+from __future__ import annotations
+import asyncio
+from typing import Any
+import pytest
+from anys import ANY_INT, AnyAsyncFunc, AnyContainsDeep, AnyFunc, AnyWithEntries
+from test_lib import assert_equal, assert_not_equal
+
+ERROR = AnyWithEntries({"code": "E42"})
+
+RESPONSE = {
+    "status": "failed",
+    "results": [
+        {"id": 1, "errors": []},
+        {"id": 2, "errors": [{"code": "E17"}, {"code": "E42", "detail": "bad"}]},
+    ],
+}
+
+
+@pytest.mark.parametrize(
+    "arg,value",
+    [
+        (ERROR, RESPONSE),
+        (ERROR, [{"code": "E42"}]),
+        (ERROR, ({"wrapper": ({"code": "E42"},)},)),
+        ("E42", {"a": {"b": {"c": "E42"}}}),
+        (42, {frozenset({1, (2, 42)})}),
+        (ANY_INT, ["foo", ["bar", [3]]]),
+    ],
+)
+def test_any_contains_deep_eq(arg: Any, value: Any) -> None:
+    assert_equal(AnyContainsDeep(arg), value)
+
+
+@pytest.mark.parametrize(
+    "arg,value",
+    [
+        (ERROR, {"code": "E42"}),
+        (ERROR, {"results": [{"code": "E17"}]}),
+        ("E42", {"E42": "key, not value"}),
+        ("E42", "E42"),
+        ("E", ["E42"]),
+        (ANY_INT, None),
+        (ANY_INT, []),
+    ],
+)
+def test_any_contains_deep_neq(arg: Any, value: Any) -> None:
+    assert_not_equal(AnyContainsDeep(arg), value)
+
+
+def test_any_contains_deep_repr() -> None:
+    assert repr(AnyContainsDeep(42)) == "AnyContainsDeep(42)"
+
+
+def test_any_contains_deep_max_depth() -> None:
+    value = [1, [2, [3, [4]]]]
+    assert AnyContainsDeep(2, max_depth=1) != value
+    assert AnyContainsDeep(2, max_depth=2) == value
+    assert AnyContainsDeep(4, max_depth=3) != value
+    assert AnyContainsDeep(4, max_depth=4) == value
+
+
+@pytest.mark.parametrize("max_depth", [0, -1])
+def test_any_contains_deep_bad_max_depth(max_depth: int) -> None:
+    with pytest.raises(ValueError):
+        AnyContainsDeep(1, max_depth=max_depth)
+
+
+def test_any_contains_deep_very_deep() -> None:
+    value: Any = "needle"
+    for i in range(100_000):
+        value = {"child": value} if i % 2 else [value]
+    assert AnyContainsDeep("needle") == value
+    assert AnyContainsDeep("haystack") != value
+
+
+def test_any_contains_deep_cycle() -> None:
+    value: list[Any] = [1, 2]
+    value.append({"self": value})
+    assert AnyContainsDeep(3) != value
+    assert AnyContainsDeep(2) == value
+
+
+def test_any_contains_deep_stops_at_first_hit() -> None:
+    seen: list[Any] = []
+
+    def check(x: Any) -> bool:
+        seen.append(x)
+        return bool(x == "hit")
+
+    assert AnyContainsDeep(AnyFunc(check)) == [["a"], "hit", ["b"], "c"]
+    assert seen == [["a"], "hit"]
+
+
+@pytest.mark.parametrize(
+    "value,path",
+    [
+        (RESPONSE, ("results", 1, "errors", 1)),
+        ([[], [[{"code": "E42"}]]], (1, 0, 0)),
+        ({"a": {frozenset({"x"}), ("code", "E42")}}, None),
+        ({"a": [{"code": "E17"}]}, None),
+    ],
+)
+def test_any_contains_deep_find_path(value: Any, path: tuple | None) -> None:
+    assert AnyContainsDeep(ERROR).find_path(value) == path
+
+
+def test_any_contains_deep_find_path_set() -> None:
+    m = AnyContainsDeep(42)
+    assert m.find_path({"a": {(1, 42)}}) == ("a", (1, 42), 1)
+
+
+def test_any_contains_deep_amatch() -> None:
+    async def is_e42(x: Any) -> bool:
+        return bool(x == "E42")
+
+    m = AnyContainsDeep(AnyAsyncFunc(is_e42))
+    assert asyncio.run(m.amatch(RESPONSE)) is True
+    assert asyncio.run(m.amatch({"a": ["E17"]})) is False
@@ -0,0 +1,70 @@
+from __future__ import annotations
+from typing import Any
+import pytest
+from anys import AnyContainsSubstring
+from test_lib import assert_equal, assert_not_equal
+
+WORDS = ["he", "she", "his", "hers"]
+
+
+@pytest.mark.parametrize(
+    "literals,value",
+    [
+        (WORDS, "ushers"),
+        (WORDS, "this"),
+        (WORDS, "he"),
+        (["abc", "bcd", "c"], "xxbcxx"),
+        (["a", ""], "xyz"),
+        ([""], ""),
+        ([b"foo", b"bar"], b"xxbarxx"),
+        ([b"foo", b"bar"], bytearray(b"foo")),
+        ([b"foo", b"bar"], memoryview(b"xxbarxx")[1:-1]),
+        ([f"tok{i}" for i in range(5000)], "message with tok4999 inside"),
+    ],
+)
+def test_any_contains_substring_eq(literals: list, value: Any) -> None:
+    assert_equal(AnyContainsSubstring(literals), value)
+
+
+@pytest.mark.parametrize(
+    "literals,value",
+    [
+        (WORDS, "hi"),
+        (WORDS, ""),
+        (["abc", "bcd"], "abbcabd"),
+        ([], "foo"),
+        (["foo"], b"foo"),
+        ([b"foo"], "foo"),
+        (["foo"], 42),
+        ([b"foo", b"bar"], b"fobaor"),
+        ([b"foo", b"bar"], memoryview(b"xxbarxx")[::2]),
+        ([b"foo", b"bar"], 42),
+        ([f"tok{i}" for i in range(5000)], "message with to_k4999 inside"),
+    ],
+)
+def test_any_contains_substring_neq(literals: list, value: Any) -> None:
+    assert_not_equal(AnyContainsSubstring(literals), value)
+
+
+def test_any_contains_substring_repr() -> None:
+    assert repr(AnyContainsSubstring(["a", "b"])) == "AnyContainsSubstring(['a', 'b'])"
+
+
+@pytest.mark.parametrize(
+    "literals,value,found",
+    [
+        (WORDS, "ushers", "she"),
+        (WORDS, "ahishers", "his"),
+        (["abcd", "bc"], "abcd", "bc"),
+        (["bc", "abc"], "abcd", "abc"),
+        ([b"foo", b"oo"], b"xfoo", b"foo"),
+        (WORDS, "nothing", None),
+    ],
+)
+def test_any_contains_substring_find(literals: list, value: Any, found: Any) -> None:
+    assert AnyContainsSubstring(literals).find(value) == found
+
+
+def test_any_contains_substring_mixed_literals() -> None:
+    with pytest.raises(TypeError):
+        AnyContainsSubstring(["foo", b"bar"])  # type: ignore[type-var]
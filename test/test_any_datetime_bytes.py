@@ -0,0 +1,78 @@
+from __future__ import annotations
+import mmap
+from typing import Any
+import pytest
+from anys import (
+    ANY_AWARE_DATETIME_BYTES,
+    ANY_AWARE_DATETIME_STR,
+    ANY_AWARE_TIME_BYTES,
+    ANY_AWARE_TIME_STR,
+    ANY_DATE_BYTES,
+    ANY_DATE_STR,
+    ANY_DATETIME_BYTES,
+    ANY_DATETIME_STR,
+    ANY_NAIVE_DATETIME_BYTES,
+    ANY_NAIVE_DATETIME_STR,
+    ANY_NAIVE_TIME_BYTES,
+    ANY_NAIVE_TIME_STR,
+    ANY_TIME_BYTES,
+    ANY_TIME_STR,
+    AnyFullmatch,
+)
+from test_lib import assert_equal, assert_not_equal
+
+PAIRS = [
+    (ANY_AWARE_DATETIME_STR, ANY_AWARE_DATETIME_BYTES),
+    (ANY_AWARE_TIME_STR, ANY_AWARE_TIME_BYTES),
+    (ANY_DATE_STR, ANY_DATE_BYTES),
+    (ANY_DATETIME_STR, ANY_DATETIME_BYTES),
+    (ANY_NAIVE_DATETIME_STR, ANY_NAIVE_DATETIME_BYTES),
+    (ANY_NAIVE_TIME_STR, ANY_NAIVE_TIME_BYTES),
+    (ANY_TIME_STR, ANY_TIME_BYTES),
+]
+
+SAMPLES = [
+    "2021-06-24T19:40:06",
+    "2021-06-24T19:40:06Z",
+    "2021-06-24 15:40:06-04:00",
+    "2021-06-24T19:40:06.123456+0000",
+    "2021-06-24T19:40",
+    "2021-06-24",
+    "12:34:56",
+    "12:34:56Z",
+    "12:34:56.789-04",
+    "2021-13-01T12:34:56Z",
+    "2021-01-01T24:34:56Z",
+    "1624563606",
+    "",
+]
+
+
+@pytest.mark.parametrize("strm,bytesm", PAIRS)
+@pytest.mark.parametrize("sample", SAMPLES)
+def test_bytes_constants_agree(
+    strm: AnyFullmatch, bytesm: AnyFullmatch, sample: str
+) -> None:
+    encoded = sample.encode("us-ascii")
+    values: list[Any] = [encoded, bytearray(encoded), memoryview(encoded)]
+    for v in values:
+        if strm == sample:
+            assert_equal(bytesm, v)
+        else:
+            assert_not_equal(bytesm, v)
+    assert_not_equal(bytesm, sample)
+
+
+@pytest.mark.parametrize("strm,bytesm", PAIRS)
+def test_bytes_constants_repr(strm: AnyFullmatch, bytesm: AnyFullmatch) -> None:
+    assert repr(bytesm) == repr(strm).replace("_STR", "_BYTES")
+
+
+def test_bytes_constants_mmap() -> None:
+    with mmap.mmap(-1, 20) as mm:
+        mm.write(b"2021-06-24T19:40:06Z")
+        assert ANY_DATETIME_BYTES == mm
+        assert ANY_AWARE_DATETIME_BYTES == mm
+        assert ANY_NAIVE_DATETIME_BYTES != mm
+        assert ANY_DATETIME_BYTES == memoryview(mm)[:19]
+        assert ANY_NAIVE_DATETIME_BYTES == memoryview(mm)[:19]
@@ -0,0 +1,107 @@
+from __future__ import annotations
+from array import array
+from collections.abc import Iterator
+from typing import Any
+import pytest
+from anys import (
+    ANY_INT,
+    ANY_STR,
+    AnyEach,
+    AnyGE,
+    AnyInRanges,
+    AnyLT,
+    AnyWithEntries,
+)
+from test_lib import assert_equal, assert_not_equal
+
+
+@pytest.mark.parametrize(
+    "m,value",
+    [
+        (AnyEach(ANY_INT), [1, 2, 3]),
+        (AnyEach(ANY_INT), ()),
+        (AnyEach(ANY_INT), range(10)),
+        (AnyEach(ANY_STR), "abc"),
+        (AnyEach(ANY_STR), {"foo": 1, "bar": 2}),
+        (AnyEach(42), (42, 42)),
+        (AnyEach(AnyWithEntries({"a": 1})), [{"a": 1, "b": 2}, {"a": 1}]),
+        (AnyEach(ANY_INT, min_len=2, max_len=3), [1, 2]),
+        (AnyEach(ANY_INT, min_len=2, max_len=3), [1, 2, 3]),
+        (AnyEach(AnyGE(0) & AnyLT(10)), range(10)),
+        (AnyEach(AnyGE(0) & AnyLT(10)), range(9, -1, -3)),
+        (AnyEach(AnyGE(0) & AnyLT(10)), range(0)),
+        (AnyEach(AnyLT(10**12)), range(10**11)),
+        (AnyEach(AnyGE(0)), array("i", [3, 1, 2])),
+        (AnyEach(AnyInRanges([(1, 3)])), memoryview(b"\x01\x02\x03")),
+        (AnyEach(AnyGE(0.5)), array("d", [1.0, 2.0])),
+    ],
+)
+def test_any_each_eq(m: AnyEach, value: Any) -> None:
+    assert_equal(m, value)
+
+
+@pytest.mark.parametrize(
+    "m,value",
+    [
+        (AnyEach(ANY_INT), [1, "2", 3]),
+        (AnyEach(ANY_INT), 42),
+        (AnyEach(ANY_INT), None),
+        (AnyEach(42), (42, 43)),
+        (AnyEach(ANY_INT, min_len=2, max_len=3), [1]),
+        (AnyEach(ANY_INT, min_len=2, max_len=3), [1, 2, 3, 4]),
+        (AnyEach(ANY_INT, min_len=2, max_len=3), [1, "2"]),
+        (AnyEach(AnyGE(0) & AnyLT(10)), range(11)),
+        (AnyEach(AnyGE(0) & AnyLT(10)), range(9, -2, -1)),
+        (AnyEach(AnyLT(10**12)), range(10**13)),
+        (AnyEach(AnyGE(0)), array("i", [3, -1, 2])),
+        (AnyEach(AnyInRanges([(1, 3)])), memoryview(b"\x01\x02\x04")),
+        (AnyEach(AnyInRanges([(1, 1), (3, 3)])), memoryview(b"\x01\x02\x03")),
+        (AnyEach(AnyGE(0.5)), array("d", [1.0, float("nan"), 2.0])),
+    ],
+)
+def test_any_each_neq(m: AnyEach, value: Any) -> None:
+    assert_not_equal(m, value)
+
+
+def test_any_each_repr() -> None:
+    assert repr(AnyEach(ANY_INT)) == "AnyEach(ANY_INT)"
+    assert repr(AnyEach(ANY_INT, min_len=2)) == "AnyEach(ANY_INT, min_len=2)"
+    assert (
+        repr(AnyEach(ANY_INT, min_len=0, max_len=3))
+        == "AnyEach(ANY_INT, min_len=0, max_len=3)"
+    )
+    assert repr(AnyEach(ANY_INT, max_len=3, name="SHORT_INTS")) == "SHORT_INTS"
+
+
+def counting(values: list[Any], seen: list[Any]) -> Iterator[Any]:
+    for v in values:
+        seen.append(v)
+        yield v
+
+
+def test_any_each_lazy() -> None:
+    seen: list[Any] = []
+    assert AnyEach(ANY_INT) != counting([1, 2, "3", 4, 5], seen)
+    assert seen == [1, 2, "3"]
+    seen.clear()
+    assert AnyEach(ANY_INT) == counting([1, 2, 3], seen)
+    assert seen == [1, 2, 3]
+
+
+@pytest.mark.parametrize(
+    "values,min_len,max_len,ok,consumed",
+    [
+        ([1, 2, 3], None, 3, True, 3),
+        ([1, 2, 3, 4, 5], None, 3, False, 4),
+        ([1, 2], 3, None, False, 2),
+        ([1, 2, 3], 3, None, True, 3),
+        (["1", 2, 3], 3, None, False, 1),
+    ],
+)
+def test_any_each_iterator_lengths(
+    values: list[Any], min_len: int | None, max_len: int | None, ok: bool, consumed: int
+) -> None:
+    seen: list[Any] = []
+    m = AnyEach(ANY_INT, min_len=min_len, max_len=max_len)
+    assert (m == counting(values, seen)) is ok
+    assert len(seen) == consumed
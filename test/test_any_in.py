@@ -1,4 +1,9 @@
+from __future__ import annotations
+from array import array
 from collections.abc import Iterable
+from decimal import Decimal
+from fractions import Fraction
+from pathlib import Path
 from typing import Any
 import pytest
 from anys import ANY_INT, ANY_STR, AnyIn
@@ -42,3 +47,111 @@ def test_from_any_in_eq(seq: Iterable, value: Any) -> None:
 )
 def test_from_any_in_neq(seq: Iterable, value: Any) -> None:
     assert_not_equal(AnyIn(seq), value)
+
+
+@pytest.mark.parametrize(
+    "value", [0, 5, 10**9 - 1, True, 3.0, Fraction(6, 2), Decimal("7"), 2 + 0j]
+)
+def test_any_in_range_eq(value: Any) -> None:
+    assert_equal(AnyIn(range(10**9)), value)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [-1, 10**9, 3.5, float("inf"), float("nan"), Decimal("NaN"), "5", None, [1]],
+)
+def test_any_in_range_neq(value: Any) -> None:
+    assert_not_equal(AnyIn(range(10**9)), value)
+
+
+def test_any_in_range_in_place() -> None:
+    r = range(0, 10**12, 7)
+    m = AnyIn(r)
+    assert m.arg is r
+    assert repr(m) == "AnyIn(range(0, 1000000000000, 7))"
+    assert m == 7 * 10**10
+    assert m != 7 * 10**10 + 1
+
+
+@pytest.mark.parametrize("is_sorted", [False, True])
+def test_any_in_array(is_sorted: bool) -> None:
+    arr = array("q", [-5, 2, 3, 10, 1000])
+    m = AnyIn(arr, is_sorted=is_sorted)
+    assert m.arg is arr
+    v: Any
+    for v in [-5, 3, 1000, 10.0, True * 2]:
+        assert_equal(m, v)
+    for v in [0, 4, 1001, -6, "foo", None]:
+        assert_not_equal(m, v)
+
+
+def test_any_in_sorted_list() -> None:
+    m = AnyIn(["apple", "banana", "cherry"], is_sorted=True)
+    assert_equal(m, "banana")
+    assert_not_equal(m, "blueberry")
+    assert_not_equal(m, "zucchini")
+    assert_not_equal(m, 42)
+
+
+def test_any_in_from_sorted_file(tmp_path: Path) -> None:
+    ids = array("q", sorted({(i * 7919) % 100003 for i in range(5000)}))
+    path = tmp_path / "ids.bin"
+    path.write_bytes(ids.tobytes())
+    m = AnyIn.from_sorted_file(path)
+    assert isinstance(m.arg, memoryview)
+    v: Any
+    for v in ids[::97]:
+        assert_equal(m, v)
+    for v in [-1, 100003, "1"]:
+        assert_not_equal(m, v)
+    assert m == ids[0]
+    assert m == ids[-1]
+    missing = next(i for i in range(100003) if i not in set(ids))
+    assert m != missing
+
+
+def test_any_in_from_sorted_file_typecode(tmp_path: Path) -> None:
+    path = tmp_path / "ids.bin"
+    path.write_bytes(array("H", [1, 5, 9]).tobytes())
+    m = AnyIn.from_sorted_file(path, "H")
+    assert m == 5
+    assert m != 6
+    empty = tmp_path / "empty.bin"
+    empty.write_bytes(b"")
+    assert AnyIn.from_sorted_file(empty) != 0
+
+
+def test_any_in_from_sorted_file_close(tmp_path: Path) -> None:
+    path = tmp_path / "ids.bin"
+    path.write_bytes(array("q", [1, 5, 9]).tobytes())
+    with AnyIn.from_sorted_file(path) as m:
+        assert m == 5
+        assert m != 6
+    assert m._mmap is None
+    m.close()
+    with AnyIn([1, 2]) as m2:
+        assert m2 == 1
+    assert m2 == 1
+
+
+@pytest.mark.parametrize("typecode,size", [("q", 12), ("H", 3), ("i", 1)])
+def test_any_in_from_sorted_file_bad_size(
+    tmp_path: Path, typecode: str, size: int
+) -> None:
+    path = tmp_path / "ids.bin"
+    path.write_bytes(b"\0" * size)
+    with pytest.raises(ValueError) as excinfo:
+        AnyIn.from_sorted_file(path, typecode)
+    assert str(path) in str(excinfo.value)
+    assert "not a multiple of the item size" in str(excinfo.value)
+
+
+def test_any_in_numpy() -> None:
+    np = pytest.importorskip("numpy")
+    arr = np.array([1, 3, 5, 7])
+    for is_sorted in [False, True]:
+        m = AnyIn(arr, is_sorted=is_sorted)
+        assert m.arg is arr
+        assert_equal(m, 5)
+        assert_not_equal(m, 4)
+        assert_not_equal(m, 8)
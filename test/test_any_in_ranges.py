@@ -0,0 +1,116 @@
+from __future__ import annotations
+from datetime import date
+from typing import Any
+import pytest
+from anys import ANY_INT, AnyGE, AnyGT, AnyInRanges, AnyLE, AnyLT, AnyOr
+from test_lib import assert_equal, assert_not_equal
+
+RANGES: list[Any] = [
+    (1, 5),
+    (3, 8, "left"),
+    (10, 12, False),
+    (12, 15, "right"),
+    (20, None),
+]
+
+
+@pytest.mark.parametrize("value", [1, 3, 5, 7, 7.99, 11, 13, 15, 20, 10**9])
+def test_any_in_ranges_eq(value: Any) -> None:
+    assert_equal(AnyInRanges(RANGES), value)
+
+
+@pytest.mark.parametrize(
+    "value", [0, 0.5, 8, 9, 10, 12, 15.5, 19, float("nan"), "foo", None, [1]]
+)
+def test_any_in_ranges_neq(value: Any) -> None:
+    assert_not_equal(AnyInRanges(RANGES), value)
+
+
+def test_any_in_ranges_repr() -> None:
+    assert repr(AnyInRanges([(1, 5)])) == "AnyInRanges([(1, 5)])"
+
+
+def test_any_in_ranges_merged() -> None:
+    m = AnyInRanges(RANGES)
+    assert m._intervals == [
+        (1, True, 8, False),
+        (10, False, 12, False),
+        (12, False, 15, True),
+        (20, True, None, True),
+    ]
+
+
+def test_any_in_ranges_unbounded_below() -> None:
+    m = AnyInRanges([(None, 0, False), (None, -5), (5, 6)])
+    assert m == -100
+    assert m != 0
+    assert m == 5
+    assert m != 7
+
+
+def test_any_in_ranges_empty() -> None:
+    m = AnyInRanges([(5, 1), (3, 3, "left")])
+    assert m != 3
+    assert m != 5
+    assert AnyInRanges([(3, 3)]) == 3
+
+
+def test_any_in_ranges_dates() -> None:
+    m = AnyInRanges([(date(2021, 1, 1), date(2021, 12, 31))])
+    assert_equal(m, date(2021, 6, 24))
+    assert_not_equal(m, date(2022, 6, 24))
+    assert_not_equal(m, 42)
+
+
+@pytest.mark.parametrize("closed", ["both", 1, 0, None])
+def test_any_in_ranges_invalid_closed(closed: Any) -> None:
+    with pytest.raises(ValueError):
+        AnyInRanges([(1, 2, closed)])
+
+
+def test_any_or_args_immutable() -> None:
+    # The ranges are computed once, so the arguments must not change
+    lt, gt = AnyLT(0), AnyGT(10)
+    m = AnyOr(lt, gt)
+    assert m.args == (lt, gt)
+    assert m._ranges is not None
+    assert_equal(m, 11)
+    assert_not_equal(m, 5)
+
+
+def test_any_or_of_intervals() -> None:
+    m = AnyOr(*[AnyGE(n) & AnyLE(n + 5) for n in range(0, 1000, 10)])
+    assert m._ranges is not None
+    assert len(m._ranges._intervals) == 100
+    assert_equal(m, 0)
+    assert_equal(m, 995)
+    assert_equal(m, 512.5)
+    assert_not_equal(m, 997)
+    assert_not_equal(m, "foo")
+    assert repr(AnyGE(1) & AnyLE(2) | AnyGT(5)) == (
+        "AnyOr(AnyAnd(AnyGE(1), AnyLE(2)), AnyGT(5))"
+    )
+
+
+def test_any_or_of_open_intervals() -> None:
+    m = (AnyGT(1) & AnyLT(3)) | (AnyLE(-5)) | (AnyLT(10) & AnyGE(7))
+    assert m._ranges is not None
+    v: Any
+    for v in [2, -5, -6, 7, 9.5]:
+        assert_equal(m, v)
+    for v in [1, 3, -4, 6, 10, None]:
+        assert_not_equal(m, v)
+
+
+@pytest.mark.parametrize(
+    "m",
+    [
+        ANY_INT | AnyGE(5),
+        AnyGE(1) | AnyLE("foo"),
+        AnyGE(1) & AnyGE(2) | AnyLE(0),
+        AnyGE({1}) | AnyLE({2}),
+        AnyGE(float("nan")) | AnyLE(0),
+    ],
+)
+def test_any_or_not_intervals(m: AnyOr) -> None:
+    assert m._ranges is None
@@ -0,0 +1,195 @@
+from __future__ import annotations
+import asyncio
+from typing import Any
+import pytest
+from anys import (
+    ANY_INT,
+    ANY_STR,
+    AnyAsyncFunc,
+    AnyGT,
+    AnyKeyedList,
+    AnyWithEntries,
+    KeyedListDiff,
+)
+from test_lib import assert_equal, assert_not_equal
+
+TEMPLATES = [
+    AnyWithEntries({"id": 1, "name": ANY_STR}),
+    AnyWithEntries({"id": 2, "score": AnyGT(10)}),
+    {"id": 3, "name": "Carol", "score": ANY_INT},
+]
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        [
+            {"id": 1, "name": "Alice"},
+            {"id": 2, "score": 42},
+            {"id": 3, "name": "Carol", "score": 7},
+        ],
+        [
+            {"id": 3, "name": "Carol", "score": 7},
+            {"id": 1, "name": "Alice", "score": 0},
+            {"id": 2, "score": 42},
+        ],
+        (
+            r
+            for r in [
+                {"id": 2, "score": 11},
+                {"id": 3, "name": "Carol", "score": 7},
+                {"id": 1, "name": "Bob"},
+            ]
+        ),
+    ],
+)
+def test_any_keyed_list_eq(value: Any) -> None:
+    m = AnyKeyedList(TEMPLATES, key="id")
+    if isinstance(value, list):
+        assert_equal(m, value)
+    else:
+        assert m == value
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        [],
+        [{"id": 1, "name": "Alice"}, {"id": 2, "score": 42}],
+        [
+            {"id": 1, "name": "Alice"},
+            {"id": 2, "score": 42},
+            {"id": 3, "name": "Carol", "score": 7},
+            {"id": 4},
+        ],
+        [
+            {"id": 1, "name": "Alice"},
+            {"id": 2, "score": 5},
+            {"id": 3, "name": "Carol", "score": 7},
+        ],
+        [
+            {"id": 1, "name": "Alice"},
+            {"id": 2, "score": 42},
+            {"id": 3, "name": "Carol", "score": 7},
+            {"id": 1, "name": "Alice"},
+        ],
+        [
+            {"id": 1, "name": "Alice"},
+            {"id": 2, "score": 42},
+            {"id": 3, "name": "Carol", "score": 7},
+            {"name": "Nobody"},
+        ],
+        [{"id": [1]}],
+        42,
+        "abc",
+        None,
+    ],
+)
+def test_any_keyed_list_neq(value: Any) -> None:
+    assert_not_equal(AnyKeyedList(TEMPLATES, key="id"), value)
+
+
+def test_any_keyed_list_compare() -> None:
+    m = AnyKeyedList(TEMPLATES, key="id")
+    diff = m.compare(
+        [
+            {"id": 2, "score": 5},
+            {"id": 4},
+            {"name": "Nobody"},
+            {"id": 3, "name": "Carol", "score": 7},
+            {"id": 4},
+            {"id": [5]},
+            {"id": 3, "name": "Carol", "score": 7},
+        ]
+    )
+    assert diff == KeyedListDiff(
+        missing=[1],
+        extra=[4],
+        mismatched=[2],
+        duplicated=[3, 4],
+        unkeyed=[2, 5],
+    )
+    assert not diff.ok
+    assert (
+        m.compare(
+            [
+                {"id": 1, "name": "Alice"},
+                {"id": 2, "score": 42},
+                {"id": 3, "name": "Carol", "score": 7},
+            ]
+        )
+        == KeyedListDiff()
+    )
+
+
+@pytest.mark.parametrize(
+    "duplicates,ok",
+    [("error", False), ("first", True), ("last", False), ("all", False)],
+)
+def test_any_keyed_list_duplicates(duplicates: Any, ok: bool) -> None:
+    m = AnyKeyedList([{"id": 1, "v": ANY_INT}], key="id", duplicates=duplicates)
+    assert (m == [{"id": 1, "v": 1}, {"id": 1, "v": "x"}]) is ok
+    assert (m == [{"id": 1, "v": "x"}, {"id": 1, "v": 1}]) is (duplicates == "last")
+    assert (m == [{"id": 1, "v": 1}, {"id": 1, "v": 2}]) is (duplicates != "error")
+
+
+def test_any_keyed_list_callable_key() -> None:
+    m = AnyKeyedList(
+        [{"a": 1, "b": 2, "c": ANY_STR}, {"a": 1, "b": 3, "c": "x"}],
+        key=lambda r: (r["a"], r["b"]),
+    )
+    assert m == [{"a": 1, "b": 3, "c": "x"}, {"a": 1, "b": 2, "c": "y"}]
+    assert m != [{"a": 1, "b": 3, "c": "y"}, {"a": 1, "b": 2, "c": "y"}]
+
+
+def test_any_keyed_list_large() -> None:
+    n = 20000
+    m = AnyKeyedList(
+        [AnyWithEntries({"id": i, "sq": i * i}) for i in range(n)], key="id"
+    )
+    rows = [{"id": i, "sq": i * i} for i in reversed(range(n))]
+    assert m == rows
+    rows[123]["sq"] = -1
+    assert m.compare(rows).mismatched == [n - 124]
+
+
+@pytest.mark.parametrize(
+    "items,kwargs",
+    [
+        ([{"name": "x"}], {}),
+        ([ANY_INT], {}),
+        ([{"id": ANY_INT}], {}),
+        ([{"id": [1]}], {}),
+        ([{"id": 1}, AnyWithEntries({"id": 1})], {}),
+        ([{"id": 1}], {"duplicates": "none"}),
+    ],
+)
+def test_any_keyed_list_bad_templates(items: list, kwargs: dict[str, Any]) -> None:
+    with pytest.raises(ValueError):
+        AnyKeyedList(items, key="id", **kwargs)
+
+
+def test_any_keyed_list_repr() -> None:
+    assert (
+        repr(AnyKeyedList([{"id": 1}], key="id"))
+        == "AnyKeyedList([{'id': 1}], key='id')"
+    )
+    assert (
+        repr(AnyKeyedList([{"id": 1}], key="id", duplicates="first"))
+        == "AnyKeyedList([{'id': 1}], key='id', duplicates='first')"
+    )
+    assert repr(AnyKeyedList([], key="id", name="ROWS")) == "ROWS"
+
+
+def test_any_keyed_list_amatch() -> None:
+    async def is_positive(x: Any) -> bool:
+        return bool(x > 0)
+
+    m = AnyKeyedList(
+        [AnyWithEntries({"id": 1, "v": AnyAsyncFunc(is_positive)}), {"id": 2}],
+        key="id",
+    )
+    assert asyncio.run(m.amatch([{"id": 2}, {"id": 1, "v": 5}])) is True
+    assert asyncio.run(m.amatch([{"id": 2}, {"id": 1, "v": -5}])) is False
+    assert asyncio.run(m.amatch([{"id": 1, "v": 5}])) is False
+    assert asyncio.run(m.amatch([{"id": 2}, {"id": 1, "v": 5}, {"id": 1}])) is False
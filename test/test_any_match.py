@@ -1,8 +1,10 @@
 from __future__ import annotations
+import mmap
 import re
 from typing import Any, AnyStr
 import pytest
 from anys import AnyFullmatch, AnyMatch, AnySearch
+from anys._regex import required_literals
 from test_lib import assert_equal, assert_not_equal
 
 
@@ -119,3 +121,67 @@ def test_any_fullmatch_eq(rgx: AnyStr | re.Pattern[AnyStr], value: AnyStr) -> No
 )
 def test_any_fullmatch_neq(rgx: AnyStr | re.Pattern[AnyStr], value: Any) -> None:
     assert_not_equal(AnyFullmatch(rgx), value)
+
+
+@pytest.mark.parametrize("cls", [AnyMatch, AnySearch, AnyFullmatch])
+def test_any_regex_buffers(cls: type[AnyMatch]) -> None:
+    data = b"--12345--"
+    assert_equal(cls(rb"\d+"), memoryview(data)[2:7])
+    assert_equal(cls(re.compile(rb"\d+")), bytearray(data)[2:7])
+    assert_not_equal(cls(r"\d+"), memoryview(data)[2:7])
+    assert_not_equal(cls(rb"\d+"), memoryview(data)[:2])
+    with mmap.mmap(-1, 5) as mm:
+        mm.write(b"12345")
+        assert_equal(cls(rb"\d+"), mm)
+        assert_not_equal(cls(rb"[a-z]+"), mm)
+
+
+@pytest.mark.parametrize(
+    "rgx,literals",
+    [
+        (r"ERROR\s+\[db\].*timeout", ["timeout", "ERROR", "[db]"]),
+        (r"(?:ab)c(d|e)f+g?", ["abc", "f"]),
+        (r"a\bb", ["ab"]),
+        (r"a|b", []),
+        (r"(?i)error", []),
+        (re.compile("error", re.IGNORECASE), []),
+        (rb"x(?i:y)z", [b"x", b"z"]),
+        (r"\d+", []),
+    ],
+)
+def test_required_literals(rgx: AnyStr | re.Pattern[AnyStr], literals: list) -> None:
+    assert required_literals(rgx) == literals
+
+
+@pytest.mark.parametrize("cls", [AnyMatch, AnySearch, AnyFullmatch])
+@pytest.mark.parametrize(
+    "value",
+    [
+        "ERROR  [db] connection timeout",
+        "ERROR [db] ok",
+        "INFO [db] timeout",
+        "timeout [db] ERROR",
+        "",
+    ],
+)
+def test_any_regex_prefilter(cls: type[AnyMatch], value: str) -> None:
+    rgx = r"ERROR\s+\[db\].*timeout"
+    m = cls(rgx)
+    expected = getattr(re, cls.__name__[3:].lower())(rgx, value) is not None
+    assert (m == value) is expected
+    assert m.match_many([value]) == [expected]
+
+
+def test_any_regex_prefilter_skips_regex() -> None:
+    m = AnySearch(r"ERROR.*timeout")
+    # A string lacking a required literal is rejected without being matched
+    assert m._may_match("INFO timeout") is False
+    assert m._may_match("ERROR timeout") is True
+    # Non-string values are left to the regex engine
+    assert m._may_match(memoryview(b"INFO")) is True
+
+
+def test_any_regex_invalid_pattern() -> None:
+    m = AnySearch(r"(")
+    with pytest.raises(re.error):
+        m.match("x")
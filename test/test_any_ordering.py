@@ -0,0 +1,137 @@
+from __future__ import annotations
+from typing import Any
+import pytest
+from anys import AnyMonotonic, AnySorted, AnyUnique
+from test_lib import assert_equal, assert_not_equal
+
+
+@pytest.mark.parametrize(
+    "m,value,violation",
+    [
+        (AnySorted(), [], None),
+        (AnySorted(), [1], None),
+        (AnySorted(), [1, 2, 2, 3], None),
+        (AnySorted(), (1, 3, 2, 4), 2),
+        (AnySorted(), iter([1, 2, 3, 0]), 3),
+        (AnySorted(), range(10), None),
+        (AnySorted(), "abc", None),
+        (AnySorted(strict=True), [1, 2, 2, 3], 2),
+        (AnySorted(strict=True), [1, 2, 3], None),
+        (AnySorted(reverse=True), [3, 2, 2, 1], None),
+        (AnySorted(reverse=True), [3, 2, 4], 2),
+        (AnySorted(reverse=True, strict=True), [3, 2, 2], 2),
+        (AnySorted(key=len), ["a", "bb", "cc", "ddd"], None),
+        (AnySorted(key=len), ["a", "bbb", "cc"], 2),
+        (AnySorted(), [1.0, float("nan"), 2.0], 1),
+        (AnySorted(key=lambda d: d["t"]), [{"t": 1}, {"t": 2}, {"t": 0}], 2),
+    ],
+)
+def test_any_sorted(m: AnySorted, value: Any, violation: int | None) -> None:
+    if violation is None:
+        assert m.first_violation(value) is None
+        if not hasattr(value, "__next__"):
+            assert_equal(m, value)
+    else:
+        assert m.first_violation(value) == violation
+        if not hasattr(value, "__next__"):
+            assert_not_equal(m, value)
+
+
+@pytest.mark.parametrize("value", [42, None, [1, "a"], [object(), object()]])
+def test_any_sorted_incomparable(value: Any) -> None:
+    assert_not_equal(AnySorted(), value)
+
+
+def test_any_sorted_stops_early() -> None:
+    seen: list[int] = []
+
+    def gen() -> Any:
+        for i in [1, 2, 0, 3, 4]:
+            seen.append(i)
+            yield i
+
+    assert AnySorted().first_violation(gen()) == 2
+    assert seen == [1, 2, 0]
+
+
+@pytest.mark.parametrize(
+    "m,value,violation",
+    [
+        (AnyMonotonic(), [], None),
+        (AnyMonotonic(), [1, 2, 2, 3], None),
+        (AnyMonotonic(), [3, 2, 2, 1], None),
+        (AnyMonotonic(), [1, 1, 1], None),
+        (AnyMonotonic(), [1, 2, 1], 2),
+        (AnyMonotonic(), [1, 1, 2, 1], 3),
+        (AnyMonotonic(), iter([3, 2, 1, 2]), 3),
+        (AnyMonotonic(strict=True), [1, 1], 1),
+        (AnyMonotonic(strict=True), [3, 2, 1], None),
+        (AnyMonotonic(key=abs), [-1, 2, -3], None),
+    ],
+)
+def test_any_monotonic(m: AnyMonotonic, value: Any, violation: int | None) -> None:
+    assert m.first_violation(value) == violation
+    if not hasattr(value, "__next__"):
+        if violation is None:
+            assert_equal(m, value)
+        else:
+            assert_not_equal(m, value)
+
+
+@pytest.mark.parametrize(
+    "m,value,violation",
+    [
+        (AnyUnique(), [], None),
+        (AnyUnique(), [1, 2, 3], None),
+        (AnyUnique(), [1, 2, 1], 2),
+        (AnyUnique(), [1, True], 1),
+        (AnyUnique(), "abc", None),
+        (AnyUnique(), "abca", 3),
+        (AnyUnique(), iter([1, 2, 2]), 2),
+        (AnyUnique(), [[1, 2], [2, 1], [1, 2]], 2),
+        (AnyUnique(), [[1, 2], (1, 2)], None),
+        (AnyUnique(), [{"a": [1]}, {"a": [2]}, {"a": [1]}], 2),
+        (AnyUnique(), [{1, 2}, frozenset([2, 1])], 1),
+        (AnyUnique(), [(1, [2]), (1, [3])], None),
+        (AnyUnique(), [bytearray(b"x"), bytearray(b"y"), bytearray(b"x")], 2),
+        (AnyUnique(key=lambda d: d["id"]), [{"id": 1}, {"id": 2}], None),
+        (AnyUnique(key=lambda d: d["id"]), [{"id": 1}, {"id": 1, "x": 0}], 1),
+        (AnyUnique(key=str.lower), ["a", "B", "b"], 2),
+    ],
+)
+def test_any_unique(m: AnyUnique, value: Any, violation: int | None) -> None:
+    assert m.first_violation(value) == violation
+    if not hasattr(value, "__next__"):
+        if violation is None:
+            assert_equal(m, value)
+        else:
+            assert_not_equal(m, value)
+
+
+def test_any_unique_not_iterable() -> None:
+    assert_not_equal(AnyUnique(), 42)
+
+
+def test_ordering_numpy() -> None:
+    np = pytest.importorskip("numpy")
+    a = np.array([1, 2, 2, 5, 3], dtype=np.uint8)
+    assert AnySorted().first_violation(a) == 4
+    assert AnySorted().first_violation(a[:4]) is None
+    assert AnySorted(strict=True).first_violation(a) == 2
+    assert AnySorted(reverse=True).first_violation(a[::-1]) == 1
+    assert AnySorted(reverse=True).first_violation(np.sort(a)[::-1]) is None
+    assert AnySorted().first_violation(np.array([], dtype=float)) is None
+    assert AnySorted().first_violation(np.array([1.0, np.nan, 2.0])) == 1
+    assert AnyMonotonic().first_violation(np.array([5, 4, 4, 6])) == 3
+    assert AnyUnique() == np.array([3, 1, 2])
+    assert AnyUnique().first_violation(np.array([3, 1, 3])) == 2
+
+
+def test_ordering_repr() -> None:
+    assert repr(AnySorted()) == "AnySorted()"
+    assert repr(AnySorted(strict=True, reverse=True)) == (
+        "AnySorted(strict=True, reverse=True)"
+    )
+    assert repr(AnyMonotonic(strict=True)) == "AnyMonotonic(strict=True)"
+    assert repr(AnyUnique(key=len)) == "AnyUnique(key=<built-in function len>)"
+    assert repr(AnyUnique(name="UNIQUE")) == "UNIQUE"
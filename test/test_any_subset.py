@@ -0,0 +1,120 @@
+from __future__ import annotations
+import asyncio
+from typing import Any
+import pytest
+from anys import ANY_INT, ANY_STR, AnyAsyncFunc, AnyGT, AnySubset, _has_matching
+from test_lib import assert_equal, assert_not_equal
+
+RESPONSE = {
+    "status": "ok",
+    "data": {
+        "user": {"id": 42, "name": "Alice", "roles": ["admin", "dev"]},
+        "items": [
+            {"id": 1, "price": 9.99, "tags": ["a", "b"]},
+            {"id": 2, "price": 19.99, "tags": []},
+        ],
+    },
+    "meta": {"page": 1},
+}
+
+
+@pytest.mark.parametrize(
+    "template,ordered",
+    [
+        ({}, True),
+        ({"status": "ok"}, True),
+        ({"data": {"user": {"id": ANY_INT}}}, True),
+        ({"data": {"user": {"roles": ["admin", ANY_STR]}}}, True),
+        ({"data": {"items": [{"id": 1}, {"id": 2, "tags": []}]}}, True),
+        ({"data": {"items": [{"id": 2}, {"id": 1}]}}, False),
+        ({"data": {"items": [{"price": AnyGT(10)}]}}, False),
+        ({"data": {"user": {"roles": ["dev"]}}}, False),
+        ({"data": {"user": {"roles": []}}}, False),
+        ({"meta": AnySubset({"page": ANY_INT})}, True),
+    ],
+)
+def test_any_subset_eq(template: Any, ordered: bool) -> None:
+    assert_equal(AnySubset(template, ordered=ordered), RESPONSE)
+
+
+@pytest.mark.parametrize(
+    "template,ordered",
+    [
+        ({"status": "error"}, True),
+        ({"missing": ANY_INT}, True),
+        ({"data": {"user": {"id": ANY_STR}}}, True),
+        ({"data": {"user": {"roles": ["admin"]}}}, True),
+        ({"data": {"user": {"roles": ["dev", "admin"]}}}, True),
+        ({"data": {"items": [{"id": 2}, {"id": 1}]}}, True),
+        ({"data": {"items": [{"id": 1}, {"id": 1}]}}, False),
+        ({"data": {"items": [{"price": AnyGT(100)}]}}, False),
+        ({"data": {"user": {"roles": ["dev", "ops"]}}}, False),
+        ({"status": {"code": 1}}, True),
+        ({"status": ["o", "k"]}, True),
+        ({"data": {"items": {"id": 1}}}, True),
+    ],
+)
+def test_any_subset_neq(template: Any, ordered: bool) -> None:
+    assert_not_equal(AnySubset(template, ordered=ordered), RESPONSE)
+
+
+@pytest.mark.parametrize("value", [None, 42, "status", [RESPONSE]])
+def test_any_subset_non_mapping(value: Any) -> None:
+    assert_not_equal(AnySubset({"status": "ok"}), value)
+
+
+def test_any_subset_unordered_needs_matching() -> None:
+    # A greedy assignment of "a"/ANY_STR would fail here
+    m = AnySubset([ANY_STR, "a"], ordered=False)
+    assert_equal(m, ["a", "b"])
+    assert_equal(m, ["b", "a"])
+    assert_not_equal(m, ["a"])
+    assert_not_equal(m, ["a", 1])
+
+
+def test_any_subset_tuple_value() -> None:
+    assert_equal(AnySubset({"xs": [1, ANY_INT]}), {"xs": (1, 2)})
+
+
+def test_any_subset_deep() -> None:
+    template: Any = 1
+    value: Any = 1
+    for _ in range(5000):
+        template = {"x": template}
+        value = {"x": value, "y": None}
+    assert AnySubset(template) == value
+
+
+def test_any_subset_deep_unordered() -> None:
+    template: Any = 1
+    value: Any = 1
+    for _ in range(1500):
+        template = [template]
+        value = [0, value]
+    assert AnySubset(template, ordered=False) == value
+    assert AnySubset(template, ordered=False) != [value]
+
+
+def test_has_matching_long_augmenting_path() -> None:
+    # Each element but the last can take its own index or the next one, and
+    # the last can only take 0, so assigning it shifts every earlier element
+    # along a single augmenting path
+    n = 5000
+    candidates = [[i, i + 1] for i in range(n - 1)] + [[0]]
+    assert _has_matching(candidates)
+    assert not _has_matching(candidates + [[0]])
+
+
+def test_any_subset_repr() -> None:
+    assert repr(AnySubset({"a": [1]})) == "AnySubset({'a': [1]})"
+
+
+def test_any_subset_amatch() -> None:
+    async def is_positive(x: Any) -> bool:
+        return bool(x > 0)
+
+    pos = AnyAsyncFunc(is_positive)
+    m = AnySubset({"data": {"items": [{"id": pos}]}}, ordered=False)
+    assert asyncio.run(m.amatch(RESPONSE)) is True
+    m = AnySubset({"data": {"user": {"id": pos}, "items": [{"id": -1}]}})
+    assert asyncio.run(m.amatch(RESPONSE)) is False
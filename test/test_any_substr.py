@@ -1,4 +1,5 @@
 from __future__ import annotations
+import mmap
 from typing import Any, AnyStr
 import pytest
 from anys import AnySubstr
@@ -35,3 +36,26 @@ def test_any_substr_eq(s: AnyStr, sub: AnyStr | int) -> None:
 def test_any_substr_neq(s: AnyStr, sub: Any) -> None:
     assert_not_equal(AnySubstr(s), sub)
     assert repr(AnySubstr(s)) == f"AnySubstr({s!r})"
+
+
+@pytest.mark.parametrize("sub", [b"a", b"bc", b"abc", b"", 97, bytearray(b"b")])
+@pytest.mark.parametrize("wrap", [memoryview, bytearray])
+def test_any_substr_buffer_eq(sub: Any, wrap: Any) -> None:
+    assert_equal(AnySubstr(wrap(b"abc")), sub)
+
+
+@pytest.mark.parametrize("sub", [b"ac", b"abcd", 100, 300, "a", None])
+@pytest.mark.parametrize("wrap", [memoryview, bytearray])
+def test_any_substr_buffer_neq(sub: Any, wrap: Any) -> None:
+    assert_not_equal(AnySubstr(wrap(b"abc")), sub)
+
+
+def test_any_substr_mmap() -> None:
+    with mmap.mmap(-1, 11) as mm:
+        mm.write(b"hello world")
+        assert AnySubstr(mm) == b"o w"
+        assert AnySubstr(mm) == memoryview(b"xworldx")[1:-1]
+        assert AnySubstr(mm) == 119
+        assert AnySubstr(mm) != b"worlds"
+        assert AnySubstr(mm) != "world"
+        assert AnySubstr(b"say hello world!") == mm
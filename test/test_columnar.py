@@ -0,0 +1,121 @@
+from __future__ import annotations
+from typing import Any
+import pytest
+from anys import (
+    ANY_DATETIME_STR,
+    ANY_INT,
+    ANY_STR,
+    AnyFullmatch,
+    AnyGE,
+    AnyLT,
+    AnyMatch,
+    AnySearch,
+    AnyWithEntries,
+    Maybe,
+)
+from anys.columnar import validate_columns, validate_records
+
+TEMPLATE = {
+    "id": ANY_INT,
+    "name": ANY_STR,
+    "created": ANY_DATETIME_STR,
+    "score": AnyGE(0) & AnyLT(100),
+    "kind": "user",
+}
+
+ROWS: list[Any] = [
+    {
+        "id": 1,
+        "name": "a",
+        "created": "2021-06-24T19:40:06Z",
+        "score": 5,
+        "kind": "user",
+    },
+    {"id": 2, "name": "b", "created": "nope", "score": 5, "kind": "user"},
+    {
+        "id": 3,
+        "name": "c",
+        "created": "2021-06-24T19:40:06Z",
+        "score": 500,
+        "kind": "user",
+    },
+    {"id": 4, "name": "d", "created": "2021-06-24T19:40:06Z", "score": 5},
+    {"id": "5", "name": "e", "created": "2021-06-24", "score": "x", "kind": "bot"},
+    {
+        "id": 6,
+        "name": "f",
+        "created": "2021-06-24T19:40:06Z",
+        "score": 99.5,
+        "kind": "user",
+        "extra": None,
+    },
+    42,
+    None,
+]
+
+
+def test_validate_records() -> None:
+    assert validate_records(ROWS, TEMPLATE) == [1, 2, 3, 4, 6, 7]
+    assert validate_records(iter(ROWS), AnyWithEntries(TEMPLATE)) == [1, 2, 3, 4, 6, 7]
+
+
+def test_validate_records_agrees_with_any_with_entries() -> None:
+    m = AnyWithEntries(TEMPLATE)
+    assert validate_records(ROWS, TEMPLATE) == [i for i, r in enumerate(ROWS) if m != r]
+
+
+def test_validate_records_empty() -> None:
+    assert validate_records([], TEMPLATE) == []
+    assert validate_records(ROWS, {}) == []
+
+
+def test_validate_columns() -> None:
+    columns: dict[str, list[Any]] = {
+        "id": [1, 2, "3"],
+        "score": [0, -1, 100],
+        "name": [None, "x", "y"],
+    }
+    template = {"id": ANY_INT, "score": AnyGE(0), "name": Maybe(ANY_STR), "kind": 1}
+    assert validate_columns(columns, template) == {
+        "id": [2],
+        "score": [1],
+        "name": [],
+        "kind": [0, 1, 2],
+    }
+
+
+def test_validate_columns_mismatched_lengths() -> None:
+    with pytest.raises(ValueError):
+        validate_columns({"a": [1, 2], "b": [1]}, {"a": 1, "b": 1})
+
+
+def test_validate_columns_bad_template() -> None:
+    with pytest.raises(TypeError):
+        validate_columns({"a": [1]}, [1])  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize(
+    "m,values",
+    [
+        (AnyGE(0), [1, -1, 0, "x", None, 2.5, float("nan")]),
+        (AnyLT(10), (9, 10, 11)),
+        (AnyGE("b"), ["a", "b", "c", 1]),
+        (ANY_INT, [1, "1", True, 1.0]),
+        (AnyMatch(r"\d"), ["1a", "a1", 1, b"1"]),
+        (AnySearch(r"\d"), ["1a", "a1", 1, "aa"]),
+        (AnyFullmatch(r"\d+"), iter(["12", "1a", None])),
+        (ANY_STR | ANY_INT, ["a", 1, 1.5]),
+    ],
+)
+def test_match_many(m: Any, values: Any) -> None:
+    values = list(values)
+    assert m.match_many(values) == [m == v for v in values]
+    assert m.match_many(iter(values)) == [m == v for v in values]
+
+
+def test_match_many_numpy() -> None:
+    np = pytest.importorskip("numpy")
+    arr = np.array([1.0, -1.0, 0.0, float("nan"), 5.5])
+    assert AnyGE(0).match_many(arr) == [True, False, True, False, True]
+    assert AnyLT(1).match_many(arr) == [False, True, True, False, False]
+    assert validate_columns({"x": arr}, {"x": AnyGE(0) & AnyLT(5)}) == {"x": [1, 3, 4]}
@@ -0,0 +1,172 @@
+from __future__ import annotations
+from typing import Any
+from anys import ANY_INT, ANY_STR, AnyEach, AnyFunc, AnyWithEntries
+from anys.incremental import IncrementalValidator
+
+TEMPLATE = {
+    "users": AnyEach(AnyWithEntries({"id": ANY_INT, "name": ANY_STR}), max_len=3),
+    "meta": {"version": ANY_INT, "tags": [ANY_STR, ANY_STR]},
+}
+
+
+def assert_failing(v: IncrementalValidator, paths: list[tuple]) -> None:
+    assert list(v.failing_paths()) == paths
+    assert v.valid is (not paths)
+
+
+def make_doc() -> dict[str, Any]:
+    return {
+        "users": [{"id": 1, "name": "Alice"}, {"id": 2, "name": "Bob"}],
+        "meta": {"version": 1, "tags": ["a", "b"]},
+    }
+
+
+def test_initial_result() -> None:
+    assert IncrementalValidator(TEMPLATE, make_doc()).valid
+    doc = make_doc()
+    doc["meta"]["version"] = "1"
+    v = IncrementalValidator(TEMPLATE, doc)
+    assert_failing(v, [("meta", "version")])
+
+
+def test_proxy_mutations() -> None:
+    doc = make_doc()
+    v = IncrementalValidator(TEMPLATE, doc)
+    v.doc["users"][0]["id"] = "one"
+    assert doc["users"][0]["id"] == "one"
+    assert_failing(v, [("users", 0, "id")])
+    v.doc["users"][0]["id"] = 1
+    assert_failing(v, [])
+    del v.doc["users"][1]["name"]
+    assert_failing(v, [("users", 1)])
+    v.doc["users"][1]["name"] = "Bob"
+    assert_failing(v, [])
+    v.doc["extra"] = True
+    assert_failing(v, [()])
+    del v.doc["extra"]
+    assert_failing(v, [])
+
+
+def test_proxy_list_mutations() -> None:
+    doc = make_doc()
+    v = IncrementalValidator(TEMPLATE, doc)
+    users = v.doc["users"]
+    users.append({"id": 3, "name": "Carol"})
+    assert_failing(v, [])
+    users.append({"id": 4, "name": "Dave"})
+    assert_failing(v, [("users",)])
+    users.pop()
+    assert_failing(v, [])
+    users.insert(0, {"id": 0, "name": 0})
+    assert_failing(v, [("users",), ("users", 0, "name")])
+    users.pop(0)
+    assert_failing(v, [])
+    v.doc["meta"]["tags"].append("c")
+    assert_failing(v, [("meta", "tags")])
+    v.doc["meta"]["tags"][1:] = ["b"]
+    assert_failing(v, [])
+    assert doc == make_doc() | {
+        "users": [
+            {"id": 1, "name": "Alice"},
+            {"id": 2, "name": "Bob"},
+            {"id": 3, "name": "Carol"},
+        ]
+    }
+
+
+def test_replace_subtree() -> None:
+    v = IncrementalValidator(TEMPLATE, make_doc())
+    v.doc["meta"] = 42
+    assert_failing(v, [("meta",)])
+    v.doc["meta"] = {"version": 2, "tags": ["x", "y"]}
+    assert_failing(v, [])
+    v.doc = {"users": [], "meta": {"version": 1, "tags": ["a", "b"]}}
+    assert_failing(v, [])
+    v.doc = []
+    assert_failing(v, [()])
+
+
+def test_only_changed_paths_rechecked() -> None:
+    calls: list[Any] = []
+
+    def check(x: Any) -> bool:
+        calls.append(x)
+        return isinstance(x, int)
+
+    doc = {"rows": [{"n": i} for i in range(100)]}
+    v = IncrementalValidator(
+        {"rows": AnyEach(AnyWithEntries({"n": AnyFunc(check)}))}, doc
+    )
+    assert len(calls) == 100
+    calls.clear()
+    v.doc["rows"][50]["n"] = "x"
+    assert calls == ["x"]
+    assert_failing(v, [("rows", 50, "n")])
+    v.doc["rows"].append({"n": 100})
+    assert calls == ["x", 100]
+    v.doc["rows"][50] = {"n": 50}
+    assert calls == ["x", 100, 50]
+    assert_failing(v, [])
+
+
+def test_explicit_changed() -> None:
+    doc = make_doc()
+    v = IncrementalValidator(TEMPLATE, doc)
+    doc["users"][1]["id"] = None
+    assert_failing(v, [])
+    v.changed(["users", 1, "id"])
+    assert_failing(v, [("users", 1, "id")])
+    doc["users"][1] = {"id": 2, "name": "Bob"}
+    v.changed(("users", 1))
+    assert_failing(v, [])
+    doc["meta"]["tags"].clear()
+    v.changed(("meta", "tags"))
+    assert_failing(v, [("meta", "tags")])
+
+
+def test_change_inside_leaf() -> None:
+    doc = {"a": {"b": [1, 2]}}
+    v = IncrementalValidator({"a": AnyFunc(lambda x: sum(x["b"]) < 5)}, doc)
+    assert_failing(v, [])
+    v.doc["a"]["b"].append(10)
+    assert_failing(v, [("a",)])
+
+
+def test_plain_leaf_root() -> None:
+    v = IncrementalValidator(ANY_INT, 1)
+    assert_failing(v, [])
+    assert v.doc == 1
+    v.doc = "1"
+    assert_failing(v, [()])
+
+
+def test_held_proxy_after_ancestor_shift() -> None:
+    v = IncrementalValidator(TEMPLATE, make_doc())
+    bob = v.doc["users"][1]
+    tags = v.doc["meta"]["tags"]
+    v.doc["users"].insert(0, {"id": 0, "name": "Zed"})
+    bob["id"] = "two"
+    assert v.valid is (TEMPLATE == v.doc)
+    assert_failing(v, [("users", 2, "id")])
+    v.doc["users"].sort(key=lambda u: str(u["id"]))
+    bob["id"] = 2
+    assert_failing(v, [])
+    del v.doc["users"][0]
+    bob["name"] = None
+    assert_failing(v, [("users", 1, "name")])
+    tags[0] = 1
+    assert_failing(v, [("users", 1, "name"), ("meta", "tags", 0)])
+    assert v.valid is (TEMPLATE == v.doc)
+
+
+def test_detached_proxy() -> None:
+    v = IncrementalValidator(TEMPLATE, make_doc())
+    alice = v.doc["users"][0]
+    meta = v.doc["meta"]
+    del v.doc["users"][0]
+    alice["id"] = None
+    assert_failing(v, [])
+    v.doc = make_doc()
+    meta["version"] = None
+    assert_failing(v, [])
+    assert v.doc["meta"]["version"] == 1
@@ -0,0 +1,336 @@
+from __future__ import annotations
+import gzip
+from io import BytesIO
+import json
+from pathlib import Path
+import pytest
+from anys.__main__ import CheckpointError, Follower, check_chunk, iter_chunks, main
+
+SPEC_MODULE = """
+from anys import ANY_AWARE_DATETIME_STR, ANY_INT, AnyWithEntries
+
+TEMPLATE = AnyWithEntries({"id": ANY_INT, "created_at": ANY_AWARE_DATETIME_STR})
+
+class Specs:
+    LOOSE = AnyWithEntries({"id": ANY_INT})
+"""
+
+GOOD = {"id": 1, "created_at": "2021-06-24T18:41:59Z"}
+
+
+@pytest.fixture
+def spec_dir(tmp_path: Path, monkeypatch: pytest.MonkeyPatch) -> Path:
+    (tmp_path / "anys_test_spec.py").write_text(SPEC_MODULE, encoding="utf-8")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    return tmp_path
+
+
+def write_records(path: Path, n: int, bad: dict[int, object]) -> None:
+    lines: list[str] = []
+    for i in range(1, n + 1):
+        if isinstance(b := bad.get(i), str):
+            lines.append(b)
+        elif b is not None:
+            lines.append(json.dumps(b))
+        else:
+            lines.append(json.dumps({**GOOD, "id": i}))
+    data = ("\n".join(lines) + "\n").encode("utf-8")
+    if path.suffix == ".gz":
+        path.write_bytes(gzip.compress(data))
+    else:
+        path.write_bytes(data)
+
+
+BAD = {
+    3: {"id": "3", "created_at": "2021-06-24T18:41:59Z"},
+    10: {"id": 10, "created_at": "2021-06-24"},
+    11: {"id": 11},
+    12: "{not json",
+    20: {"id": "20", "created_at": "2021-06-24"},
+}
+
+
+@pytest.mark.parametrize("filename", ["data.jsonl", "data.jsonl.gz"])
+@pytest.mark.parametrize("workers", [1, 2])
+def test_validate(
+    spec_dir: Path,
+    filename: str,
+    workers: int,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    path = spec_dir / filename
+    write_records(path, 50, BAD)
+    r = main(
+        [
+            "validate",
+            "--spec",
+            "anys_test_spec:TEMPLATE",
+            "--workers",
+            str(workers),
+            "--block-size",
+            "100",
+            str(path),
+        ]
+    )
+    assert r == 1
+    out, err = capsys.readouterr()
+    assert out.splitlines() == [
+        "3: $.id",
+        "10: $.created_at",
+        "11: $.created_at (missing)",
+        "12: $ (invalid JSON)",
+        "20: $.id, $.created_at",
+    ]
+    assert "Checked 50 records" in err
+    assert "5 records failed" in err
+    table = err.splitlines()[-6:]
+    assert table[0] == "Failures by path:"
+    assert [line.split()[:4] for line in table[1:]] == [
+        ["COUNT", "PATH", "REASON", "EXPECTED"],
+        ["2", "$.created_at", "mismatch", "ANY_AWARE_DATETIME_STR"],
+        ["2", "$.id", "mismatch", "ANY_INT"],
+        ["1", "$", "invalid", "JSON"],
+        ["1", "$.created_at", "missing", "ANY_AWARE_DATETIME_STR"],
+    ]
+
+
+def test_validate_summary_json(
+    spec_dir: Path, capsys: pytest.CaptureFixture[str]
+) -> None:
+    path = spec_dir / "data.jsonl"
+    summary = spec_dir / "summary.json"
+    write_records(path, 20, BAD)
+    argv = [
+        "validate",
+        "--spec",
+        "anys_test_spec:TEMPLATE",
+        "--summary-json",
+        str(summary),
+        str(path),
+    ]
+    assert main(argv) == 1
+    capsys.readouterr()
+    data = json.loads(summary.read_text(encoding="utf-8"))
+    assert data["checked"] == 20
+    assert data["failed"] == 5
+    assert data["paths"][0] == {
+        "path": "$.created_at",
+        "expected": "ANY_AWARE_DATETIME_STR",
+        "reason": "mismatch",
+        "count": 2,
+        "examples": ["2021-06-24", "2021-06-24"],
+    }
+    assert sorted(data["paths"][1]["examples"]) == ["20", "3"]
+
+
+def test_validate_ok(spec_dir: Path, capsys: pytest.CaptureFixture[str]) -> None:
+    path = spec_dir / "data.jsonl"
+    write_records(path, 5, {3: {"id": 3}})
+    assert main(["validate", "--spec", "anys_test_spec:Specs.LOOSE", str(path)]) == 0
+    out, err = capsys.readouterr()
+    assert out == ""
+    assert "0 records failed" in err
+
+
+@pytest.mark.parametrize(
+    "spec", ["anys_test_spec", "anys_test_spec:NOPE", "no_such_module_xyzzy:FOO"]
+)
+def test_validate_bad_spec(spec_dir: Path, spec: str) -> None:
+    with pytest.raises(SystemExit) as e:
+        main(["validate", "--spec", spec, str(spec_dir / "data.jsonl")])
+    assert e.value.code == 2
+
+
+@pytest.mark.parametrize("block_size", [1, 3, 7, 1000])
+def test_iter_chunks(block_size: int) -> None:
+    data = b"a\nbb\n\nccc\ndddd"
+    chunks = list(iter_chunks(BytesIO(data), block_size))
+    assert b"".join(c for _, c in chunks) == data
+    for lineno, chunk in chunks:
+        assert chunk.endswith(b"\n") or chunk is chunks[-1][1]
+        assert data.split(b"\n")[lineno - 1] == chunk.split(b"\n")[0]
+
+
+def test_check_chunk() -> None:
+    chunk = b'{"a": 1}\n\n{"a": 2}\n  \n{"b": 1}\n'
+    result = check_chunk({"a": 1}, 41, chunk)
+    assert result.records == 3
+    assert result.size == len(chunk)
+    assert result.failures == [
+        (43, [("$.a", "mismatch")]),
+        (45, [("$.a", "missing"), ("$.b", "unexpected")]),
+    ]
+
+
+def append(path: Path, data: bytes) -> None:
+    with path.open("ab") as fp:
+        fp.write(data)
+
+
+def test_follower(tmp_path: Path) -> None:
+    path = tmp_path / "log.jsonl"
+    ckpt = tmp_path / "log.ckpt"
+    f = Follower(path, {"a": 1}, checkpoint=ckpt, block_size=4)
+    assert f.poll() == []
+    append(path, b'{"a": 1}\n{"a": 2}\n{"a"')
+    assert f.poll() == [(2, [("$.a", "mismatch")])]
+    assert f.offset == 18
+    assert f.lineno == 3
+    append(path, b': 3}\n{"b": 1}\n')
+    assert f.poll() == [
+        (3, [("$.a", "mismatch")]),
+        (4, [("$.a", "missing"), ("$.b", "unexpected")]),
+    ]
+    assert f.poll() == []
+    f.close()
+    data = json.loads(ckpt.read_text(encoding="utf-8"))
+    assert data["offset"] == path.stat().st_size
+    assert data["lineno"] == 5
+
+    # Resume from the checkpoint
+    append(path, b'{"a": 5}\n')
+    with Follower(path, {"a": 1}, checkpoint=ckpt) as f2:
+        assert f2.poll() == [(5, [("$.a", "mismatch")])]
+
+    # Without a checkpoint, start from the beginning
+    with Follower(path, {"a": 1}) as f3:
+        assert [lineno for lineno, _ in f3.poll()] == [2, 3, 4, 5]
+
+
+def test_follower_rotation(tmp_path: Path) -> None:
+    path = tmp_path / "log.jsonl"
+    ckpt = tmp_path / "log.ckpt"
+    append(path, b'{"a": 1}\n')
+    with Follower(path, {"a": 1}, checkpoint=ckpt) as f:
+        assert f.poll() == []
+        append(path, b'{"a": 2}\n{"a": 3}')
+        path.rename(tmp_path / "log.jsonl.1")
+        append(path, b'{"a": 4}\n')
+        assert f.poll() == [
+            (2, [("$.a", "mismatch")]),
+            (3, [("$.a", "mismatch")]),
+            (1, [("$.a", "mismatch")]),
+        ]
+        path.write_bytes(b'{"a": 1}\n{"a": 6}\n')
+        assert f.poll() == [(2, [("$.a", "mismatch")])]
+        path.write_bytes(b'{"a": 7}\n')
+        assert f.poll() == [(1, [("$.a", "mismatch")])]
+
+    # A checkpoint for a rotated-away file is ignored
+    (tmp_path / "log.jsonl.2").write_bytes(b"")
+    ckpt_data = json.loads(ckpt.read_text(encoding="utf-8"))
+    ckpt_data["inode"] += 1
+    ckpt.write_text(json.dumps(ckpt_data), encoding="utf-8")
+    with Follower(path, {"a": 1}, checkpoint=ckpt) as f:
+        assert f.poll() == [(1, [("$.a", "mismatch")])]
+
+
+def test_follower_long_line(tmp_path: Path) -> None:
+    path = tmp_path / "log.jsonl"
+    append(path, b'{"a": 1}\n' + b" " * 50 + b'{"a": 1}\n{"a": 2}\n')
+    with Follower(path, {"a": 1}, block_size=8, max_line_length=20) as f:
+        assert f.poll() == [
+            (2, [("$", "line too long")]),
+            (3, [("$.a", "mismatch")]),
+        ]
+        assert f.offset == path.stat().st_size
+
+
+def test_follow(
+    spec_dir: Path,
+    monkeypatch: pytest.MonkeyPatch,
+    capsys: pytest.CaptureFixture[str],
+) -> None:
+    path = spec_dir / "log.jsonl"
+    ckpt = spec_dir / "log.ckpt"
+    write_records(path, 12, BAD)
+    polls = 0
+
+    def fake_sleep(_: float) -> None:
+        nonlocal polls
+        polls += 1
+        if polls == 2:
+            raise KeyboardInterrupt
+        append(path, json.dumps({"id": "x"}).encode() + b"\n")
+
+    monkeypatch.setattr("anys.__main__.sleep", fake_sleep)
+    argv = [
+        "validate",
+        "--spec",
+        "anys_test_spec:TEMPLATE",
+        "--follow",
+        "--checkpoint",
+        str(ckpt),
+        str(path),
+    ]
+    assert main(argv) == 0
+    out, _ = capsys.readouterr()
+    records = [json.loads(line) for line in out.splitlines()]
+    assert [(r["file"], r["line"]) for r in records] == [
+        (str(path), 3),
+        (str(path), 10),
+        (str(path), 11),
+        (str(path), 12),
+        (str(path), 13),
+    ]
+    assert records[-1]["failures"] == [
+        {"path": "$.id", "reason": "mismatch"},
+        {"path": "$.created_at", "reason": "missing"},
+    ]
+    assert json.loads(ckpt.read_text(encoding="utf-8"))["lineno"] == 14
+
+
+@pytest.mark.parametrize(
+    "content",
+    [
+        '{"path": "log.jsonl", "device": 1, "ino',
+        "",
+        "[]",
+        '{"device": 1, "inode": 2, "offset": 3}',
+        '{"device": 1, "inode": 2, "offset": "3", "lineno": 4}',
+    ],
+)
+def test_follow_bad_checkpoint(
+    spec_dir: Path, capsys: pytest.CaptureFixture[str], content: str
+) -> None:
+    path = spec_dir / "log.jsonl"
+    ckpt = spec_dir / "log.ckpt"
+    write_records(path, 3, BAD)
+    ckpt.write_text(content, encoding="utf-8")
+    with Follower(path, {"id": 1}, checkpoint=ckpt) as f:
+        with pytest.raises(CheckpointError) as excinfo:
+            f.poll()
+        assert excinfo.value.path == str(ckpt)
+    with pytest.raises(SystemExit) as e:
+        main(
+            [
+                "validate",
+                "--spec",
+                "anys_test_spec:TEMPLATE",
+                "--follow",
+                "--checkpoint",
+                str(ckpt),
+                str(path),
+            ]
+        )
+    assert e.value.code == 2
+    _, err = capsys.readouterr()
+    assert f"could not read checkpoint file {str(ckpt)!r}" in err
+    assert "remove it" in err
+    assert ckpt.read_text(encoding="utf-8") == content
+
+
+@pytest.mark.parametrize(
+    "args",
+    [
+        ["--follow", "--workers", "2", "log.jsonl"],
+        ["--follow", "log.jsonl.gz"],
+        ["--follow", "-"],
+        ["--checkpoint", "log.ckpt", "log.jsonl"],
+        ["--follow", "--summary-json", "summary.json", "log.jsonl"],
+    ],
+)
+def test_follow_bad_args(args: list[str]) -> None:
+    with pytest.raises(SystemExit) as e:
+        main(["validate", "--spec", "anys_test_spec:TEMPLATE", *args])
+    assert e.value.code == 2
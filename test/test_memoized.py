@@ -0,0 +1,143 @@
+from __future__ import annotations
+import asyncio
+from typing import Any
+import pytest
+from anys import (
+    ANY_DATETIME_STR,
+    ANY_DICT,
+    ANY_INT,
+    AnyAsyncFunc,
+    AnyFunc,
+    AnyMatch,
+    Memoized,
+)
+from test_lib import assert_equal, assert_not_equal
+
+
+@pytest.mark.parametrize(
+    "m,value",
+    [
+        (ANY_DATETIME_STR, "2021-06-24T18:41:59Z"),
+        (AnyMatch(r"\d+"), "123abc"),
+        (ANY_INT, 42),
+        (AnyFunc(len), [1, 2, 3]),
+    ],
+)
+def test_memoized_eq(m: Any, value: Any) -> None:
+    assert_equal(m.memoize(), value)
+    assert repr(Memoized(m)) == f"Memoized({m!r})"
+
+
+@pytest.mark.parametrize(
+    "m,value",
+    [
+        (ANY_DATETIME_STR, "2021-06-24"),
+        (AnyMatch(r"\d+"), "abc123"),
+        (AnyMatch(r"\d+"), 42),
+        (ANY_INT, "42"),
+        (AnyFunc(len), []),
+        (AnyFunc(len), 42),
+    ],
+)
+def test_memoized_neq(m: Any, value: Any) -> None:
+    assert_not_equal(m.memoize(), value)
+
+
+def test_memoized_counts() -> None:
+    calls: list[Any] = []
+
+    def pred(x: Any) -> bool:
+        calls.append(x)
+        return bool(x == 1)
+
+    m = AnyFunc(pred).memoize()
+    assert m == 1
+    assert m == 1
+    assert m != 2
+    assert m != 2
+    assert calls == [1, 2]
+    assert m.hits == 2
+    assert m.misses == 2
+    assert m.currsize == 2
+    m.cache_clear()
+    assert m.hits == m.misses == m.currsize == 0
+
+
+def test_memoized_typed() -> None:
+    m = AnyFunc(lambda x: type(x) is int).memoize()
+    assert m == 1
+    assert m != 1.0
+    assert m != True  # noqa: E712
+    assert m.misses == 3
+    assert m.currsize == 3
+    t = AnyFunc(lambda x: type(x[0]) is int).memoize()
+    assert t == (1,)
+    assert t != (True,)
+    assert t.misses == 2
+
+
+def test_memoized_unhashable() -> None:
+    m = AnyFunc(len).memoize()
+    assert m == [1]
+    assert m == [1]
+    assert m.hits == m.misses == m.currsize == 0
+
+
+def test_memoized_key() -> None:
+    calls: list[Any] = []
+
+    def pred(x: Any) -> bool:
+        calls.append(x)
+        return bool(x["status"] == "ok")
+
+    m = AnyFunc(pred).memoize(key=lambda x: x["status"])
+    assert m == {"status": "ok", "id": 1}
+    assert m == {"status": "ok", "id": 2}
+    assert m != {"status": "error", "id": 3}
+    assert len(calls) == 2
+    assert m.hits == 1
+
+
+@pytest.mark.parametrize(
+    "key",
+    [
+        lambda v: v["rid"],
+        lambda v: v[5],
+        lambda v: int(v["n"]),
+    ],
+)
+def test_memoized_key_error(key: Any) -> None:
+    m = ANY_DICT.memoize(key=key)
+    assert_equal(m, {"x": 1, "n": "one"})
+    assert_not_equal(m, [])
+    assert m.hits == m.misses == m.currsize == 0
+    assert asyncio.run(m.amatch({"x": 1, "n": "one"})) is True
+
+
+def test_memoized_amatch_concurrent_counts() -> None:
+    async def slow_is_int(x: Any) -> bool:
+        await asyncio.sleep(0)
+        return isinstance(x, int)
+
+    m = AnyAsyncFunc(slow_is_int).memoize()
+
+    async def run() -> list[bool]:
+        return list(await asyncio.gather(m.amatch(1), m.amatch(1), m.amatch("1")))
+
+    assert asyncio.run(run()) == [True, True, False]
+    assert (m.hits, m.misses, m.currsize) == (0, 3, 2)
+    assert asyncio.run(m.amatch(1)) is True
+    assert (m.hits, m.misses) == (1, 3)
+
+
+def test_memoized_maxsize() -> None:
+    m = ANY_INT.memoize(maxsize=2)
+    assert m == 1
+    assert m == 2
+    assert m == 1
+    assert m == 3
+    assert m.currsize == 2
+    assert m == 1
+    assert m.hits == 2
+    assert m == 2
+    assert m.misses == 4
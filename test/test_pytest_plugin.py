@@ -0,0 +1,78 @@
+from __future__ import annotations
+import json
+from pathlib import Path
+import pytest
+from anys import AnyBase
+
+pytest_plugins = ["pytester"]
+
+TEST_MODULE = """
+from anys import ANY_INT, AnyEach, AnyWithEntries
+
+def test_slow():
+    assert AnyEach(AnyWithEntries({"x": ANY_INT})) == [{"x": i} for i in range(2000)]
+
+def test_fast():
+    assert ANY_INT == 42
+    assert 42 == ANY_INT
+    assert ANY_INT != "foo"
+
+def test_none():
+    assert 1 == 1
+"""
+
+
+@pytest.fixture(autouse=True)
+def no_autoload(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("PYTEST_DISABLE_PLUGIN_AUTOLOAD", "1")
+
+
+def test_durations(pytester: pytest.Pytester) -> None:
+    eq = AnyBase.__eq__
+    pytester.makepyfile(test_mod=TEST_MODULE)
+    result = pytester.runpytest("-p", "anys.pytest_plugin", "--anys-durations=5")
+    result.assert_outcomes(passed=3)
+    result.stdout.fnmatch_lines(
+        [
+            "*= slowest 5 anys matcher comparisons =*",
+            "*s        1 calls  AnyEach  test_mod.py::test_slow",
+            "*s        3 calls  AnyInstance  test_mod.py::test_fast",
+        ]
+    )
+    result.stdout.no_fnmatch_line("*AnyWithEntries*")
+    result.stdout.no_fnmatch_line("*test_none*")
+    assert AnyBase.__eq__ is eq
+
+
+def test_durations_top_n(pytester: pytest.Pytester) -> None:
+    pytester.makepyfile(test_mod=TEST_MODULE)
+    result = pytester.runpytest("-p", "anys.pytest_plugin", "--anys-durations=1")
+    result.stdout.fnmatch_lines(
+        ["*= slowest 1 anys matcher comparisons =*", "*AnyEach  test_mod.py::test_slow"]
+    )
+    result.stdout.no_fnmatch_line("*test_fast*")
+
+
+def test_durations_json(pytester: pytest.Pytester, tmp_path: Path) -> None:
+    pytester.makepyfile(test_mod=TEST_MODULE)
+    path = tmp_path / "durations.json"
+    result = pytester.runpytest(
+        "-p", "anys.pytest_plugin", f"--anys-durations-json={path}"
+    )
+    result.assert_outcomes(passed=3)
+    result.stdout.no_fnmatch_line("*anys matcher comparisons*")
+    data = json.loads(path.read_text(encoding="utf-8"))
+    assert [(d["nodeid"], d["matcher"], d["calls"]) for d in data] == [
+        ("test_mod.py::test_slow", "AnyEach", 1),
+        ("test_mod.py::test_fast", "AnyInstance", 3),
+    ]
+    assert all(d["max"] <= d["total"] for d in data)
+
+
+def test_disabled(pytester: pytest.Pytester) -> None:
+    eq = AnyBase.__eq__
+    pytester.makepyfile(test_mod=TEST_MODULE)
+    result = pytester.runpytest("-p", "anys.pytest_plugin")
+    result.assert_outcomes(passed=3)
+    result.stdout.no_fnmatch_line("*anys matcher comparisons*")
+    assert AnyBase.__eq__ is eq
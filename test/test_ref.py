@@ -0,0 +1,117 @@
+from __future__ import annotations
+import asyncio
+from typing import Any
+import pytest
+from anys import (
+    ANY_INT,
+    AnyAsyncFunc,
+    AnyContains,
+    AnyEach,
+    AnyFunc,
+    AnyWithEntries,
+    Maybe,
+    Ref,
+    define,
+)
+from test_lib import assert_equal, assert_not_equal
+
+TREE = define(
+    lambda self: AnyWithEntries({"value": ANY_INT, "children": AnyEach(self)}),
+    name="TREE",
+)
+
+
+def node(value: Any, *children: Any) -> dict[str, Any]:
+    return {"value": value, "children": list(children)}
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        node(1),
+        node(1, node(2), node(3, node(4))),
+    ],
+)
+def test_ref_tree_eq(value: Any) -> None:
+    assert_equal(TREE, value)
+
+
+@pytest.mark.parametrize(
+    "value",
+    [
+        node("1"),
+        node(1, node(2), node(3, node("4"))),
+        {"value": 1},
+        None,
+    ],
+)
+def test_ref_tree_neq(value: Any) -> None:
+    assert_not_equal(TREE, value)
+
+
+def test_ref_repr() -> None:
+    assert repr(TREE) == "TREE"
+    assert repr(Ref()) == "Ref()"
+
+
+def test_ref_undefined() -> None:
+    with pytest.raises(RuntimeError):
+        assert Ref() == 42
+
+
+def test_ref_dag_validated_once() -> None:
+    calls: list[Any] = []
+
+    def check_value(v: Any) -> bool:
+        calls.append(v)
+        return isinstance(v, int)
+
+    dag = define(
+        lambda self: AnyWithEntries(
+            {"value": AnyFunc(check_value), "children": AnyEach(self)}
+        )
+    )
+    n = node(0)
+    for i in range(1, 40):
+        # Each node references the previous one twice, so an unmemoized
+        # traversal would visit 2**40 nodes
+        n = node(i, n, n)
+    assert dag == n
+    assert len(calls) == 40
+
+
+def test_ref_cycle() -> None:
+    linked = define(lambda self: AnyWithEntries({"ok": True, "next": Maybe(self)}))
+    a: dict[str, Any] = {"ok": True}
+    b: dict[str, Any] = {"ok": True, "next": a}
+    a["next"] = b
+    assert_equal(linked, a)
+    assert_equal(linked, {"ok": True, "next": None})
+    b["ok"] = False
+    assert_not_equal(linked, a)
+    assert_not_equal(linked, b)
+
+
+def test_ref_cycle_failure_invalidates_dependents() -> None:
+    linked = define(lambda self: AnyWithEntries({"ok": True, "next": self}))
+    a: dict[str, Any] = {"ok": False}
+    b: dict[str, Any] = {"ok": True, "next": a}
+    a["next"] = b
+    # Checking `a` first provisionally assumes `a` is valid while checking `b`;
+    # once `a` fails, `b` must not remain cached as valid.
+    top = define(lambda _: AnyContains(linked))
+    assert top != [a, b]
+    assert linked != b
+
+
+def test_ref_amatch() -> None:
+    async def is_even(x: Any) -> bool:
+        return bool(x % 2 == 0)
+
+    tree = define(
+        lambda self: AnyWithEntries(
+            {"value": AnyAsyncFunc(is_even), "children": AnyEach(self)}
+        )
+    )
+    assert asyncio.run(tree.amatch(node(2, node(4), node(6, node(8))))) is True
+    assert asyncio.run(tree.amatch(node(2, node(4), node(6, node(7))))) is False
@@ -0,0 +1,168 @@
+from __future__ import annotations
+import json
+import pickle
+from typing import Any
+import pytest
+from anys import (
+    ANY_AWARE_DATETIME_STR,
+    ANY_INT,
+    ANY_STR,
+    AnyGT,
+    AnyWithEntries,
+)
+from anys.report import MISSING, Failure, FailureReport, format_path, iter_failures
+
+TEMPLATE = {
+    "id": ANY_INT,
+    "created_at": ANY_AWARE_DATETIME_STR,
+    "user": AnyWithEntries({"name": ANY_STR, "age": ANY_INT & AnyGT(0)}),
+    "tags": [ANY_STR, ANY_STR],
+}
+
+GOOD = {
+    "id": 1,
+    "created_at": "2021-06-24T18:41:59Z",
+    "user": {"name": "alice", "age": 30, "extra": True},
+    "tags": ["a", "b"],
+}
+
+
+def test_iter_failures_none() -> None:
+    assert list(iter_failures(TEMPLATE, GOOD)) == []
+
+
+@pytest.mark.parametrize(
+    "changes,failures",
+    [
+        (
+            {"created_at": "2021-06-24"},
+            [
+                Failure(
+                    ("created_at",), ANY_AWARE_DATETIME_STR, "2021-06-24", "mismatch"
+                )
+            ],
+        ),
+        (
+            {"user": {"name": "alice"}},
+            [Failure(("user", "age"), ANY_INT & AnyGT(0), MISSING, "missing")],
+        ),
+        (
+            {"user": {"name": "alice", "age": -3}},
+            [Failure(("user", "age"), AnyGT(0), -3, "mismatch")],
+        ),
+        (
+            {"user": None},
+            [Failure(("user",), TEMPLATE["user"], None, "mismatch")],
+        ),
+        (
+            {"tags": ["a", 2, "c"]},
+            [
+                Failure(("tags",), 2, 3, "length"),
+                Failure(("tags", 1), ANY_STR, 2, "mismatch"),
+            ],
+        ),
+        (
+            {"extra": 42},
+            [Failure(("extra",), MISSING, 42, "unexpected")],
+        ),
+    ],
+)
+def test_iter_failures(changes: dict[str, Any], failures: list[Failure]) -> None:
+    value = {**GOOD, **changes}
+    got = list(iter_failures(TEMPLATE, value))
+    assert [(f.path, f.actual, f.reason) for f in got] == [
+        (f.path, f.actual, f.reason) for f in failures
+    ]
+    assert [repr(f.expected) for f in got] == [repr(f.expected) for f in failures]
+
+
+def test_iter_failures_missing_key() -> None:
+    (f,) = iter_failures(TEMPLATE, {k: v for k, v in GOOD.items() if k != "id"})
+    assert f.path == ("id",)
+    assert f.reason == "missing"
+    assert f.actual is MISSING
+    assert f.path_str == "$.id"
+
+
+def test_iter_failures_scalar() -> None:
+    assert list(iter_failures(ANY_INT, "foo")) == [
+        Failure((), ANY_INT, "foo", "mismatch")
+    ]
+
+
+@pytest.mark.parametrize(
+    "path,s",
+    [
+        ((), "$"),
+        (("data", "items", 0, "price"), "$.data.items[0].price"),
+        (("a b", "c.d", 'e"f'), '$["a b"]["c.d"]["e\\"f"]'),
+        ((1.5, None), "$[1.5][None]"),
+    ],
+)
+def test_format_path(path: tuple, s: str) -> None:
+    assert format_path(path) == s
+
+
+def test_failure_report() -> None:
+    report = FailureReport(TEMPLATE, sample_size=3, seed=42)
+    for i in range(100):
+        value = {**GOOD, "tags": ["a", i]}
+        if i % 10 == 0:
+            value["created_at"] = f"bad{i}"
+        if i % 25 == 0:
+            del value["id"]
+        assert bool(report.check(value)) is (value != TEMPLATE)
+    report.check(GOOD)
+    assert report.checked == 101
+    assert report.failed == 100
+    stats = report.stats()
+    assert [(s.path, s.expected, s.reason, s.count) for s in stats] == [
+        ("$.tags[*]", "ANY_STR", "mismatch", 100),
+        ("$.created_at", "ANY_AWARE_DATETIME_STR", "mismatch", 10),
+        ("$.id", "ANY_INT", "missing", 4),
+    ]
+    assert len(stats[0].examples) == 3
+    assert all(isinstance(x, int) for x in stats[0].examples)
+    assert all(x.startswith("bad") for x in stats[1].examples)
+    assert stats[2].examples == []
+    data = json.loads(report.to_json())
+    assert data["checked"] == 101
+    assert data["paths"][2] == {
+        "path": "$.id",
+        "expected": "ANY_INT",
+        "reason": "missing",
+        "count": 4,
+        "examples": [],
+    }
+    lines = report.format_table().splitlines()
+    assert lines[0].split() == ["COUNT", "PATH", "REASON", "EXPECTED", "EXAMPLE"]
+    assert lines[1].split()[:4] == ["100", "$.tags[*]", "mismatch", "ANY_STR"]
+    assert lines[3].split() == ["4", "$.id", "missing", "ANY_INT"]
+
+
+def test_failure_report_reservoir_is_uniform() -> None:
+    counts = [0] * 10
+    for seed in range(500):
+        report = FailureReport(ANY_INT, sample_size=2, seed=seed)
+        report.check_many(str(i) for i in range(10))
+        (s,) = report.stats()
+        for x in s.examples:
+            counts[int(x)] += 1
+    # Each value should be sampled about 100 times
+    assert all(60 < c < 140 for c in counts)
+
+
+def test_failure_report_merge() -> None:
+    a = FailureReport(ANY_INT, sample_size=4, seed=1)
+    a.check_many(["a", "b", 1])
+    b = FailureReport(ANY_INT, sample_size=4, seed=2)
+    b.check_many(["c", "d", "e", None])
+    b2 = pickle.loads(pickle.dumps(b))
+    assert b2.template is None
+    a.merge(b2)
+    assert a.checked == 7
+    assert a.failed == 6
+    (s,) = a.stats()
+    assert s.count == 6
+    assert len(s.examples) == 4
+    assert set(s.examples) <= {"a", "b", "c", "d", "e", None}
@@ -0,0 +1,168 @@
+from __future__ import annotations
+import re
+from typing import Any
+from unittest.mock import Mock
+import pytest
+from anys import (
+    ANY_INT,
+    ANY_STR,
+    AnyFullmatch,
+    AnyFunc,
+    AnyGT,
+    AnyInstance,
+    AnyMatch,
+    AnySearch,
+    AnyWithEntries,
+)
+from anys._regex import literal_prefix
+from anys.router import Router
+
+ROUTES: dict[str, Any] = {
+    "login": AnyWithEntries({"type": "login", "user": ANY_STR}),
+    "logout": AnyWithEntries({"type": "logout"}),
+    "big-purchase": AnyWithEntries({"type": "purchase", "amount": AnyGT(1000)}),
+    "purchase": AnyWithEntries({"type": "purchase"}),
+    "api": AnyWithEntries({"path": AnyMatch(r"/api/v[0-9]+/")}),
+    "int": ANY_INT,
+    "hello": AnyFullmatch(r"hello, .+"),
+    "hello-world": "hello, world",
+    "number-ish": AnyInstance((int, float)),
+    "anything-with-x": AnyFunc(lambda v: "x" in v),
+}
+
+
+@pytest.mark.parametrize(
+    "value,first,everything",
+    [
+        ({"type": "login", "user": "alice"}, "login", ["login"]),
+        ({"type": "login", "user": 42}, None, []),
+        ({"type": "logout", "x": 1}, "logout", ["logout", "anything-with-x"]),
+        (
+            {"type": "purchase", "amount": 5000},
+            "big-purchase",
+            ["big-purchase", "purchase"],
+        ),
+        ({"type": "purchase", "amount": 5}, "purchase", ["purchase"]),
+        ({"path": "/api/v2/users"}, "api", ["api"]),
+        ({"path": "/web/users"}, None, []),
+        (42, "int", ["int", "number-ish"]),
+        (True, "int", ["int", "number-ish"]),
+        (4.2, "number-ish", ["number-ish"]),
+        (
+            "hello, world",
+            "hello",
+            ["hello", "hello-world"],
+        ),
+        ("hello, there", "hello", ["hello"]),
+        ("goodbye", None, []),
+        ([1, 2], None, []),
+        (None, None, []),
+    ],
+)
+def test_router(value: Any, first: str | None, everything: list[str]) -> None:
+    r = Router(ROUTES)
+    assert len(r) == len(ROUTES)
+    assert r.first_match(value) == first
+    assert r.all_matches(value) == everything
+    linear = [label for label, m in ROUTES.items() if m == value]
+    assert r.all_matches(value) == linear
+
+
+def test_router_evaluates_few_matchers() -> None:
+    calls: list[int] = []
+
+    def counter(i: int) -> Any:
+        def check(_: Any) -> bool:
+            calls.append(i)
+            return True
+
+        return check
+
+    r: Router[int] = Router(
+        (i, AnyWithEntries({"kind": f"k{i}", "ok": AnyFunc(counter(i))}))
+        for i in range(300)
+    )
+    assert r.first_match({"kind": "k250", "ok": 1}) == 250
+    assert calls == [250]
+    assert r.first_match({"kind": "nope", "ok": 1}, default=-1) == -1
+    assert r.first_match({"ok": 1}) is None
+    assert calls == [250]
+
+
+def test_router_add_after_use() -> None:
+    r: Router[str] = Router()
+    r.add("a", AnyWithEntries({"type": "a"}))
+    assert r.first_match({"type": "b"}) is None
+    r.add("b", AnyWithEntries({"type": "b"}))
+    assert r.first_match({"type": "b"}) == "b"
+
+
+def test_router_unusual_literals() -> None:
+    class Loose(str):
+        def __eq__(self, _other: Any) -> bool:
+            return True
+
+        def __ne__(self, _other: Any) -> bool:
+            return False
+
+        __hash__ = str.__hash__
+
+    r = Router([("a", AnyWithEntries({"type": "a"})), ("one", 1)])
+    assert r.all_matches({"type": Loose("zzz")}) == ["a"]
+    assert r.all_matches({"type": Loose("zzz"), "x": 1}) == ["a"]
+    assert r.all_matches(1.0) == ["one"]
+    assert r.all_matches(True) == ["one"]
+
+
+def test_router_overridden_class() -> None:
+    class Foo:
+        pass
+
+    r = Router(
+        [
+            ("foo", AnyInstance(Foo)),
+            ("int", AnyWithEntries({"x": ANY_INT})),
+            ("foo-x", AnyWithEntries({"x": AnyInstance(Foo)})),
+        ]
+    )
+    m = Mock(spec=Foo)
+    assert AnyInstance(Foo) == m
+    assert r.first_match(m) == "foo"
+    assert r.all_matches({"x": m}) == ["foo-x"]
+    assert r.all_matches({"x": Foo()}) == ["foo-x"]
+
+
+def test_router_bytes_regex() -> None:
+    r = Router([("b", AnyMatch(rb"GET /")), ("s", AnySearch("GET"))])
+    assert r.all_matches(b"GET /index") == ["b"]
+    assert r.all_matches(memoryview(b"GET /index")) == ["b"]
+    assert r.all_matches("GET /index") == ["s"]
+
+
+@pytest.mark.parametrize(
+    "pattern,prefix",
+    [
+        ("/api/v[0-9]+/", "/api/v"),
+        (r"foo\.bar", "foo.bar"),
+        (r"foo\d", "foo"),
+        ("abc?", "ab"),
+        ("abc*", "ab"),
+        ("abc{2}", "abc"),
+        ("abc+d", "abc"),
+        ("ab|cd", ""),
+        ("ab|ac", "a"),
+        ("[ab]c", ""),
+        ("(ab)c", "abc"),
+        ("(?:ab)?c", ""),
+        ("^ab", "ab"),
+        (r"\x41\u0042", "AB"),
+        ("a(?i:b)c", "a"),
+        ("(?i)ab", ""),
+        (re.compile("ab", re.I), ""),
+        (re.compile("ab c", re.X), "abc"),
+        (rb"ab\.c", b"ab.c"),
+        (re.compile(rb"abc", re.I), b""),
+    ],
+)
+def test_literal_prefix(pattern: Any, prefix: str | bytes) -> None:
+    assert literal_prefix(pattern) == prefix
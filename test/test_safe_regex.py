@@ -0,0 +1,181 @@
+from __future__ import annotations
+import re
+import time
+import pytest
+from anys import AnyFullmatch, AnyMatch, AnySearch
+from anys._regex import SafePattern
+from test_lib import assert_equal, assert_not_equal
+
+PATTERNS = [
+    r"a*b",
+    r"(a|b)*c",
+    r"^\d{2,3}$",
+    r"\bfoo\b",
+    r"x\B",
+    r"(?i)HeLLo",
+    r"[^a-c]+z",
+    r"(?m)^b$",
+    r"a.c",
+    r"(?s)a.c",
+    r"a{0,2}?b",
+    r"(a*)*b",
+    r"[\w-]+@\w+",
+    r"\s\S",
+    r"(?:ab|a)(?:bc|c)",
+    r"a$",
+    r"\Aa\Z",
+    r"(?i)[a-c]",
+    r"é\w",
+    r"(?a)\w+",
+    r"",
+]
+
+STRINGS = [
+    "",
+    "b",
+    "aab",
+    "abcab",
+    "12",
+    "1234",
+    "foo bar",
+    "xfoo",
+    "xx",
+    "x y",
+    "hello",
+    "HELLO there",
+    "dez",
+    "a\nb\n",
+    "a\nc",
+    "abc",
+    "aaaab",
+    "user-1@example",
+    " \t",
+    "abc\n",
+    "a",
+    "éa",
+    "éé",
+    "B",
+]
+
+
+@pytest.mark.parametrize("pattern", PATTERNS)
+def test_safe_pattern_agrees_with_re(pattern: str) -> None:
+    sp = SafePattern(pattern)
+    rx = re.compile(pattern)
+    for s in STRINGS:
+        assert sp.match(s) is (rx.match(s) is not None), s
+        assert sp.search(s) is (rx.search(s) is not None), s
+        assert sp.fullmatch(s) is (rx.fullmatch(s) is not None), s
+
+
+@pytest.mark.parametrize(
+    "value", [b"ab", b"AB c", b"abb", bytearray(b"a b"), memoryview(b"xAb")]
+)
+def test_safe_pattern_bytes(value: bytes | bytearray | memoryview) -> None:
+    sp = SafePattern(rb"(?i)ab+\b")
+    rx = re.compile(rb"(?i)ab+\b")
+    assert sp.search(value) is (rx.search(value) is not None)
+    assert sp.match(value) is (rx.match(value) is not None)
+
+
+def test_safe_pattern_compiled() -> None:
+    sp = SafePattern(re.compile(r"abc", re.IGNORECASE))
+    assert sp.fullmatch("ABC")
+
+
+@pytest.mark.parametrize(
+    "pattern",
+    [
+        r"(a)\1",
+        r"(?=a)b",
+        r"(?!a)b",
+        r"(?<=a)b",
+        r"(?<!a)b",
+        r"(a)?(?(1)b|c)",
+        r"(?>a+)b",
+        r"a++b",
+        r"(?L)a".encode("ascii"),
+        r"(a{100}){200}",
+    ],
+)
+def test_safe_pattern_unsupported(pattern: str | bytes) -> None:
+    with pytest.raises(ValueError):
+        SafePattern(pattern)
+
+
+def test_safe_pattern_linear_time() -> None:
+    sp = SafePattern(r"(a+)+$")
+    s = "a" * 100_000 + "b"
+    start = time.perf_counter()
+    assert not sp.search(s)
+    assert time.perf_counter() - start < 10
+
+
+@pytest.mark.parametrize(
+    "pattern,matches",
+    [
+        (r"(?:){10000000}", ""),
+        (r"x(?:a{0}){4000000000}y", "xy"),
+        (r"x(?:()){99999999,}y", "xy"),
+    ],
+)
+def test_safe_pattern_huge_empty_repeat(pattern: str, matches: str) -> None:
+    # Repeating a body that compiles to nothing must not take time
+    # proportional to the repeat count
+    start = time.perf_counter()
+    sp = SafePattern(pattern)
+    assert time.perf_counter() - start < 1
+    assert sp.fullmatch(matches)
+    assert not sp.fullmatch(matches + "a")
+
+
+def test_safe_pattern_type_mismatch() -> None:
+    with pytest.raises(TypeError):
+        SafePattern(r"a").match(b"a")
+    with pytest.raises(TypeError):
+        SafePattern(rb"a").match("a")
+
+
+@pytest.mark.parametrize(
+    "m,value",
+    [
+        (AnyMatch(r"\d+", safe=True), "123abc"),
+        (AnySearch(r"(x+x+)+y", safe=True), "xxxxy"),
+        (AnyFullmatch(r"[a-z]+", safe=True), "abc"),
+        (AnyMatch(rb"\d+", safe=True), memoryview(b"123")),
+    ],
+)
+def test_safe_eq(m: AnyMatch, value: object) -> None:
+    assert_equal(m, value)
+
+
+@pytest.mark.parametrize(
+    "m,value",
+    [
+        (AnyMatch(r"\d+", safe=True), "abc123"),
+        (AnyMatch(r"\d+", safe=True), 42),
+        (AnyMatch(r"\d+", safe=True), b"123"),
+        (AnySearch(r"(x+x+)+y", safe=True), "x" * 5000),
+        (AnyFullmatch(r"[a-z]+", safe=True), "abc1"),
+    ],
+)
+def test_safe_neq(m: AnyMatch, value: object) -> None:
+    assert_not_equal(m, value)
+
+
+def test_safe_match_many() -> None:
+    m = AnySearch(r"b+", safe=True)
+    assert m.match_many(["abc", "xyz", 42, "bb"]) == [True, False, False, True]
+
+
+def test_safe_unsupported_matcher() -> None:
+    with pytest.raises(ValueError):
+        AnySearch(r"(\w+)\s\1", safe=True)
+    # Without `safe`, any pattern is accepted
+    assert AnySearch(r"(\w+)\s\1") == "hello hello"
+
+
+def test_safe_repr() -> None:
+    assert repr(AnyMatch(r"\d+", safe=True)) == r"AnyMatch('\\d+', safe=True)"
+    assert repr(AnyFullmatch("x", safe=True, name="X")) == "X"
+    assert repr(AnySearch("x")) == "AnySearch('x')"
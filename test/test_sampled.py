@@ -0,0 +1,151 @@
+from __future__ import annotations
+import asyncio
+from typing import Any
+import zlib
+import pytest
+from anys import ANY_INT, AnyFunc, AnyWithEntries, Sampled
+from test_lib import assert_equal, assert_not_equal
+
+
+def test_sampled_full_rate() -> None:
+    m = Sampled(ANY_INT)
+    assert_equal(m, 42)
+    assert_not_equal(m, "42")
+    assert m.seen == 12
+    assert m.checked == 12
+    assert m.failed == 6
+    assert m.coverage == 1.0
+
+
+def test_sampled_zero_rate() -> None:
+    calls: list[Any] = []
+    m = Sampled(AnyFunc(calls.append), rate=0)
+    for i in range(100):
+        assert m == i
+    assert calls == []
+    assert m.seen == 100
+    assert m.checked == 0
+    assert m.coverage == 0.0
+
+
+def test_sampled_no_values() -> None:
+    m = Sampled(ANY_INT, rate=0.5)
+    assert m.coverage == 0.0
+    assert m.current_rate == 0.5
+
+
+def test_sampled_random_rate() -> None:
+    m = Sampled(ANY_INT, rate=0.25, seed=42)
+    assert sum(m != "x" for _ in range(10000)) == m.checked
+    assert m.seen == 10000
+    assert m.failed == m.checked
+    assert 0.2 < m.coverage < 0.3
+
+
+def test_sampled_random_seed_reproducible() -> None:
+    a = Sampled(ANY_INT, rate=0.5, seed=1)
+    b = Sampled(ANY_INT, rate=0.5, seed=1)
+    assert [a == "x" for _ in range(100)] == [b == "x" for _ in range(100)]
+
+
+def test_sampled_plain_template() -> None:
+    m = Sampled({"id": ANY_INT, "ok": True})
+    assert_equal(m, {"id": 1, "ok": True})
+    assert_not_equal(m, {"id": 1, "ok": False})
+
+
+def test_sampled_by_key() -> None:
+    m = Sampled(
+        AnyWithEntries({"status": 200}), rate=0.5, key=lambda r: r["request_id"]
+    )
+    ids = [f"req-{i}" for i in range(1000)]
+    sampled = {i for i in ids if zlib.crc32(i.encode("utf-8")) < 0x80000000}
+    for i in ids:
+        r = {"request_id": i, "status": 500}
+        assert (m == r) is (i not in sampled)
+    assert m.checked == m.failed == len(sampled)
+    # The decision for a key does not change
+    assert [m == {"request_id": i, "status": 500} for i in ids] == [
+        i not in sampled for i in ids
+    ]
+
+
+def test_sampled_bytes_key() -> None:
+    key = b"abc"
+    m = Sampled(ANY_INT, rate=0.5, key=lambda _: key)
+    assert (m == "x") is (zlib.crc32(key) >= 0x80000000)
+
+
+def test_sampled_key_error() -> None:
+    m = Sampled(ANY_INT, rate=0.5, seed=42, key=lambda r: r["request_id"])
+    assert sum(m != {"x": 1} for _ in range(1000)) == m.checked
+    assert 0.4 < m.coverage < 0.6
+    m = Sampled(ANY_INT, key=lambda r: r["request_id"])
+    assert_not_equal(m, {"x": 1})
+    assert asyncio.run(m.amatch({"x": 1})) is False
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_sampled_budget() -> None:
+    clock = FakeClock()
+
+    def slow(_: Any) -> bool:
+        clock.now += 0.01
+        return True
+
+    m = Sampled(AnyFunc(slow), budget=0.1, window=1.0, clock=clock, seed=0)
+    for _ in range(200):
+        assert m == 0
+        clock.now += 0.001
+    # Checking every value uses ~90% of the time, so the rate is cut
+    assert m.current_rate < 0.2
+    rate = m.current_rate
+    # With no values being checked, the rate recovers but never exceeds `rate`
+    for _ in range(20):
+        clock.now += 1.0
+        m._spent(clock.now, 0.1)
+    assert rate < m.current_rate == 1.0
+
+
+def test_sampled_budget_steady_state() -> None:
+    clock = FakeClock()
+
+    def slow(_: Any) -> bool:
+        clock.now += 0.01
+        return True
+
+    m = Sampled(AnyFunc(slow), budget=0.05, window=1.0, clock=clock, seed=0)
+    for _ in range(20000):
+        assert m == 0
+        clock.now += 0.001
+    # Each check takes 10 times as long as the time between values, so about
+    # 0.5% of values can be checked within budget
+    assert 0.002 < m.current_rate < 0.01
+
+
+def test_sampled_repr() -> None:
+    assert repr(Sampled(ANY_INT, rate=0.5)) == "Sampled(ANY_INT, rate=0.5)"
+    assert repr(Sampled(ANY_INT, name="SAMPLED_INT")) == "SAMPLED_INT"
+
+
+@pytest.mark.parametrize("kwargs", [{"rate": 1.5}, {"rate": -0.1}, {"budget": 0}])
+def test_sampled_bad_args(kwargs: dict[str, Any]) -> None:
+    with pytest.raises(ValueError):
+        Sampled(ANY_INT, **kwargs)
+
+
+def test_sampled_amatch() -> None:
+    m = Sampled(ANY_INT, rate=0)
+    assert asyncio.run(m.amatch("x")) is True
+    m = Sampled(ANY_INT)
+    assert asyncio.run(m.amatch(1)) is True
+    assert asyncio.run(m.amatch("x")) is False
+    assert m.checked == 2
+    assert m.failed == 1
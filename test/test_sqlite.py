@@ -0,0 +1,207 @@
+from __future__ import annotations
+from collections.abc import Iterator
+import re
+import sqlite3
+from typing import Any
+import pytest
+from anys import (
+    ANY_FLOAT,
+    ANY_INT,
+    ANY_STR,
+    AnyAnd,
+    AnyFullmatch,
+    AnyFunc,
+    AnyGE,
+    AnyGT,
+    AnyIn,
+    AnyInstance,
+    AnyLE,
+    AnyLT,
+    AnyMatch,
+    AnyOr,
+    AnySearch,
+    AnySubstr,
+    AnyWithEntries,
+    Maybe,
+    Memoized,
+    Not,
+)
+from anys.sqlite import count_violations, iter_violations, to_sql
+
+VALUES: list[Any] = [
+    None,
+    0,
+    1,
+    -3,
+    2**62,
+    0.5,
+    3.0,
+    float("inf"),
+    "",
+    "a",
+    "A",
+    "abc",
+    "foo-123",
+    "3",
+    b"",
+    b"abc",
+    b"3",
+]
+
+
+@pytest.fixture
+def conn() -> Iterator[sqlite3.Connection]:
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t (x)")
+    conn.executemany("INSERT INTO t VALUES (?)", [(v,) for v in VALUES])
+    yield conn
+    conn.close()
+
+
+@pytest.mark.parametrize(
+    "expected",
+    [
+        None,
+        0,
+        1,
+        False,
+        True,
+        3,
+        3.0,
+        0.5,
+        float("inf"),
+        float("nan"),
+        2**70,
+        "a",
+        "3",
+        b"abc",
+        ANY_INT,
+        ANY_FLOAT,
+        ANY_STR,
+        AnyInstance(bytes),
+        AnyInstance(object),
+        AnyInstance(list),
+        AnyGT(0),
+        AnyGE(1),
+        AnyLT(0.5),
+        AnyLE(3),
+        AnyLT("abc"),
+        AnyGE(b"3"),
+        AnyGT(2**70),
+        AnyLT(float("nan")),
+        AnyIn([1, "a", b"3", None, AnyGT(100)]),
+        AnyIn([]),
+        AnyIn("abcdef"),
+        AnySubstr("xabcx"),
+        AnyMatch(r"[a-z]+"),
+        AnyMatch(r"\d"),
+        AnySearch(r"\d+"),
+        AnySearch(re.compile(r"^A$", re.I)),
+        AnyFullmatch(r"[a-z]+-\d+"),
+        AnyMatch(rb"ab"),
+        AnySearch(r"b", safe=True),
+        ANY_INT & AnyGT(0),
+        ANY_STR | AnyLT(1),
+        AnyAnd(),
+        AnyOr(),
+        Not(AnyOr()),
+        Not(ANY_INT),
+        Maybe(ANY_STR),
+        Memoized(AnyLE(1)),
+        AnyFunc(lambda v: v == 1 or v == "a"),
+    ],
+)
+def test_matches_python(conn: sqlite3.Connection, expected: Any) -> None:
+    template = {"x": expected}
+    bad = [v for v in VALUES if not (expected == v)]
+    assert count_violations(conn, "t", template) == len(bad)
+    assert [row["x"] for row in iter_violations(conn, "t", template)] == bad
+
+
+def test_with_entries_multiple_columns() -> None:
+    conn = sqlite3.connect(":memory:")
+    conn.execute('CREATE TABLE "my table" (id, "na""me", extra)')
+    conn.executemany(
+        'INSERT INTO "my table" VALUES (?, ?, ?)',
+        [(1, "Alice", None), (2, 5, "x"), (-1, "Carol", 3.5)],
+    )
+    template = AnyWithEntries({"id": AnyGT(0), 'na"me': ANY_STR})
+    assert count_violations(conn, "my table", template) == 2
+    assert list(iter_violations(conn, "my table", template)) == [
+        {"id": 2, 'na"me': 5, "extra": "x"},
+        {"id": -1, 'na"me': "Carol", "extra": 3.5},
+    ]
+    assert count_violations(conn, "my table", {}) == 0
+
+
+def test_to_sql() -> None:
+    pred = to_sql({"x": AnyGT(0) & AnyLT(3), "y": ANY_STR})
+    assert pred.sql == (
+        """((typeof("x") IN ('integer', 'real') AND "x" > ?)"""
+        """ AND (typeof("x") IN ('integer', 'real') AND "x" < ?))"""
+        """ AND (typeof("y") IN ('text'))"""
+    )
+    assert pred.params == [0, 3]
+    assert pred.functions == {}
+    assert pred.fallbacks == []
+
+
+def test_to_sql_uses_index() -> None:
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.execute("CREATE INDEX t_x ON t (x)")
+    pred = to_sql({"x": AnyGT(5) & AnyLT(10)})
+    plan = conn.execute(
+        f"EXPLAIN QUERY PLAN SELECT * FROM t WHERE {pred.sql}", pred.params
+    )
+    assert any("INDEX t_x" in row[-1] for row in plan)
+
+
+def test_to_sql_binary_collation() -> None:
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t (x TEXT COLLATE NOCASE)")
+    conn.executemany("INSERT INTO t VALUES (?)", [("a",), ("A",)])
+    assert list(iter_violations(conn, "t", {"x": "a"})) == [{"x": "A"}]
+    assert list(iter_violations(conn, "t", {"x": AnyIn(["a"])})) == [{"x": "A"}]
+
+
+def test_to_sql_regexp() -> None:
+    pred = to_sql({"x": AnySearch(r"foo\d")})
+    assert pred.sql == (
+        """(typeof("x") = 'text' AND instr("x", ?) > 0 AND "x" REGEXP ?)"""
+    )
+    assert pred.params == ["foo", r"foo\d"]
+    assert list(pred.functions) == ["regexp"]
+    assert pred.fallbacks == []
+
+
+def test_to_sql_fallbacks() -> None:
+    m = AnySearch(r"\d", safe=True)
+    pred = to_sql({"x": m, "y": AnyInstance(list), "z": [1, 2]})
+    assert pred.fallbacks == [repr(m), repr([1, 2])]
+    assert len(pred.functions) == 2
+    assert all(nargs == 1 for nargs, _ in pred.functions.values())
+    assert pred.sql.endswith("AND (0) AND (" + list(pred.functions)[1] + '("z"))')
+
+
+def test_fallbacks_have_distinct_names() -> None:
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE t (x)")
+    conn.executemany("INSERT INTO t VALUES (?)", [(1,), (2,)])
+    p1 = to_sql({"x": AnyFunc(lambda v: v == 1)})
+    p2 = to_sql({"x": AnyFunc(lambda v: v == 2)})
+    assert p1.functions.keys().isdisjoint(p2.functions.keys())
+    p1.register(conn)
+    p2.register(conn)
+    assert conn.execute(f"SELECT x FROM t WHERE {p1.sql}", p1.params).fetchall() == [
+        (1,)
+    ]
+
+
+@pytest.mark.parametrize("template", [[1, 2], "x", ANY_INT])
+def test_to_sql_bad_template(template: Any) -> None:
+    with pytest.raises(TypeError) as excinfo:
+        to_sql(template)
+    assert str(excinfo.value) == (
+        f"Template must be a mapping or AnyWithEntries, not {template!r}"
+    )
@@ -0,0 +1,166 @@
+from __future__ import annotations
+from typing import Any
+import pytest
+from anys import (
+    ANY_INT,
+    AnyFullmatch,
+    AnyFunc,
+    AnyGE,
+    AnyGT,
+    AnyLE,
+    AnyLT,
+    AnyMatch,
+    AnySearch,
+    AnyWithEntries,
+    ValidationResult,
+)
+from anys.report import Failure
+
+VALUES = [1, "2", 3, 4.0, 5, None, 7, 8, 9, "10", 11]
+EXPECTED = [isinstance(v, int) for v in VALUES]
+
+
+@pytest.mark.parametrize("values", [VALUES, iter(VALUES)])
+def test_match_many_all(values: Any) -> None:
+    r = ANY_INT.match_many(values)
+    assert isinstance(r, ValidationResult)
+    assert r == EXPECTED
+    assert r == tuple(EXPECTED)
+    assert list(r) == EXPECTED
+    assert len(r) == len(VALUES)
+    assert r.count_failed == 4
+    assert r.count_passed == 7
+    assert not r.passed
+    assert list(r.failures()) == [1, 3, 5, 9]
+    assert r.first_failure == 1
+    assert r[0] is True
+    assert r[1] is False
+    assert r[-1] is True
+    with pytest.raises(IndexError):
+        r[len(VALUES)]
+    assert repr(r) == "<ValidationResult: 11 checked, 4 failed (all mode)>"
+
+
+def test_match_many_first() -> None:
+    seen: list[Any] = []
+
+    def is_int(x: Any) -> bool:
+        seen.append(x)
+        return isinstance(x, int)
+
+    r = AnyFunc(is_int).match_many(VALUES, mode="first")
+    assert seen == [1, "2"]
+    assert r == [True, False]
+    assert r.count_failed == 1
+    assert r.first_failure == 1
+    r = AnyFunc(is_int).match_many([1, 2, 3], mode="first")
+    assert r == [True, True, True]
+    assert r.passed
+    assert r.first_failure is None
+
+
+@pytest.mark.parametrize(
+    "matcher,good,bad",
+    [
+        (AnyGT(0), 1, 0),
+        (AnyGE(0), 0, -1),
+        (AnyLT(0), -1, 0),
+        (AnyLE(0), 0, 1),
+        (ANY_INT, 1, "1"),
+        (AnyMatch(r"\d"), "1a", "a1"),
+        (AnySearch(r"foo\d"), "xfoo1", "xfoo"),
+        (AnyFullmatch(r"\d+"), "12", "12a"),
+        (AnyGT(0), 1, "0"),
+        (AnyMatch(r"\d"), "1a", 1),
+    ],
+)
+def test_match_many_first_stops_early(matcher: Any, good: Any, bad: Any) -> None:
+    n = 4 * 65536
+    it = iter([good] * 5 + [bad] + [good] * n)
+    r = matcher.match_many(it, mode="first")
+    assert r == [True] * 5 + [False]
+    assert r.first_failure == 5
+    assert sum(1 for _ in it) >= n - 65536
+
+
+def test_match_many_count() -> None:
+    r = ANY_INT.match_many(VALUES, mode="count")
+    assert r.count_failed == 4
+    assert r.count_passed == 7
+    assert len(r) == 11
+    assert r != EXPECTED
+    with pytest.raises(TypeError):
+        list(r.failures())
+    with pytest.raises(TypeError):
+        r[0]
+
+
+def test_match_many_bad_mode() -> None:
+    with pytest.raises(ValueError):
+        ANY_INT.match_many(VALUES, mode="some")  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("n", [0, 1, 7, 8, 9, 100_000, 200_003])
+def test_match_many_large(n: int) -> None:
+    values = range(n)
+    r = AnyFunc(lambda x: x % 3 != 0 or x % 7 == 0).match_many(values)
+    assert len(r) == n
+    fails = [i for i in values if i % 3 == 0 and i % 7 != 0]
+    assert list(r.failures()) == fails
+    assert r.count_failed == len(fails)
+    assert r == [i % 3 != 0 or i % 7 == 0 for i in values]
+
+
+def test_match_many_regex() -> None:
+    r = AnyMatch(r"\d").match_many(["1", "a", 2, "3"])
+    assert r == [True, False, False, True]
+    assert r.count_failed == 2
+
+
+def test_explain() -> None:
+    template = AnyWithEntries({"id": ANY_INT, "name": AnyMatch(r"[a-z]+")})
+    values = [{"id": 1, "name": "a"}, {"id": "2", "name": "b"}, {"name": "C"}]
+    r = template.match_many(values)
+    assert list(r.failures()) == [1, 2]
+    assert r.explain(0) == []
+    (f,) = r.explain(1)
+    assert (f.path, f.actual, f.reason) == (("id",), "2", "mismatch")
+    assert [(f.path, f.reason) for f in r.explain(-1)] == [
+        (("id",), "missing"),
+        (("name",), "mismatch"),
+    ]
+    assert all(isinstance(f, Failure) for f in r.explain(2))
+    with pytest.raises(IndexError):
+        r.explain(3)
+    r = template.match_many(iter(values))
+    with pytest.raises(ValueError):
+        r.explain(1)
+
+
+def test_explain_first_mode_negative_index() -> None:
+    r = ANY_INT.match_many([1, "x", 3, "y", 5], mode="first")
+    assert len(r) == 2
+    (f,) = r.explain(-1)
+    assert (f.path, f.actual, f.reason) == ((), "x", "mismatch")
+    assert r.explain(-2) == []
+    with pytest.raises(IndexError):
+        r.explain(-3)
+    with pytest.raises(IndexError):
+        r.explain(2)
+
+
+def test_match_many_numpy() -> None:
+    np = pytest.importorskip("numpy")
+    arr = np.array([1, -1, 2, -2, 3, -3, 4, -4, 5])
+    r = AnyGE(0).match_many(arr)
+    assert r == [True, False] * 4 + [True]
+    assert list(r.failures()) == [1, 3, 5, 7]
+    r = AnyGE(0).match_many(arr, mode="first")
+    assert r == [True, False]
+    r = AnyGE(0).match_many(arr, mode="count")
+    assert r.count_failed == 4
+    r = AnyGE(-10).match_many(arr, mode="first")
+    assert r.passed
+    assert len(r) == 9
+    (f,) = AnyGE(0).match_many(arr).explain(1)
+    assert (f.path, f.actual, f.reason) == ((), -1, "mismatch")